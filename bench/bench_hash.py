@@ -0,0 +1,93 @@
+"""Benchmark Array objects as dict keys.
+
+Usage: python -m bench.bench_hash [N]
+
+For each vector width, insert N random keys into a dict,
+then look up N equal (but not identical) keys.
+Compare the current Array hash and equality
+with the old ones, which hashed a new (size, d0, d1) tuple.
+"""
+
+import random
+import sys
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+# Prepend workspace root to system path, also when run as a script
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from bvwx import Array, u2bv  # noqa: E402
+
+WIDTHS = (8, 16, 32, 64, 128, 256, 512, 1024)
+
+_new_hash: Callable[[Array], int] = Array.__hash__
+_new_eq: Callable[[Array, Any], bool] = Array.__eq__
+
+
+def _old_hash(self: Array) -> int:
+    return hash((self.size,) + self._data)
+
+
+def _old_eq(self: Array, obj: Any) -> bool:
+    if isinstance(obj, str):
+        return _new_eq(self, obj)
+    if isinstance(obj, Array):
+        return obj.size == self.size and obj._data == self._data
+    return False
+
+
+@contextmanager
+def _old():
+    """Use the old Array hash and equality."""
+    setattr(Array, "__hash__", _old_hash)
+    setattr(Array, "__eq__", _old_eq)
+    try:
+        yield
+    finally:
+        setattr(Array, "__hash__", _new_hash)
+        setattr(Array, "__eq__", _new_eq)
+
+
+def _rate(n: int, t: float) -> str:
+    return f"{n / t / 1e6:8.2f}"
+
+
+def bench(width: int, n: int) -> tuple[float, float]:
+    # Fewer distinct values than keys for narrow widths
+    ns = [random.getrandbits(width) for _ in range(n)]
+    keys: list[Array] = [u2bv(i, width) for i in ns]
+    probes: list[Array] = [u2bv(i, width) for i in ns]
+
+    d: dict[Array, int] = {}
+    t0 = time.perf_counter()
+    for i, k in enumerate(keys):
+        d[k] = i
+    t1 = time.perf_counter()
+    for k in probes:
+        _ = d[k]
+    t2 = time.perf_counter()
+
+    return t1 - t0, t2 - t1
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"{'':>8} {'insert':>26} {'lookup':>26}  (M ops/s, N={n})")
+    print(f"{'width':>8}" + f" {'old':>8} {'new':>8} {'speedup':>8}" * 2)
+    for width in WIDTHS:
+        random.seed(width)
+        with _old():
+            old_ins, old_get = bench(width, n)
+        random.seed(width)
+        new_ins, new_get = bench(width, n)
+        cols = [f"{width:8}"]
+        for old, new in ((old_ins, new_ins), (old_get, new_get)):
+            cols.append(f"{_rate(n, old)} {_rate(n, new)} {old / new:7.2f}x")
+        print(" ".join(cols))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,22 +9,40 @@ from ._bits import (
     UintLike,
     VectorLike,
     bits,
+    bytes2bv,
     cast,
     i2bv,
+    intern_disable,
+    intern_enable,
+    intern_info,
     lit2bv,
+    lit_cache_clear,
+    lit_cache_info,
+    lit_cache_resize,
     stack,
     u2bv,
 )
+from ._batch import ArrayBatch, batch
 from ._bitwise import and_, impl, ite, mux, not_, or_, xor
+from ._compile import compile_fn
 from ._code import decode, encode_onehot, encode_priority
 from ._count import clz, cpop, ctz
+from ._coverage import Covergroup, Coverpoint, Cross
 from ._enum import Enum, EnumType
+from ._evaluator import Evaluator
+from ._expr import Expr, lazy, var
 from ._logical import land, lor, lxor
+from ._pattern import Dispatch, PatternSet
+from ._readmem import readmemb, readmemh, writememb, writememh
+from ._minimize import minimize
+from ._pla import Cover, readpla, writepla
 from ._predicate import eq, ge, gt, le, lt, match, ne, sge, sgt, sle, slt
-from ._struct import Struct, StructType
+from ._struct import Struct, StructBuilder, StructType
+from ._tabulate import tabulate
 from ._unary import uand, uor, uxor
 from ._union import Union, UnionType
 from ._util import clog2
+from ._vcd import VCDVar, VCDWriter
 from ._word import cat, lrot, pack, rep, rrot, sxt, xt
 
 __all__ = [
@@ -34,6 +52,7 @@ __all__ = [
     "Enum",
     "StructType",
     "Struct",
+    "StructBuilder",
     "UnionType",
     "Union",
     "cast",
@@ -42,6 +61,17 @@ __all__ = [
     "ScalarLike",
     "UintLike",
     "Key",
+    # batch
+    "ArrayBatch",
+    "batch",
+    # expr
+    "Expr",
+    "var",
+    "lazy",
+    "Evaluator",
+    # compile
+    "compile_fn",
+    "tabulate",
     # bitwise
     "not_",
     "or_",
@@ -104,8 +134,35 @@ __all__ = [
     "bits",
     "stack",
     "lit2bv",
+    "lit_cache_info",
+    "lit_cache_clear",
+    "lit_cache_resize",
     "u2bv",
     "i2bv",
+    "bytes2bv",
+    "intern_enable",
+    "intern_disable",
+    "intern_info",
+    # memory files
+    "readmemh",
+    "readmemb",
+    "writememh",
+    "writememb",
+    # PLA files
+    "Cover",
+    "minimize",
+    "readpla",
+    "writepla",
+    # pattern matching
+    "PatternSet",
+    "Dispatch",
+    # coverage
+    "Covergroup",
+    "Coverpoint",
+    "Cross",
+    # waveforms
+    "VCDWriter",
+    "VCDVar",
     # util
     "clog2",
 ]
@@ -0,0 +1,801 @@
+"""Batched Array Data Type
+
+An ``ArrayBatch`` holds N values of the same ``Array`` type.
+Each value occupies one K-bit *lane* of a pair of packed ``(d0, d1)`` planes,
+where K is the ``Array`` type size.
+Lane ``i`` occupies bits ``[i*K, (i+1)*K)`` of each plane.
+
+Bitwise operators apply the ``_lbool`` kernels to the packed planes directly,
+so one Python ``int`` operation evaluates every lane at once.
+Lane-wise operators (reductions, comparisons, arithmetic) use SWAR
+(SIMD Within A Register) techniques with carries confined to each lane.
+
+A batch may also be *transposed* into bit-sliced form:
+K batches of scalars, where slice ``i`` holds bit ``i`` of every lane.
+In that form, each lifted gate is exactly one ``_lbool`` kernel call.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+
+from . import _lbool as lb
+from . import _swar as sw
+from ._bits import (
+    Array,
+    ArrayLike,
+    ScalarLike,
+    UintLike,
+    bits_matmul,
+    expect_array,
+    expect_array_size,
+    expect_scalar,
+    expect_uint,
+    scalar_cls,
+    vec_cls,
+)
+from ._lbool import lbv
+from ._util import mask
+
+
+def _prop(x: lbv, hx: int, hw: int, n: int, k: int) -> lbv:
+    """Override lanes with X/W flags set to all X/W."""
+    _, _, dmax = sw.masks(n, k)
+    fx = sw.fill(hx, n, k)
+    fw = sw.fill(hw & ~hx, n, k)
+    keep = dmax ^ (fx | fw)
+    return (x[0] & keep) | fw, (x[1] & keep) | fw
+
+
+def _resolve_cls(t0: type[Array], t1: type[Array]) -> type[Array]:
+    # T (op) T -> T
+    if t0 is t1:
+        return t0
+    # Otherwise, downgrade to Vector
+    return vec_cls(t0.size)
+
+
+_MUX_XN_RE = re.compile(r"x(\d+)")
+
+# ArrayBatch.type shadows the builtin in the class body
+type _ArrayType = type[Array]
+
+
+class ArrayBatch:
+    """Batch of N values with the same ``Array`` type.
+
+    Use an ``ArrayBatch`` to evaluate one expression over many values.
+    Operators run on all lanes at once using packed ``int`` planes.
+
+    To create an ``ArrayBatch`` instance, use the ``batch`` function:
+
+    >>> from bvwx import bits
+    >>> a = batch(["4b0011", "4b0101", "4b1X-0"])
+    >>> b = batch(["4b0101", "4b0110", "4b1111"])
+    >>> len(a)
+    3
+    >>> (a | b).to_arrays()
+    [bits("4b0111"), bits("4b0111"), bits("4b1X11")]
+
+    Operands may be ``ArrayBatch`` objects with equal length,
+    or ``Array`` objects and string literals broadcast to all lanes:
+
+    >>> (a & "4b0001").to_arrays()
+    [bits("4b0001"), bits("4b0001"), bits("4b0X00")]
+
+    Lane-wise operators propagate ``X`` and ``-`` like their ``Array`` counterparts:
+
+    >>> a.add(b).to_arrays()
+    [bits("4b1000"), bits("4b1011"), bits("4bXXXX")]
+    >>> a.lt(b).to_arrays()
+    [bits("1b1"), bits("1b1"), bits("1bX")]
+    """
+
+    __slots__ = ("_t", "_n", "_data")
+
+    _t: _ArrayType
+    _n: int
+    _data: lbv
+
+    def __init__(self, t: _ArrayType, n: int, d0: int, d1: int) -> None:
+        if t.size == 0:
+            raise TypeError("Expected non-empty Array type")
+        assert n >= 0
+        self._t = t
+        self._n = n
+        self._data = (d0, d1)
+
+    @classmethod
+    def rand(cls, t: _ArrayType, n: int) -> ArrayBatch:
+        """Return a batch of N values filled with random bits."""
+        _, _, dmax = sw.masks(n, t.size)
+        d1 = random.getrandbits(n * t.size)
+        return cls(t, n, d1 ^ dmax, d1)
+
+    @property
+    def type(self) -> _ArrayType:
+        """``Array`` type of each lane."""
+        return self._t
+
+    @property
+    def size(self) -> int:
+        """Number of bits in each lane."""
+        return self._t.size
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __repr__(self) -> str:
+        return f"ArrayBatch({self._t.__name__}, {self._n})"
+
+    def __hash__(self) -> int:
+        return hash((self._n, self._t.size) + self._data)
+
+    def __eq__(self, obj: Any) -> bool:
+        if isinstance(obj, ArrayBatch):
+            return obj._n == self._n and obj.size == self.size and obj._data == self._data
+        return False
+
+    def __getitem__(self, i: int) -> Array:
+        if not -self._n <= i < self._n:
+            raise IndexError(f"Expected index in [{-self._n}, {self._n}), got {i}")
+        i %= self._n
+        k = self._t.size
+        d0 = (self._data[0] >> (i * k)) & self._t._dmax
+        d1 = (self._data[1] >> (i * k)) & self._t._dmax
+        return self._t._cast_data(d0, d1)
+
+    def __iter__(self) -> Iterator[Array]:
+        yield from self.to_arrays()
+
+    def to_arrays(self) -> list[Array]:
+        """Convert to a list of ``Array`` objects."""
+        n, k = self._n, self._t.size
+        if n == 0:
+            return []
+        s0 = format(self._data[0], "b").zfill(n * k)
+        s1 = format(self._data[1], "b").zfill(n * k)
+        xs = [
+            self._t._cast_data(int(s0[i : i + k], base=2), int(s1[i : i + k], base=2))
+            for i in range(0, n * k, k)
+        ]
+        xs.reverse()
+        return xs
+
+    def transpose(self) -> list[ArrayBatch]:
+        """Convert to a bit-sliced list of K batches of scalars.
+
+        Slice ``i`` holds bit ``i`` of every lane,
+        packed into one N-bit pair of ``(d0, d1)`` planes.
+        Operators on scalar batches are a single lifted ``int`` operation,
+        so a gate-level expression costs one operation per gate for all lanes.
+
+        For example:
+
+        >>> x = batch(["2b01", "2b11", "2b-0"])
+        >>> x0, x1 = x.transpose()
+        >>> x0.to_arrays()
+        [bits("1b1"), bits("1b1"), bits("1b0")]
+        >>> x1.to_arrays()
+        [bits("1b0"), bits("1b1"), bits("1b-")]
+        >>> ArrayBatch.from_slices([x1 & x0, x1 | x0]).to_arrays()
+        [bits("2b10"), bits("2b11"), bits("2b-0")]
+        """
+        n, k = self._n, self._t.size
+        t = scalar_cls()
+        if n == 0:
+            return [ArrayBatch(t, 0, 0, 0) for _ in range(k)]
+        s0 = format(self._data[0], "b").zfill(n * k)
+        s1 = format(self._data[1], "b").zfill(n * k)
+        return [
+            ArrayBatch(t, n, int(s0[k - 1 - i :: k], base=2), int(s1[k - 1 - i :: k], base=2))
+            for i in range(k)
+        ]
+
+    @classmethod
+    def from_slices(cls, slices: Sequence[ArrayBatch], t: _ArrayType | None = None) -> ArrayBatch:
+        """Convert a bit-sliced list of K batches of scalars to a K-bit batch.
+
+        This is the inverse of ``transpose``.
+
+        Args:
+            slices: Sequence of scalar batches with equal length.
+                    Slice ``i`` holds bit ``i`` of every lane.
+            t: Optional ``Array`` type of each lane.
+               Defaults to ``Vector[K]``.
+
+        Returns:
+            ``ArrayBatch`` with K-bit lanes.
+
+        Raises:
+            TypeError: Slice is not a batch of scalars,
+                       or ``t`` size is not equal to the number of slices.
+            ValueError: Empty sequence, or slices with unequal length.
+        """
+        if not slices:
+            raise ValueError("Expected non-empty sequence")
+        k = len(slices)
+        if t is None:
+            t = vec_cls(k)
+        elif t.size != k:
+            raise TypeError(f"Expected type size {k}, got {t.size}")
+
+        n = slices[0]._n
+        d0, d1 = 0, 0
+        for i, x in enumerate(slices):
+            if x.size != 1:
+                raise TypeError(f"Expected slice size 1, got {x.size}")
+            if x._n != n:
+                raise ValueError(f"Expected batch length {n}, got {x._n}")
+            d0 |= sw.spread(x._data[0], n, k) << i
+            d1 |= sw.spread(x._data[1], n, k) << i
+        return cls(t, n, d0, d1)
+
+    def _new(self, t: _ArrayType, x: lbv) -> ArrayBatch:
+        return ArrayBatch(t, self._n, x[0], x[1])
+
+    def _scalars(self, d0: int, d1: int) -> ArrayBatch:
+        m = mask(self._n)
+        return ArrayBatch(scalar_cls(), self._n, d0 & m, d1 & m)
+
+    def _expect(self, arg: ArrayBatch | ArrayLike, size: int) -> ArrayBatch:
+        if isinstance(arg, ArrayBatch):
+            if arg._n != self._n:
+                raise ValueError(f"Expected batch length {self._n}, got {arg._n}")
+            if arg.size != size:
+                raise TypeError(f"Expected size {size}, got {arg.size}")
+            return arg
+        x = expect_array_size(arg, size)
+        lsbs, _, _ = sw.masks(self._n, size)
+        return ArrayBatch(type(x), self._n, x._data[0] * lsbs, x._data[1] * lsbs)
+
+    def _expect_array(self, arg: ArrayBatch | ArrayLike) -> ArrayBatch:
+        if isinstance(arg, ArrayBatch):
+            return self._expect(arg, arg.size)
+        return self._expect(arg, expect_array(arg).size)
+
+    def _expect_scalar(self, arg: ArrayBatch | ScalarLike) -> ArrayBatch:
+        if isinstance(arg, ArrayBatch):
+            return self._expect(arg, 1)
+        x = expect_scalar(arg)
+        m = mask(self._n)
+        return ArrayBatch(type(x), self._n, x._data[0] * m, x._data[1] * m)
+
+    def _zext(self, k: int) -> ArrayBatch:
+        """Zero extend each lane to K bits."""
+        if k == self.size:
+            return self
+        _, _, dmax = sw.masks(self._n, k - self.size)
+        return _cat(self, ArrayBatch(vec_cls(k - self.size), self._n, dmax, 0))
+
+    def _xw(self) -> tuple[int, int]:
+        """Return N one-bit lane flags for (has X, has W)."""
+        n, k = self._n, self._t.size
+        d0, d1 = self._data
+        _, _, dmax = sw.masks(n, k)
+        return sw.any_set((d0 | d1) ^ dmax, n, k), sw.any_set(d0 & d1, n, k)
+
+    # Bitwise
+    def __invert__(self) -> ArrayBatch:
+        return self._new(self._t, lb.not_(self._data))
+
+    def __or__(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        other = self._expect(other, self.size)
+        t = _resolve_cls(self._t, other._t)
+        return self._new(t, lb.or_(self._data, other._data))
+
+    def __ror__(self, other: ArrayLike) -> ArrayBatch:
+        return self.__or__(other)
+
+    def __and__(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        other = self._expect(other, self.size)
+        t = _resolve_cls(self._t, other._t)
+        return self._new(t, lb.and_(self._data, other._data))
+
+    def __rand__(self, other: ArrayLike) -> ArrayBatch:
+        return self.__and__(other)
+
+    def __xor__(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        other = self._expect(other, self.size)
+        t = _resolve_cls(self._t, other._t)
+        return self._new(t, lb.xor(self._data, other._data))
+
+    def __rxor__(self, other: ArrayLike) -> ArrayBatch:
+        return self.__xor__(other)
+
+    def impl(self, q: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise bitwise IMPL: ``~self | q``."""
+        q = self._expect(q, self.size)
+        t = _resolve_cls(self._t, q._t)
+        return self._new(t, lb.impl(self._data, q._data))
+
+    def ite(self, x1: ArrayBatch | ArrayLike, x0: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise if-then-else, using this batch of scalars as the select."""
+        if self.size != 1:
+            raise TypeError(f"Expected select size 1, got {self.size}")
+        x1 = self._expect_array(x1)
+        x0 = self._expect(x0, x1.size)
+        n, k = self._n, x1.size
+        s = (sw.fill(self._data[0], n, k), sw.fill(self._data[1], n, k))
+        t = _resolve_cls(x1._t, x0._t)
+        return self._new(t, lb.ite(s, x1._data, x0._data))
+
+    def mux(self, **xs: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise multiplex, using this batch as the select.
+
+        Mux input names are in the form xN, where N is a valid int.
+        Any inputs not specified will default to "don't care".
+        """
+        m = self.size
+        nx = 1 << m
+
+        # Parse and check inputs
+        k = 0
+        t = None
+        _xs: dict[int, lbv] = {}
+        for name, value in xs.items():
+            if mm := _MUX_XN_RE.match(name):
+                i = int(mm.group(1))
+                if not 0 <= i < nx:
+                    raise ValueError(f"Expected x in [x0, ..., x{nx - 1}]; got {name}")
+                if t is None:
+                    k = value.size if isinstance(value, ArrayBatch) else expect_array(value).size
+                    x = self._expect(value, k)
+                    t = x._t
+                else:
+                    x = self._expect(value, k)
+                    t = _resolve_cls(t, x._t)
+                _xs[i] = x._data
+            else:
+                raise ValueError(f"Invalid input name: {name}")
+
+        if t is None:
+            raise ValueError("Expected at least one mux input")
+
+        n = self._n
+        d0, d1 = self._data
+        s = tuple(
+            (sw.fill(sw.gather(d0, n, m, i), n, k), sw.fill(sw.gather(d1, n, m, i), n, k))
+            for i in range(m)
+        )
+        _, _, dmax = sw.masks(n, k)
+        return self._new(t, lb.mux(s, _xs, (dmax, dmax)))
+
+    # Unary
+    def uor(self) -> ArrayBatch:
+        """Lane-wise unary OR reduction."""
+        n, k = self._n, self._t.size
+        d0, d1 = self._data
+        hx, hw = self._xw()
+        h1 = sw.any_set(d1 & ~d0, n, k)
+        return self._scalars(~hx & ~h1, ~hx & (h1 | hw))
+
+    def uand(self) -> ArrayBatch:
+        """Lane-wise unary AND reduction."""
+        n, k = self._n, self._t.size
+        d0, d1 = self._data
+        hx, hw = self._xw()
+        h0 = sw.any_set(d0 & ~d1, n, k)
+        return self._scalars(~hx & (h0 | hw), ~hx & ~h0)
+
+    def uxor(self) -> ArrayBatch:
+        """Lane-wise unary XOR reduction."""
+        n, k = self._n, self._t.size
+        hx, hw = self._xw()
+        p = sw.parity(self._data[1], n, k)
+        return self._scalars(~hx & (hw | ~p), ~hx & (hw | p))
+
+    # Predicate
+    def eq(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise Equal (==) reduction."""
+        other = self._expect(other, self.size)
+        y = self._new(self._t, lb.xnor(self._data, other._data))
+        return y.uand()
+
+    def ne(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise NotEqual (!=) reduction."""
+        other = self._expect(other, self.size)
+        y = self._new(self._t, lb.xor(self._data, other._data))
+        return y.uor()
+
+    def _cmp(
+        self, other: ArrayBatch | ArrayLike, signed: bool, swap: bool, inv: bool
+    ) -> ArrayBatch:
+        other = self._expect(other, self.size)
+        n, k = self._n, self._t.size
+        ax, aw = self._xw()
+        bx, bw = other._xw()
+        hx, hw = ax | bx, aw | bw
+        a1, b1 = self._data[1], other._data[1]
+        if signed:
+            _, msbs, _ = sw.masks(n, k)
+            a1, b1 = a1 ^ msbs, b1 ^ msbs
+        if swap:
+            a1, b1 = b1, a1
+        y = sw.borrow(a1, b1, n, k)
+        if inv:
+            y = ~y
+        y0, y1 = _prop((~y, y), hx, hw, n, 1)
+        return self._scalars(y0, y1)
+
+    def lt(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise Unsigned LessThan (<) reduction."""
+        return self._cmp(other, signed=False, swap=False, inv=False)
+
+    def le(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise Unsigned LessThanOrEqual (≤) reduction."""
+        return self._cmp(other, signed=False, swap=True, inv=True)
+
+    def gt(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise Unsigned GreaterThan (>) reduction."""
+        return self._cmp(other, signed=False, swap=True, inv=False)
+
+    def ge(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise Unsigned GreaterThanOrEqual (≥) reduction."""
+        return self._cmp(other, signed=False, swap=False, inv=True)
+
+    def slt(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise Signed LessThan (<) reduction."""
+        return self._cmp(other, signed=True, swap=False, inv=False)
+
+    def sle(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise Signed LessThanOrEqual (≤) reduction."""
+        return self._cmp(other, signed=True, swap=True, inv=True)
+
+    def sgt(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise Signed GreaterThan (>) reduction."""
+        return self._cmp(other, signed=True, swap=True, inv=False)
+
+    def sge(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise Signed GreaterThanOrEqual (≥) reduction."""
+        return self._cmp(other, signed=True, swap=False, inv=True)
+
+    def match(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise pattern match, with support for ``-`` wildcards."""
+        other = self._expect(other, self.size)
+        n, k = self._n, self._t.size
+        ax, _ = self._xw()
+        bx, _ = other._xw()
+        hx = ax | bx
+        a0, a1 = self._data
+        b0, b1 = other._data
+        hm = sw.any_set((a0 ^ b0) & (a1 ^ b1), n, k)
+        return self._scalars(~hx & hm, ~hx & ~hm)
+
+    # Arithmetic
+    def _add(
+        self, other: ArrayBatch, ci: ArrayBatch, t: _ArrayType
+    ) -> tuple[ArrayBatch, ArrayBatch]:
+        n, k = self._n, self._t.size
+        ax, aw = self._xw()
+        bx, bw = other._xw()
+        c0, c1 = ci._data
+        cx, cw = (c0 | c1) ^ mask(n), c0 & c1
+        hx, hw = ax | bx | cx, aw | bw | cw
+
+        _, _, dmax = sw.masks(n, k)
+        s1, co = sw.add(self._data[1], other._data[1], c1, n, k)
+        s = _prop((s1 ^ dmax, s1), hx, hw, n, k)
+        co0, co1 = _prop((~co, co), hx, hw, n, 1)
+        return self._new(t, s), self._scalars(co0, co1)
+
+    def _add_any(
+        self, other: ArrayBatch | ArrayLike, ci: ArrayBatch | ScalarLike
+    ) -> tuple[ArrayBatch, ArrayBatch]:
+        other = self._expect_array(other)
+        ci = self._expect_scalar(ci)
+        if self.size == other.size:
+            return self._add(other, ci, _resolve_cls(self._t, other._t))
+        # Unequal sizes: zero extend to a Vector
+        k = max(self.size, other.size)
+        return self._zext(k)._add(other._zext(k), ci, vec_cls(k))
+
+    def add(self, other: ArrayBatch | ArrayLike, ci: ArrayBatch | ScalarLike = 0) -> ArrayBatch:
+        """Lane-wise addition with carry-in, but NO carry-out."""
+        s, _ = self._add_any(other, ci)
+        return s
+
+    def adc(self, other: ArrayBatch | ArrayLike, ci: ArrayBatch | ScalarLike = 0) -> ArrayBatch:
+        """Lane-wise addition with carry-in, and carry-out.
+
+        The most significant bit of each lane is the carry-out.
+        """
+        s, co = self._add_any(other, ci)
+        return _cat(s, co)
+
+    def sub(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise two's complement subtraction, with NO carry-out."""
+        other = self._expect(other, self.size)
+        s, _ = self._add(~other, self._expect_scalar(1), _resolve_cls(self._t, other._t))
+        return s
+
+    def sbc(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise two's complement subtraction, with carry-out."""
+        other = self._expect(other, self.size)
+        s, co = self._add(~other, self._expect_scalar(1), _resolve_cls(self._t, other._t))
+        return _cat(s, co)
+
+    def neg(self) -> ArrayBatch:
+        """Lane-wise two's complement negation, with NO carry-out."""
+        zeros = self._expect(self._t.zeros(), self.size)
+        s, _ = (~self)._add(zeros, self._expect_scalar(1), self._t)
+        return s
+
+    def ngc(self) -> ArrayBatch:
+        """Lane-wise two's complement negation, with carry-out."""
+        zeros = self._expect(self._t.zeros(), self.size)
+        s, co = (~self)._add(zeros, self._expect_scalar(1), self._t)
+        return _cat(s, co)
+
+    def mul(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise unsigned multiply.
+
+        The product has size ``self.size + other.size``.
+        """
+        other = self._expect_array(other)
+        n, kb = self._n, other.size
+        k = self.size + kb
+        ax, aw = self._xw()
+        bx, bw = other._xw()
+
+        # Shift and add: one partial product per bit of other
+        _, _, dmax = sw.masks(n, k)
+        a1, b1 = self._zext(k)._data[1], other._data[1]
+        p1 = 0
+        for i in range(kb):
+            p1 = sw.add_nc(p1, (a1 << i) & sw.fill(sw.gather(b1, n, kb, i), n, k), n, k)
+        return ArrayBatch(vec_cls(k), n, *_prop((p1 ^ dmax, p1), ax | bx, aw | bw, n, k))
+
+    def _divmod(self, other: ArrayBatch) -> tuple[ArrayBatch, ArrayBatch]:
+        n, ka, kb = self._n, self.size, other.size
+        if not ka >= kb > 0:
+            raise ValueError("Expected a.size ≥ b.size > 0")
+        ax, aw = self._xw()
+        bx, bw = other._xw()
+        hx, hw = ax | bx, aw | bw
+
+        zero = mask(n) ^ sw.any_set(other._data[1], n, kb)
+        if zero & ~(hx | hw):
+            raise ZeroDivisionError("integer division or modulo by zero")
+
+        # Restoring division in (ka+1)-bit lanes, so 2 * remainder fits
+        k = ka + 1
+        lsbs, _, _ = sw.masks(n, k)
+        a1 = self._zext(k)._data[1]
+        # Unknown lanes with a zero divisor: divide by one
+        b1 = other._zext(k)._data[1] | sw.spread(zero, n, k)
+        q1 = r1 = 0
+        for i in reversed(range(ka)):
+            r1 = (r1 << 1) | ((a1 >> i) & lsbs)
+            ge = mask(n) ^ sw.borrow(r1, b1, n, k)
+            r1 -= b1 & sw.fill(ge, n, k)
+            q1 |= sw.spread(ge, n, ka) << i
+        r1 = sw.extract(r1, n, k, 0, kb)
+
+        _, _, qmax = sw.masks(n, ka)
+        _, _, rmax = sw.masks(n, kb)
+        q = _prop((q1 ^ qmax, q1), hx, hw, n, ka)
+        r = _prop((r1 ^ rmax, r1), hx, hw, n, kb)
+        return self._new(self._t, q), other._new(other._t, r)
+
+    def div(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise unsigned divide.
+
+        The quotient has the type of this batch.
+
+        Raises:
+            ValueError: ``self.size`` < ``other.size``.
+            ZeroDivisionError: A lane with known values has a zero divisor.
+        """
+        q, _ = self._divmod(self._expect_array(other))
+        return q
+
+    def mod(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise unsigned modulo.
+
+        The remainder has the type of ``other``.
+
+        Raises:
+            ValueError: ``self.size`` < ``other.size``.
+            ZeroDivisionError: A lane with known values has a zero divisor.
+        """
+        _, r = self._divmod(self._expect_array(other))
+        return r
+
+    def matmul(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        """Lane-wise matrix multiply.
+
+        Lanes are vectors or matrices with compatible shapes,
+        like the ``matmul`` operator.
+        Each product bit is an AND-OR reduction of bit-sliced scalar batches.
+        """
+        other = self._expect_array(other)
+        t = type(bits_matmul(self._t.zeros(), other._t.zeros()))
+        ma, ka = (1, *self._t.shape) if len(self._t.shape) == 1 else self._t.shape
+        kb, nb = (*other._t.shape, 1) if len(other._t.shape) == 1 else other._t.shape
+        assert ka == kb
+        a, b = self.transpose(), other.transpose()
+        ys: list[ArrayBatch] = []
+        for i in range(ma):
+            for j in range(nb):
+                y = a[i * ka] & b[j]
+                for h in range(1, ka):
+                    y = y | (a[i * ka + h] & b[h * nb + j])
+                ys.append(y)
+        return ArrayBatch.from_slices(ys, t)
+
+    def _shift_amount(self, n: UintLike) -> int | None:
+        n = expect_uint(n)
+        if n.has_xw():
+            return None
+        _n = n.to_uint()
+        if _n > self.size:
+            raise ValueError(f"Expected n ≤ {self.size}, got {_n}")
+        return _n
+
+    def _unknown(self, n: UintLike) -> ArrayBatch:
+        n = expect_uint(n)
+        _, _, dmax = sw.masks(self._n, self.size)
+        if n.has_x():
+            return self._new(self._t, (0, 0))
+        return self._new(self._t, (dmax, dmax))
+
+    def lsh(self, n: UintLike) -> ArrayBatch:
+        """Lane-wise logical left shift by n bits."""
+        _n = self._shift_amount(n)
+        if _n is None:
+            return self._unknown(n)
+        k = self.size
+        lsbs, _, dmax = sw.masks(self._n, k)
+        fill = mask(_n) * lsbs
+        keep = dmax ^ fill
+        d0 = ((self._data[0] << _n) & keep) | fill
+        d1 = (self._data[1] << _n) & keep
+        return self._new(self._t, (d0, d1))
+
+    def rsh(self, n: UintLike) -> ArrayBatch:
+        """Lane-wise logical right shift by n bits."""
+        _n = self._shift_amount(n)
+        if _n is None:
+            return self._unknown(n)
+        k = self.size
+        lsbs, _, _ = sw.masks(self._n, k)
+        keep = mask(k - _n) * lsbs
+        fill = (mask(_n) << (k - _n)) * lsbs
+        d0 = ((self._data[0] >> _n) & keep) | fill
+        d1 = (self._data[1] >> _n) & keep
+        return self._new(self._t, (d0, d1))
+
+    def srsh(self, n: UintLike) -> ArrayBatch:
+        """Lane-wise arithmetic (signed) right shift by n bits."""
+        _n = self._shift_amount(n)
+        if _n is None:
+            return self._unknown(n)
+        k = self.size
+        lsbs, _, _ = sw.masks(self._n, k)
+        keep = mask(k - _n) * lsbs
+        ext = mask(_n) << (k - _n)
+        s0 = (self._data[0] >> (k - 1)) & lsbs
+        s1 = (self._data[1] >> (k - 1)) & lsbs
+        d0 = ((self._data[0] >> _n) & keep) | s0 * ext
+        d1 = ((self._data[1] >> _n) & keep) | s1 * ext
+        return self._new(self._t, (d0, d1))
+
+    def __lshift__(self, n: UintLike) -> ArrayBatch:
+        return self.lsh(n)
+
+    def __rshift__(self, n: UintLike) -> ArrayBatch:
+        return self.rsh(n)
+
+    # Note: Keep carry-out
+    def __add__(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        return self.adc(other)
+
+    def __radd__(self, other: ArrayLike) -> ArrayBatch:
+        return self._expect_array(other).adc(self)
+
+    # Note: Keep carry-out
+    def __sub__(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        return self.sbc(other)
+
+    def __rsub__(self, other: ArrayLike) -> ArrayBatch:
+        return self._expect(other, self.size).sbc(self)
+
+    # Note: Keep carry-out
+    def __neg__(self) -> ArrayBatch:
+        return self.ngc()
+
+    def __mul__(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        return self.mul(other)
+
+    def __rmul__(self, other: ArrayLike) -> ArrayBatch:
+        return self._expect_array(other).mul(self)
+
+    def __floordiv__(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        return self.div(other)
+
+    def __rfloordiv__(self, other: ArrayLike) -> ArrayBatch:
+        return self._expect_array(other).div(self)
+
+    def __mod__(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        return self.mod(other)
+
+    def __rmod__(self, other: ArrayLike) -> ArrayBatch:
+        return self._expect_array(other).mod(self)
+
+    def __matmul__(self, other: ArrayBatch | ArrayLike) -> ArrayBatch:
+        return self.matmul(other)
+
+    def __rmatmul__(self, other: ArrayLike) -> ArrayBatch:
+        return self._expect_array(other).matmul(self)
+
+
+def _cat(*xs: ArrayBatch) -> ArrayBatch:
+    """Lane-wise concatenation of equal length batches."""
+    assert xs
+    fst = xs[0]
+    if len(xs) == 1:
+        return fst
+
+    n = fst._n
+    for x in xs[1:]:
+        if x._n != n:
+            raise ValueError(f"Expected batch length {n}, got {x._n}")
+    size = sum(x.size for x in xs)
+
+    def f(i: int) -> int:
+        # Lanes are MSB-first in each string, so interleave chunks in reverse order
+        chunks = []
+        for x in reversed(xs):
+            k = x.size
+            s = format(x._data[i], "b").zfill(n * k)
+            chunks.append([s[j : j + k] for j in range(0, n * k, k)])
+        return int("".join(map("".join, zip(*chunks))) or "0", base=2)
+
+    return ArrayBatch(vec_cls(size), n, f(0), f(1))
+
+
+def batch(xs: Iterable[ArrayLike]) -> ArrayBatch:
+    """Create an ArrayBatch from a sequence of Arrays with the same size.
+
+    For example:
+
+    >>> x = batch(["4b0001", "4b0010", "4b0100"])
+    >>> x[1]
+    bits("4b0010")
+
+    The batch has the type of the first element.
+    If any element has a different type, the batch is a ``Vector`` type.
+
+    Args:
+        xs: Sequence of ``Array`` or string literal.
+
+    Returns:
+        ``ArrayBatch`` with one lane per element.
+
+    Raises:
+        TypeError: Element not equal size to the first element.
+        ValueError: Empty sequence, or error parsing string literal.
+    """
+    it = iter(xs)
+    try:
+        fst = expect_array(next(it))
+    except StopIteration as e:
+        raise ValueError("Expected non-empty sequence") from e
+
+    t = type(fst)
+    k = fst.size
+    arrays = [fst]
+    for arg in it:
+        x = expect_array_size(arg, k)
+        t = _resolve_cls(t, type(x))
+        arrays.append(x)
+
+    arrays.reverse()
+    fmt = f"0{k}b"
+    d0 = int("".join(format(x._data[0], fmt) for x in arrays), base=2)
+    d1 = int("".join(format(x._data[1], fmt) for x in arrays), base=2)
+    return ArrayBatch(t, len(arrays), d0, d1)
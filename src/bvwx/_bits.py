@@ -28,6 +28,7 @@ Use one of the factory functions:
     * lit2bv
     * u2bv
     * i2bv
+    * bytes2bv
 """
 
 from __future__ import annotations
@@ -35,9 +36,9 @@ from __future__ import annotations
 import math
 import random
 from collections.abc import Iterator
-from functools import partial
+from functools import lru_cache, partial
 from types import GenericAlias
-from typing import Any, Self
+from typing import Any, Literal, Self
 
 from . import _lbool as lb
 from ._lbool import lbv
@@ -328,24 +329,25 @@ class Array[*Shape]:
         self._data = (d0, d1)
 
     def __hash__(self) -> int:
-        return hash((self.size,) + self._data)
+        # Known bits are set in exactly one plane,
+        # so equal data with different sizes is rare (all X).
+        return hash(self._data)
 
     def __eq__(self, obj: Any) -> bool:
-        if isinstance(obj, str):
-            size, data = lb.parse_lit(obj)
-            return size == self.size and data == self._data
+        if obj is self:
+            return True
+        # Same type => same size
+        if type(obj) is type(self):
+            return obj._data == self._data
         if isinstance(obj, Array):
             return obj.size == self.size and obj._data == self._data
+        if isinstance(obj, str):
+            x = _lit_cache(obj)
+            return x.size == self.size and x._data == self._data
         return False
 
     def _str(self) -> str:
-        prefix = f"{self.size}b"
-        chars = [lb.to_char[self._get_index(0)]]
-        for i in range(1, self.size):
-            if i % 4 == 0:
-                chars.append("_")
-            chars.append(lb.to_char[self._get_index(i)])
-        return prefix + "".join(reversed(chars))
+        return f"{self.size}b{lb.to_str(self._data, self.size)}"
 
     def _get_index(self, i: int) -> lbv:
         d0 = (self._data[0] >> i) & 1
@@ -462,11 +464,91 @@ class Array[*Shape]:
             return -(self._data[0] + 1)
         return self._data[1]
 
+    def to_bytes(self, byteorder: Literal["little", "big"] = "little") -> bytes:
+        """Convert to bytes.
+
+        Bits are packed densely, starting from bit zero.
+        With ``"little"`` byte order, the buffer is little-endian,
+        and zero-padded to a whole number of bytes.
+        With ``"big"`` byte order, each element of the last dimension
+        is big-endian, and elements are in ascending index order.
+
+        For example:
+
+        >>> bits("16hbeef").to_bytes()
+        b'\\xef\\xbe'
+        >>> bits(["16hdead", "16hbeef"]).to_bytes("big")
+        b'\\xde\\xad\\xbe\\xef'
+
+        Returns:
+            ``bytes`` object.
+
+        Raises:
+            ValueError: Contains any unknown bits,
+                        or ``"big"`` element size is not a multiple of 8.
+        """
+        if self.has_xw():
+            raise ValueError("Cannot convert unknown to bytes")
+        n = (self.size + 7) // 8
+        if byteorder == "little":
+            return self._data[1].to_bytes(n, "little")
+        width = _byte_width(self.shape[-1])
+        return bytes(_swap_bytes(self._data[1].to_bytes(n, "little"), width))
+
+    def to_hex(self) -> str:
+        """Convert to a hexadecimal literal.
+
+        All bits are formatted as one flat literal, most significant first.
+        Each digit with unknown bits is ``X`` if all of its bits are ``X``,
+        ``-`` if all of its bits are ``-``, and ``?`` otherwise.
+
+        For example:
+
+        >>> bits("16hbeef").to_hex()
+        '16hBEEF'
+        >>> bits("12b1010_XXXX_0-01").to_hex()
+        '12hAX?'
+        >>> bits(["4b0001", "4b----"]).to_hex()
+        '8h-1'
+        >>> bits("3bXXX").to_hex()
+        '3hX'
+
+        Returns:
+            ``str`` literal.
+            ``bits`` can parse it back if all digits are known,
+            or all bits of every unknown digit have the same value,
+            including a most significant digit with fewer than four bits.
+        """
+        return f"{self.size}h{lb.to_hex_str(self._data, self.size)}"
+
+    def __format__(self, format_spec: str) -> str:
+        """Format with a base.
+
+        Format spec ``"b"`` is a flat binary literal,
+        and ``"h"`` is a flat hexadecimal literal (see ``to_hex``).
+        An empty format spec is the same as ``str``.
+
+        For example:
+
+        >>> x = bits(["4b0001", "4b-01X"])
+        >>> f"{x} {x:b} {x:h}"
+        '[4b0001, 4b-01X] 8b-01X_0001 8h?1'
+        """
+        if format_spec == "":
+            return str(self)
+        if format_spec == "b":
+            return f"{self.size}b{lb.to_str(self._data, self.size)}"
+        if format_spec == "h":
+            return self.to_hex()
+        raise ValueError(f"Invalid format spec for {type(self).__name__}: {format_spec!r}")
+
     # Bitwise Operations
     def __invert__(self) -> Self:
         return bits_not(self)
 
     def __or__(self, other: ArrayLike) -> Self | Array:
+        if not isinstance(other, _ARRAY_LIKE):
+            return NotImplemented
         other = expect_array_size(other, self.size)
         return bits_or(self, other)
 
@@ -475,6 +557,8 @@ class Array[*Shape]:
         return bits_or(other, self)
 
     def __and__(self, other: ArrayLike) -> Self | Array:
+        if not isinstance(other, _ARRAY_LIKE):
+            return NotImplemented
         other = expect_array_size(other, self.size)
         return bits_and(self, other)
 
@@ -483,6 +567,8 @@ class Array[*Shape]:
         return bits_and(other, self)
 
     def __xor__(self, other: ArrayLike) -> Self | Array:
+        if not isinstance(other, _ARRAY_LIKE):
+            return NotImplemented
         other = expect_array_size(other, self.size)
         return bits_xor(self, other)
 
@@ -510,6 +596,8 @@ class Array[*Shape]:
 
     # Note: Keep carry-out
     def __add__(self, other: ArrayLike) -> Array:
+        if not isinstance(other, _ARRAY_LIKE):
+            return NotImplemented
         other = expect_array(other)
         s, co = bits_add(self, other, scalar0)
         return bits_cat(s, co)
@@ -521,6 +609,8 @@ class Array[*Shape]:
 
     # Note: Keep carry-out
     def __sub__(self, other: ArrayLike) -> Array:
+        if not isinstance(other, _ARRAY_LIKE):
+            return NotImplemented
         other = expect_array_size(other, self.size)
         s, co = bits_sub(self, other)
         return bits_cat(s, co)
@@ -536,6 +626,8 @@ class Array[*Shape]:
         return bits_cat(s, co)
 
     def __mul__(self, other: ArrayLike) -> Array:
+        if not isinstance(other, _ARRAY_LIKE):
+            return NotImplemented
         other = expect_array(other)
         return bits_mul(self, other)
 
@@ -544,6 +636,8 @@ class Array[*Shape]:
         return bits_mul(other, self)
 
     def __floordiv__(self, other: ArrayLike) -> Self:
+        if not isinstance(other, _ARRAY_LIKE):
+            return NotImplemented
         other = expect_array(other)
         return bits_div(self, other)
 
@@ -552,12 +646,16 @@ class Array[*Shape]:
         return bits_div(other, self)
 
     def __mod__(self, other: ArrayLike) -> Array:
+        if not isinstance(other, _ARRAY_LIKE):
+            return NotImplemented
         other = expect_array(other)
         return bits_mod(self, other)
 
     # Note: __rmod__ does not work b/c str implements % operator
 
     def __matmul__(self, other: ArrayLike) -> Array:
+        if not isinstance(other, _ARRAY_LIKE):
+            return NotImplemented
         other = expect_array(other)
         return bits_matmul(self, other)
 
@@ -628,7 +726,7 @@ class Array[*Shape]:
 
     def vcd_val(self) -> str:
         """Return VCD variable value."""
-        return "".join(lb.to_vcd_char[self._get_index(i)] for i in range(self.size - 1, -1, -1))
+        return lb.to_vcd_str(self._data, self.size)
 
 
 def _empty_repr(self: Array) -> str:
@@ -728,6 +826,8 @@ def array_obj(shape: tuple[int, ...], d0: int, d1: int) -> Array:
 
 
 def vec_obj(size: int, d0: int, d1: int) -> Array:
+    if _intern_maxsize and size <= _intern_width:
+        return _intern(vec_cls(size), d0, d1)
     return vec_cls(size)(d0, d1)
 
 
@@ -767,11 +867,79 @@ def empty_obj() -> Array:
 
 
 def cast_data[T: Array](cls: type[T], d0: int, d1: int) -> T:
+    if _intern_maxsize and cls.size <= _intern_width:
+        return _intern(cls, d0, d1)
     obj: T = object.__new__(cls)
     obj._data = (d0, d1)
     return obj
 
 
+# Interned small objects: (cls, d0, d1) => obj
+_intern_table: dict[tuple[type[Array], int, int], Any] = {}
+_intern_maxsize = 0
+_intern_width = 0
+
+
+def _intern[T: Array](cls: type[T], d0: int, d1: int) -> T:
+    key = (cls, d0, d1)
+    try:
+        return _intern_table[key]
+    except KeyError:
+        obj: T = object.__new__(cls)
+        obj._data = (d0, d1)
+        # Full table: stop adding new objects
+        if len(_intern_table) < _intern_maxsize:
+            _intern_table[key] = obj
+        return obj
+
+
+def intern_enable(maxsize: int = 65536, max_width: int = 16) -> None:
+    """Intern small objects.
+
+    When enabled, objects with at most ``max_width`` bits are shared:
+    casting the same data to the same type returns the same object.
+    This saves allocations for programs that create the same
+    small values over and over, for example state machines and decoders.
+
+    The table keeps at most ``maxsize`` objects.
+    When it is full, new values are no longer interned.
+    Calling ``intern_enable`` again clears the table.
+
+    Args:
+        maxsize: Maximum number of interned objects.
+        max_width: Maximum number of bits in an interned object.
+
+    Raises:
+        ValueError: ``maxsize`` or ``max_width`` is not positive.
+    """
+    global _intern_maxsize, _intern_width  # noqa: PLW0603
+    if maxsize <= 0:
+        raise ValueError(f"Expected maxsize > 0, got {maxsize}")
+    if max_width <= 0:
+        raise ValueError(f"Expected max_width > 0, got {max_width}")
+    _intern_table.clear()
+    _intern_maxsize = maxsize
+    _intern_width = max_width
+
+
+def intern_disable() -> None:
+    """Stop interning small objects, and clear the table."""
+    global _intern_maxsize, _intern_width  # noqa: PLW0603
+    _intern_table.clear()
+    _intern_maxsize = 0
+    _intern_width = 0
+
+
+def intern_info() -> tuple[int, int, int]:
+    """Return small object interning settings and statistics.
+
+    Returns:
+        Tuple of ``maxsize``, ``max_width``, and current table size.
+        ``maxsize`` is zero when interning is disabled.
+    """
+    return _intern_maxsize, _intern_width, len(_intern_table)
+
+
 def cast[T: Array](cls: type[T], x: Array) -> T:
     """Convert Array object to an instance of this class.
 
@@ -797,6 +965,10 @@ type UintLike = Array | str | int
 type KeySlice = slice[int | None, int | None, None]
 type Key = UintLike | KeySlice
 
+# Binary operators return NotImplemented for other operands,
+# so reflected operators of other types (e.g. ArrayBatch) apply.
+_ARRAY_LIKE = (Array, str, int)
+
 
 # Bitwise
 def bits_not[T: Array](x: T) -> T:
@@ -1197,12 +1369,14 @@ def lit2bv(lit: str) -> Array:
     where width is the number of bits, base is either 'b' for binary or
     'h' for hexadecimal, and characters is a string of legal characters.
     The character string can contains '_' separators for readability.
+    Hexadecimal characters 'X' and '-' expand to four unknown bits.
 
     For example:
 
     * ``"4b1010"``
     * ``"6b11_-10X"``
     * ``"64hdead_beef_feed_face"``
+    * ``"16hdeXX"``
 
     Returns:
         A Vec instance.
@@ -1210,10 +1384,53 @@ def lit2bv(lit: str) -> Array:
     Raises:
         ValueError: If input literal has a syntax error.
     """
+    return _lit_cache(lit)
+
+
+def _lit2bv(lit: str) -> Array:
     size, (d0, d1) = lb.parse_lit(lit)
     return vec_obj(size, d0, d1)
 
 
+# Literal => Vector
+_LIT_CACHE_SIZE = 1024
+_lit_cache = lru_cache(maxsize=_LIT_CACHE_SIZE)(_lit2bv)
+
+
+def lit_cache_info() -> tuple[int, int, int | None, int]:
+    """Return string literal cache statistics.
+
+    Parsed literals are memoized by ``lit2bv``,
+    and by comparisons between ``Array`` objects and string literals.
+
+    Returns:
+        ``functools`` cache info named tuple with
+        ``hits``, ``misses``, ``maxsize``, and ``currsize`` fields.
+    """
+    return _lit_cache.cache_info()
+
+
+def lit_cache_clear() -> None:
+    """Clear the string literal cache, and reset its statistics."""
+    _lit_cache.cache_clear()
+
+
+def lit_cache_resize(maxsize: int | None) -> None:
+    """Replace the string literal cache with a new, empty cache.
+
+    Args:
+        maxsize: Maximum number of cached literals.
+                 ``0`` disables caching, and ``None`` means unbounded.
+
+    Raises:
+        ValueError: ``maxsize`` is negative.
+    """
+    global _lit_cache  # noqa: PLW0603
+    if maxsize is not None and maxsize < 0:
+        raise ValueError(f"Expected maxsize ≥ 0, got {maxsize}")
+    _lit_cache = lru_cache(maxsize=maxsize)(_lit2bv)
+
+
 def u2bv(n: int, size: int | None = None) -> Array:
     """Convert nonnegative int to Vector.
 
@@ -1294,6 +1511,81 @@ def i2bv(n: int, size: int | None = None) -> Array:
     return vec_obj(size, d0, d1)
 
 
+def _byte_width(size: int) -> int:
+    if size % 8:
+        raise ValueError(f"Expected element size to be a multiple of 8, got {size}")
+    return size // 8
+
+
+def _swap_bytes(buf: Any, width: int) -> bytearray:
+    """Reverse the byte order of each width-byte element in buf."""
+    view = memoryview(buf).cast("B")
+    out = bytearray(len(view))
+    for i in range(width):
+        out[i::width] = view[width - 1 - i :: width]
+    return out
+
+
+def bytes2bv(
+    buf: Any,
+    shape: int | tuple[int, ...] | None = None,
+    byteorder: Literal["little", "big"] = "little",
+) -> Array:
+    """Convert a bytes-like buffer to Array.
+
+    The buffer is converted with one ``int.from_bytes``.
+    Bits are packed densely, starting from bit zero.
+    With ``"little"`` byte order, the buffer is little-endian.
+    With ``"big"`` byte order, each element of the last dimension
+    is big-endian, and elements are in ascending index order.
+
+    For example:
+
+    >>> bytes2bv(b"\\xef\\xbe")
+    bits("16b1011_1110_1110_1111")
+    >>> bytes2bv(b"\\xde\\xad\\xbe\\xef", (2, 16), "big")
+    bits(["16b1101_1110_1010_1101", "16b1011_1110_1110_1111"])
+
+    Args:
+        buf: ``bytes``, ``bytearray``, ``memoryview``,
+             or any object that supports the buffer protocol.
+        shape: Optional output shape.
+               Defaults to a ``Vector`` with all bits in the buffer.
+        byteorder: ``"little"`` or ``"big"``.
+
+    Returns:
+        ``Array`` with all known bits.
+
+    Raises:
+        ValueError: Shape size does not match buffer size,
+                    or ``"big"`` element size is not a multiple of 8.
+    """
+    view = memoryview(buf).cast("B")
+    size = 8 * len(view)
+
+    if shape is None:
+        shape = (size,)
+    elif isinstance(shape, int):
+        shape = (shape,)
+    if math.prod(shape) != size:
+        raise ValueError(f"Expected shape with size {size}, got {shape}")
+    if len(shape) == 1:
+        t = vec_cls(shape[0])
+    elif all(n > 1 for n in shape):
+        t = array_cls(shape)
+    else:
+        raise ValueError(f"Expected shape dimensions > 1, got {shape}")
+
+    if byteorder == "little":
+        d1 = int.from_bytes(view, "little")
+    elif byteorder == "big":
+        d1 = int.from_bytes(_swap_bytes(view, _byte_width(shape[-1])), "little")
+    else:
+        raise ValueError(f"Expected byteorder in {{little, big}}, got {byteorder}")
+
+    return t._cast_data(d1 ^ t._dmax, d1)
+
+
 def _chunk(data: lbv, base: int, mask: int) -> lbv:
     return (data[0] >> base) & mask, (data[1] >> base) & mask
 
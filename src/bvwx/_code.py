@@ -59,7 +59,7 @@ def encode_onehot(x: ArrayLike) -> Array:
 
     y1 = clog2(d1)
     y0 = y1 ^ V._dmax
-    return V(y0, y1)
+    return V._cast_data(y0, y1)
 
 
 def encode_priority(x: ArrayLike) -> tuple[Array, Array]:
@@ -105,7 +105,7 @@ def encode_priority(x: ArrayLike) -> tuple[Array, Array]:
             x_i = x._get_index(i)
             # 0*1{0,1,-}*
             if x_i == lb.T:
-                return V(i ^ V._dmax, i), scalar1
+                return V._cast_data(i ^ V._dmax, i), scalar1
             # 0*-{0,1,-}* => W
             if x_i == lb.W:
                 return V.ws(), scalarW
@@ -120,7 +120,7 @@ def encode_priority(x: ArrayLike) -> tuple[Array, Array]:
 
     y1 = clog2(d1 + 1) - 1
     y0 = y1 ^ V._dmax
-    return V(y0, y1), scalar1
+    return V._cast_data(y0, y1), scalar1
 
 
 def decode(x: ArrayLike) -> Array:
@@ -167,4 +167,4 @@ def decode(x: ArrayLike) -> Array:
 
     d1 = 1 << x.to_uint()
     d0 = d1 ^ V._dmax
-    return V(d0, d1)
+    return V._cast_data(d0, d1)
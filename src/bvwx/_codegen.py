@@ -0,0 +1,56 @@
+"""Code Generation Helpers
+
+Shared pieces of generated functions:
+Struct field getters, Enum transition tables, and tabulated functions.
+"""
+
+import inspect
+from collections.abc import Callable, Sequence
+
+from ._bits import Array, ArrayLike, cast_data, expect_array_size
+
+type CastFunc = Callable[[type[Array], int, int], Array]
+
+
+def cast_func(t: type[Array]) -> CastFunc:
+    """Return a function ``(t, d0, d1)`` that casts data planes to type t.
+
+    Generated code passes ``t`` as a constant,
+    which skips the classmethod call, unless the type overrides it (Enum).
+    """
+    f = inspect.getattr_static(t, "_cast_data")
+    if f is inspect.getattr_static(Array, "_cast_data"):
+        return cast_data
+    return f.__func__
+
+
+def expect_inputs(xs: Sequence[ArrayLike], inputs: Sequence[type[Array]]) -> list[Array]:
+    """Check argument sizes, and cast each one to its input type."""
+    ys: list[Array] = []
+    for x, it in zip(xs, inputs):
+        d0, d1 = expect_array_size(x, it.size)._data
+        ys.append(it._cast_data(d0, d1))
+    return ys
+
+
+def known_inputs_source(inputs: Sequence[type[Array]], fallback: str) -> tuple[str, str]:
+    """Return source code that checks inputs ``x0, x1, ...``, and an index expression.
+
+    Inputs that are not ``Array`` objects of the input size are converted
+    with ``_arg``, and ``_Array`` is the ``Array`` class.
+    If any input has unknown bits, the generated code returns ``fallback``.
+    The index expression concatenates the known input values,
+    from LSB to MSB.
+    """
+    lines: list[str] = []
+    index: list[str] = []
+    shift = 0
+    for i, it in enumerate(inputs):
+        lines.append(f"    if not isinstance(x{i}, _Array) or x{i}.size != {it.size}:\n")
+        lines.append(f"        x{i} = _arg(x{i}, {it.size})\n")
+        lines.append(f"    _{i}0, _{i}1 = x{i}._data\n")
+        lines.append(f"    if _{i}0 ^ _{i}1 != {it._dmax:#x}:\n")
+        lines.append(f"        return {fallback}\n")
+        index.append(f"(_{i}1 << {shift})" if shift else f"_{i}1")
+        shift += it.size
+    return "".join(lines), " | ".join(index) or "0"
@@ -0,0 +1,901 @@
+"""Compile Python functions over Arrays into straight-line code.
+
+The ``compile_fn`` decorator traces a function by calling it with symbolic
+arguments.
+Each operator emits Python statements over the raw ``(d0, d1)`` planes,
+and the ``_lbool`` kernels build the symbolic plane expressions directly,
+so the generated code uses exactly the same lifted formulas as the
+eager operators.
+"""
+
+from __future__ import annotations
+
+import inspect
+import operator
+import re
+import sys
+from collections.abc import Callable
+from functools import update_wrapper
+from types import FunctionType, SimpleNamespace
+from typing import Any, get_origin
+
+from . import _lbool
+from ._arithmetic import adc, add, lsh, neg, ngc, rsh, sbc, sub
+from ._bits import (
+    Array,
+    ArrayLike,
+    array_cls,
+    bits_cat,
+    expect_array,
+    expect_array_size,
+    expect_scalar,
+    expect_uint,
+    lit2bv,
+    vec_cls,
+)
+from ._bitwise import and_, impl, ite, mux, not_, or_, xor
+from ._predicate import eq, ge, gt, le, lt, match, ne, sge, sgt, sle, slt
+from ._unary import uand, uor, uxor
+from ._util import mask
+from ._word import cat, rep
+
+# Code or constant int
+type _Plane = _Code | int
+
+# The kernels are annotated for int planes,
+# but only use operators that _Code also implements.
+lb: Any = _lbool
+
+
+class _Code:
+    """Python expression source code.
+
+    Bitwise operators build larger expressions.
+    Operations with constant ``int`` operands fold when possible.
+    """
+
+    __slots__ = ("_s",)
+
+    def __init__(self, s: str):
+        self._s = s
+
+    def __str__(self) -> str:
+        return self._s
+
+    def __or__(self, other: _Plane) -> _Plane:
+        if isinstance(other, int) and other == 0:
+            return self
+        return _Code(f"({self} | {other})")
+
+    def __ror__(self, other: int) -> _Plane:
+        return self.__or__(other)
+
+    def __and__(self, other: _Plane) -> _Plane:
+        if isinstance(other, int) and other == 0:
+            return 0
+        return _Code(f"({self} & {other})")
+
+    def __rand__(self, other: int) -> _Plane:
+        return self.__and__(other)
+
+    def __xor__(self, other: _Plane) -> _Plane:
+        if isinstance(other, int) and other == 0:
+            return self
+        return _Code(f"({self} ^ {other})")
+
+    def __rxor__(self, other: int) -> _Plane:
+        return self.__xor__(other)
+
+    def __mul__(self, other: _Plane) -> _Plane:
+        if isinstance(other, int) and other == 0:
+            return 0
+        return _Code(f"({self} * {other})")
+
+    def __rmul__(self, other: int) -> _Plane:
+        return self.__mul__(other)
+
+    def __lshift__(self, n: int) -> _Plane:
+        if n == 0:
+            return self
+        return _Code(f"({self} << {n})")
+
+    def __rshift__(self, n: int) -> _Plane:
+        if n == 0:
+            return self
+        return _Code(f"({self} >> {n})")
+
+
+_NAME_RE = re.compile(r"[_a-zA-Z][_a-zA-Z0-9]*")
+
+
+def _is_atom(x: _Plane) -> bool:
+    return isinstance(x, int) or _NAME_RE.fullmatch(str(x)) is not None
+
+
+class _Builder:
+    """Collect generated source code for one traced function."""
+
+    def __init__(self):
+        self._lines: list[str] = []
+        self._n = 0
+        self.globals: dict[str, Any] = {"_expect": expect_array_size}
+
+    def emit(self, line: str, indent: int = 1):
+        self._lines.append("    " * indent + line)
+
+    def temp(self) -> _Code:
+        name = f"_v{self._n}"
+        self._n += 1
+        return _Code(name)
+
+    def bind(self, x: _Plane) -> _Plane:
+        """Assign a non-trivial expression to a temporary variable."""
+        if _is_atom(x):
+            return x
+        y = self.temp()
+        self.emit(f"{y} = {x}")
+        return y
+
+    def glob(self, obj: Any) -> str:
+        """Make an object available to generated code."""
+        name = f"_g{len(self.globals)}"
+        self.globals[name] = obj
+        return name
+
+    def value(self, t: type[Array], x: tuple[_Plane, _Plane]) -> _Value:
+        return _Value(self, t, (self.bind(x[0]), self.bind(x[1])))
+
+    def const(self, x: Array) -> _Value:
+        return _Value(self, type(x), x._data)
+
+    def expect(self, arg: _Value | ArrayLike) -> _Value:
+        if isinstance(arg, _Value):
+            return arg
+        return self.const(expect_array(arg))
+
+    def expect_size(self, arg: _Value | ArrayLike, size: int) -> _Value:
+        if isinstance(arg, _Value):
+            if arg.size != size:
+                raise TypeError(f"Expected size {size}, got {arg.size}")
+            return arg
+        return self.const(expect_array_size(arg, size))
+
+    def expect_scalar(self, arg: _Value | ArrayLike) -> _Value:
+        if isinstance(arg, _Value):
+            return self.expect_size(arg, 1)
+        return self.const(expect_scalar(arg))
+
+    def branch(
+        self,
+        t: type[Array],
+        cases: list[tuple[_Plane, tuple[_Plane, _Plane]]],
+        default: tuple[_Plane | str, _Plane | str],
+    ) -> _Value:
+        """Emit an if/elif/else chain that assigns both planes of a result.
+
+        Constant conditions fold: zero drops the case,
+        and nonzero makes its outcome the default.
+        """
+        _cases: list[tuple[_Plane, tuple[_Plane, _Plane]]] = []
+        for cond, x in cases:
+            if isinstance(cond, int):
+                if cond:
+                    default = x
+                    break
+            else:
+                _cases.append((cond, x))
+
+        d0, d1 = default
+        if not _cases and isinstance(d0, int) and isinstance(d1, int):
+            return _Value(self, t, (d0, d1))
+
+        y0, y1 = self.temp(), self.temp()
+        for i, (cond, (x0, x1)) in enumerate(_cases):
+            kw = "if" if i == 0 else "elif"
+            self.emit(f"{kw} {cond}:")
+            self.emit(f"{y0}, {y1} = {x0}, {x1}", indent=2)
+        if _cases:
+            self.emit("else:")
+        self.emit(f"{y0}, {y1} = {default[0]}, {default[1]}", indent=2 if _cases else 1)
+        return _Value(self, t, (y0, y1))
+
+    def source(self, name: str, params: list[str]) -> str:
+        lines = [f"def {name}({', '.join(params)}):"]
+        lines.extend(self._lines)
+        return "\n".join(lines) + "\n"
+
+
+class _Value:
+    """Traced Array value: an Array type, and symbolic (d0, d1) planes."""
+
+    __slots__ = ("_b", "_t", "data")
+
+    def __init__(self, b: _Builder, t: type[Array], data: tuple[_Plane, _Plane]):
+        self._b = b
+        self._t = t
+        self.data = data
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self._t.shape
+
+    @property
+    def size(self) -> int:
+        return self._t.size
+
+    @property
+    def _data(self):
+        raise TypeError("Unsupported operation on a traced value")
+
+    def __getattr__(self, name: str):
+        raise TypeError(f"Unsupported operation on a traced value: {name}")
+
+    def __bool__(self) -> bool:
+        raise TypeError("Cannot use a traced value as a condition")
+
+    def __eq__(self, obj: Any) -> bool:
+        raise TypeError("Cannot compare a traced value; use eq or match")
+
+    __hash__ = object.__hash__
+
+    def hx(self) -> _Plane:
+        return (self.data[0] | self.data[1]) ^ self._t._dmax
+
+    def hw(self) -> _Plane:
+        return self.data[0] & self.data[1]
+
+    def __invert__(self) -> _Value:
+        return _not(self)
+
+    def __or__(self, other: ArrayLike) -> _Value:
+        return _or(self, self._b.expect_size(other, self.size))
+
+    def __ror__(self, other: ArrayLike) -> _Value:
+        return _or(self._b.expect_size(other, self.size), self)
+
+    def __and__(self, other: ArrayLike) -> _Value:
+        return _and(self, self._b.expect_size(other, self.size))
+
+    def __rand__(self, other: ArrayLike) -> _Value:
+        return _and(self._b.expect_size(other, self.size), self)
+
+    def __xor__(self, other: ArrayLike) -> _Value:
+        return _xor(self, self._b.expect_size(other, self.size))
+
+    def __rxor__(self, other: ArrayLike) -> _Value:
+        return _xor(self._b.expect_size(other, self.size), self)
+
+    def __lshift__(self, n: ArrayLike) -> _Value:
+        return _lsh(self, n)
+
+    def __rshift__(self, n: ArrayLike) -> _Value:
+        return _rsh(self, n)
+
+    def __add__(self, other: ArrayLike) -> _Value:
+        return _adc(self, other)
+
+    def __radd__(self, other: ArrayLike) -> _Value:
+        return _adc(other, self)
+
+    def __sub__(self, other: ArrayLike) -> _Value:
+        return _sbc(self, self._b.expect_size(other, self.size))
+
+    def __rsub__(self, other: ArrayLike) -> _Value:
+        return _sbc(self._b.expect_size(other, self.size), self)
+
+    def __neg__(self) -> _Value:
+        return _ngc(self)
+
+    def __getitem__(self, key: Any) -> _Value:
+        keys = list(key) if isinstance(key, tuple) else [key]
+        for k in keys:
+            if isinstance(k, _Value):
+                raise TypeError("Expected constant index")
+        nkey = self._t._norm_key(keys)
+        (start, stop), key_r = nkey[0], nkey[1:]
+        # Only contiguous selects: any slice of dim 0, full slices of other dims
+        if any((i, j) != (0, n) for (i, j), n in zip(key_r, self.shape[1:])):
+            raise TypeError("Expected full slices for all dimensions but the first")
+        if len(self.shape) == 1:
+            t = vec_cls(stop - start)
+        elif stop - start == 1:
+            t = array_cls(self.shape[1:])
+        else:
+            t = array_cls((stop - start,) + self.shape[1:])
+        inner = self._t.size // self.shape[0]
+        m = mask(t.size)
+        d0 = (self.data[0] >> (start * inner)) & m
+        d1 = (self.data[1] >> (start * inner)) & m
+        return self._b.value(t, (d0, d1))
+
+
+def _resolve(x0: _Value, x1: _Value) -> type[Array]:
+    # T (op) T -> T
+    if x0._t is x1._t:
+        return x0._t
+    # Otherwise, downgrade to Vector
+    return vec_cls(x0.size)
+
+
+def _builder(*args: Any) -> _Builder | None:
+    for arg in args:
+        if isinstance(arg, _Value):
+            return arg._b
+    return None
+
+
+def _traced(g: Callable[..., Array]):
+    """Call g eagerly, unless some argument is a traced value."""
+
+    def deco(f: Callable[..., Any]):
+        def h(*args: Any, **kwargs: Any) -> Any:
+            if (b := _builder(*args, *kwargs.values())) is None:
+                return g(*args, **kwargs)
+            return f(b, *args, **kwargs)
+
+        return h
+
+    return deco
+
+
+# Bitwise
+def _not(x: _Value) -> _Value:
+    return _Value(x._b, x._t, lb.not_(x.data))
+
+
+def _or(x0: _Value, x1: _Value) -> _Value:
+    return x0._b.value(_resolve(x0, x1), lb.or_(x0.data, x1.data))
+
+
+def _and(x0: _Value, x1: _Value) -> _Value:
+    return x0._b.value(_resolve(x0, x1), lb.and_(x0.data, x1.data))
+
+
+def _xor(x0: _Value, x1: _Value) -> _Value:
+    return x0._b.value(_resolve(x0, x1), lb.xor(x0.data, x1.data))
+
+
+@_traced(not_)
+def _t_not(b: _Builder, x: _Value | ArrayLike) -> Any:
+    return _not(b.expect(x))
+
+
+def _nary(f: Callable[[_Value, _Value], _Value], g: Callable[..., Array]):
+    def h(x0: _Value | ArrayLike, *xs: _Value | ArrayLike) -> Any:
+        if (b := _builder(x0, *xs)) is None:
+            return g(x0, *xs)
+        y = b.expect(x0)
+        for x in xs:
+            y = f(y, b.expect_size(x, y.size))
+        return y
+
+    return h
+
+
+@_traced(impl)
+def _t_impl(b: _Builder, p: _Value | ArrayLike, q: _Value | ArrayLike) -> Any:
+    p = b.expect(p)
+    q = b.expect_size(q, p.size)
+    return b.value(_resolve(p, q), lb.impl(p.data, q.data))
+
+
+@_traced(ite)
+def _t_ite(
+    b: _Builder, s: _Value | ArrayLike, x1: _Value | ArrayLike, x0: _Value | ArrayLike
+) -> Any:
+    s = b.expect_scalar(s)
+    x1 = b.expect(x1)
+    x0 = b.expect_size(x0, x1.size)
+    m = x1._t._dmax
+    sel = (b.bind(m * s.data[0]), b.bind(m * s.data[1]))
+    return b.value(_resolve(x1, x0), lb.ite(sel, x1.data, x0.data))
+
+
+_MUX_XN_RE = re.compile(r"x(\d+)")
+
+
+@_traced(mux)
+def _t_mux(b: _Builder, s: _Value | ArrayLike, **xs: _Value | ArrayLike) -> Any:
+    s = b.expect(s)
+    n = 1 << s.size
+
+    # Parse and check inputs
+    x0 = None
+    t = None
+    _xs: dict[int, tuple[_Plane, _Plane]] = {}
+    for name, value in xs.items():
+        if m := _MUX_XN_RE.match(name):
+            i = int(m.group(1))
+            if not 0 <= i < n:
+                raise ValueError(f"Expected x in [x0, ..., x{n - 1}]; got {name}")
+            if x0 is None:
+                x = b.expect(value)
+                x0, t = x, x._t
+            else:
+                x = b.expect_size(value, x0.size)
+                t = _resolve(x0, x)
+            _xs[i] = x.data
+        else:
+            raise ValueError(f"Invalid input name: {name}")
+
+    if t is None:
+        raise ValueError("Expected at least one mux input")
+
+    m = t._dmax
+    sel = tuple(
+        (b.bind(m * ((s.data[0] >> i) & 1)), b.bind(m * ((s.data[1] >> i) & 1)))
+        for i in range(s.size)
+    )
+    return b.value(t, _mux(b, sel, _xs, (m, m)))
+
+
+def _mux(
+    b: _Builder,
+    s: tuple[tuple[_Plane, _Plane], ...],
+    xs: dict[int, tuple[_Plane, _Plane]],
+    default: tuple[_Plane, _Plane],
+) -> tuple[_Plane, _Plane]:
+    """Like lb.mux, but bind each 2:1 mux output to temporary variables."""
+    if not s:
+        return xs.get(0, default)
+    n = 1 << (len(s) - 1)
+    xs_0 = {i: x for i, x in xs.items() if i < n}
+    xs_1 = {i - n: x for i, x in xs.items() if i >= n}
+    x0 = _mux(b, s[:-1], xs_0, default) if xs_0 else default
+    x1 = _mux(b, s[:-1], xs_1, default) if xs_1 else default
+    y0, y1 = lb._mux(s[-1], x0, x1)
+    return b.bind(y0), b.bind(y1)
+
+
+# Arithmetic
+def _add(a: _Value, x: _Value, ci: _Value) -> tuple[_Value, _Value]:
+    b = a._b
+    if a.size == x.size:
+        t = _resolve(a, x)
+    else:
+        t = vec_cls(max(a.size, x.size))
+    m = t._dmax
+
+    # X/W propagation
+    hx = [h for h in (v.hx() for v in (a, x, ci)) if not isinstance(h, int) or h]
+    hw = [h for h in (v.hw() for v in (a, x, ci)) if not isinstance(h, int) or h]
+    if any(isinstance(h, int) for h in hx):
+        return b.const(t.xs()), b.const(vec_cls(1).xs())
+    if not hx and any(isinstance(h, int) for h in hw):
+        return b.const(t.ws()), b.const(vec_cls(1).ws())
+
+    s0, s1, c0, c1 = b.temp(), b.temp(), b.temp(), b.temp()
+    indent = 1
+    if hx or hw:
+        for i, (cond, x0, x1) in enumerate([(hx, 0, 0), (hw, m, 1)]):
+            if cond:
+                kw = "elif" if i and hx else "if"
+                b.emit(f"{kw} {' or '.join(str(h) for h in cond)}:")
+                b.emit(f"{s0}, {s1}, {c0}, {c1} = {x0}, {x0}, {x1}, {x1}", indent=2)
+        b.emit("else:")
+        indent = 2
+    b.emit(f"{s1} = {a.data[1]} + {x.data[1]} + {ci.data[1]}", indent)
+    b.emit(f"{c1} = {s1} >> {t.size}", indent)
+    b.emit(f"{s1} &= {m}", indent)
+    b.emit(f"{s0} = {s1} ^ {m}", indent)
+    b.emit(f"{c0} = {c1} ^ 1", indent)
+
+    s = _Value(b, t, (s0, s1))
+    co = _Value(b, vec_cls(1), (c0, c1))
+    return s, co
+
+
+def _cat(b: _Builder, *xs: _Value) -> _Value:
+    if len(xs) == 1:
+        return xs[0]
+    size = 0
+    d0: _Plane = 0
+    d1: _Plane = 0
+    for x in xs:
+        d0 = d0 | (x.data[0] << size)
+        d1 = d1 | (x.data[1] << size)
+        size += x.size
+    return b.value(vec_cls(size), (d0, d1))
+
+
+@_traced(add)
+def _t_add(
+    b: _Builder, a: _Value | ArrayLike, x: _Value | ArrayLike, ci: _Value | ArrayLike | None = None
+) -> Any:
+    ci = b.expect_scalar(0 if ci is None else ci)
+    s, _ = _add(b.expect(a), b.expect(x), ci)
+    return s
+
+
+def _adc(a: _Value | ArrayLike, x: _Value | ArrayLike, ci: _Value | ArrayLike | None = None):
+    b = _builder(a, x, ci)
+    assert b is not None
+    ci = b.expect_scalar(0 if ci is None else ci)
+    s, co = _add(b.expect(a), b.expect(x), ci)
+    return _cat(b, s, co)
+
+
+@_traced(adc)
+def _t_adc(
+    b: _Builder, a: _Value | ArrayLike, x: _Value | ArrayLike, ci: _Value | ArrayLike | None = None
+) -> Any:
+    return _adc(a, x, ci)
+
+
+def _sbc(a: _Value, x: _Value) -> _Value:
+    b = a._b
+    s, co = _add(a, _not(x), b.const(expect_scalar(1)))
+    return _cat(b, s, co)
+
+
+@_traced(sub)
+def _t_sub(b: _Builder, a: _Value | ArrayLike, x: _Value | ArrayLike) -> Any:
+    a = b.expect(a)
+    x = b.expect_size(x, a.size)
+    s, _ = _add(a, _not(x), b.const(expect_scalar(1)))
+    return s
+
+
+@_traced(sbc)
+def _t_sbc(b: _Builder, a: _Value | ArrayLike, x: _Value | ArrayLike) -> Any:
+    a = b.expect(a)
+    return _sbc(a, b.expect_size(x, a.size))
+
+
+def _ngc(x: _Value) -> _Value:
+    b = x._b
+    s, co = _add(_not(x), b.const(x._t.zeros()), b.const(expect_scalar(1)))
+    return _cat(b, s, co)
+
+
+@_traced(neg)
+def _t_neg(b: _Builder, x: _Value | ArrayLike) -> Any:
+    x = b.expect(x)
+    s, _ = _add(_not(x), b.const(x._t.zeros()), b.const(expect_scalar(1)))
+    return s
+
+
+@_traced(ngc)
+def _t_ngc(b: _Builder, x: _Value | ArrayLike) -> Any:
+    return _ngc(b.expect(x))
+
+
+def _shift_amount(x: _Value, n: Any) -> int | _Value | None:
+    if isinstance(n, _Value):
+        raise TypeError("Expected constant shift amount")
+    n = expect_uint(n)
+    if n.has_x():
+        return x._b.const(x._t.xs())
+    if n.has_w():
+        return x._b.const(x._t.ws())
+    _n = n.to_uint()
+    if _n > x.size:
+        raise ValueError(f"Expected n ≤ {x.size}, got {_n}")
+    return _n
+
+
+def _lsh(x: _Value, n: Any) -> _Value:
+    _n = _shift_amount(x, n)
+    if isinstance(_n, _Value):
+        return _n
+    assert isinstance(_n, int)
+    m = x._t._dmax
+    d0 = ((x.data[0] << _n) & m) | mask(_n)
+    d1 = (x.data[1] << _n) & m
+    return x._b.value(x._t, (d0, d1))
+
+
+def _rsh(x: _Value, n: Any) -> _Value:
+    _n = _shift_amount(x, n)
+    if isinstance(_n, _Value):
+        return _n
+    assert isinstance(_n, int)
+    d0 = (x.data[0] >> _n) | (mask(_n) << (x.size - _n))
+    d1 = x.data[1] >> _n
+    return x._b.value(x._t, (d0, d1))
+
+
+@_traced(lsh)
+def _t_lsh(b: _Builder, x: _Value | ArrayLike, n: Any) -> Any:
+    return _lsh(b.expect(x), n)
+
+
+@_traced(rsh)
+def _t_rsh(b: _Builder, x: _Value | ArrayLike, n: Any) -> Any:
+    return _rsh(b.expect(x), n)
+
+
+# Word
+@_traced(cat)
+def _t_cat(b: _Builder, *objs: _Value | ArrayLike) -> Any:
+    xs: list[_Value] = []
+    for obj in objs:
+        if isinstance(obj, _Value):
+            xs.append(obj)
+        elif isinstance(obj, int) and obj in (0, 1):
+            xs.append(b.expect_scalar(obj))
+        elif isinstance(obj, str):
+            xs.append(b.const(lit2bv(obj)))
+        elif isinstance(obj, Array):
+            xs.append(b.const(obj))
+        else:
+            raise TypeError(f"Invalid input: {obj}")
+    if not xs:
+        return bits_cat()
+    return _cat(b, *xs)
+
+
+@_traced(rep)
+def _t_rep(b: _Builder, obj: _Value | ArrayLike, n: int) -> Any:
+    return _t_cat(*[obj] * n)
+
+
+# Unary
+_X = (0, 0)
+_0 = (1, 0)
+_1 = (0, 1)
+_W = (1, 1)
+
+
+def _uor(x: _Value) -> _Value:
+    m = x._t._dmax
+    has_1 = (x.data[0] ^ m) & x.data[1]
+    return x._b.branch(vec_cls(1), [(x.hx(), _X), (has_1, _1), (x.hw(), _W)], _0)
+
+
+def _uand(x: _Value) -> _Value:
+    m = x._t._dmax
+    has_0 = x.data[0] & (x.data[1] ^ m)
+    return x._b.branch(vec_cls(1), [(x.hx(), _X), (has_0, _0), (x.hw(), _W)], _1)
+
+
+def _uxor(x: _Value) -> _Value:
+    b = x._b
+    d1 = x.data[1]
+    if isinstance(d1, int):
+        p = d1.bit_count() & 1
+        parity = (p ^ 1, p)
+    else:
+        p = b.temp()
+        b.emit(f"{p} = {d1}.bit_count() & 1")
+        parity = (f"{p} ^ 1", p)
+    return b.branch(vec_cls(1), [(x.hx(), _X), (x.hw(), _W)], parity)
+
+
+def _unary(f: Callable[[_Value], _Value], g: Callable[..., Array]):
+    @_traced(g)
+    def h(b: _Builder, x: _Value | ArrayLike) -> Any:
+        return f(b.expect(x))
+
+    return h
+
+
+# Predicate
+def _binary(g: Callable[..., Array]):
+    def deco(f: Callable[[_Value, _Value], _Value]):
+        def h(x0: _Value | ArrayLike, x1: _Value | ArrayLike) -> Any:
+            if (b := _builder(x0, x1)) is None:
+                return g(x0, x1)
+            x0 = b.expect(x0)
+            return f(x0, b.expect_size(x1, x0.size))
+
+        return h
+
+    return deco
+
+
+@_binary(eq)
+def _t_eq(x0: _Value, x1: _Value) -> _Value:
+    return _uand(x0._b.value(_resolve(x0, x1), lb.xnor(x0.data, x1.data)))
+
+
+@_binary(ne)
+def _t_ne(x0: _Value, x1: _Value) -> _Value:
+    return _uor(x0._b.value(_resolve(x0, x1), lb.xor(x0.data, x1.data)))
+
+
+_CMP_OPS: dict[str, Callable[[int, int], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _cmp(x0: _Value, x1: _Value, op: str, signed: bool) -> _Value:
+    b = x0._b
+    h = (1 << (x0.size - 1)) if signed and x0.size else 0
+    a1 = x0.data[1] ^ h
+    b1 = x1.data[1] ^ h
+    if isinstance(a1, int) and isinstance(b1, int):
+        y = int(_CMP_OPS[op](a1, b1))
+        known = (y ^ 1, y)
+    else:
+        y = b.temp()
+        b.emit(f"{y} = int({a1} {op} {b1})")
+        known = (f"{y} ^ 1", y)
+    hx = x0.hx() | x1.hx()
+    hw = x0.hw() | x1.hw()
+    return b.branch(vec_cls(1), [(hx, _X), (hw, _W)], known)
+
+
+@_binary(lt)
+def _t_lt(x0: _Value, x1: _Value) -> _Value:
+    return _cmp(x0, x1, "<", signed=False)
+
+
+@_binary(le)
+def _t_le(x0: _Value, x1: _Value) -> _Value:
+    return _cmp(x0, x1, "<=", signed=False)
+
+
+@_binary(gt)
+def _t_gt(x0: _Value, x1: _Value) -> _Value:
+    return _cmp(x0, x1, ">", signed=False)
+
+
+@_binary(ge)
+def _t_ge(x0: _Value, x1: _Value) -> _Value:
+    return _cmp(x0, x1, ">=", signed=False)
+
+
+@_binary(slt)
+def _t_slt(x0: _Value, x1: _Value) -> _Value:
+    return _cmp(x0, x1, "<", signed=True)
+
+
+@_binary(sle)
+def _t_sle(x0: _Value, x1: _Value) -> _Value:
+    return _cmp(x0, x1, "<=", signed=True)
+
+
+@_binary(sgt)
+def _t_sgt(x0: _Value, x1: _Value) -> _Value:
+    return _cmp(x0, x1, ">", signed=True)
+
+
+@_binary(sge)
+def _t_sge(x0: _Value, x1: _Value) -> _Value:
+    return _cmp(x0, x1, ">=", signed=True)
+
+
+@_binary(match)
+def _t_match(x0: _Value, x1: _Value) -> _Value:
+    hx = x0.hx() | x1.hx()
+    miss = (x0.data[0] ^ x1.data[0]) & (x0.data[1] ^ x1.data[1])
+    return x0._b.branch(vec_cls(1), [(hx, _X), (miss, _0)], _1)
+
+
+# Operator => Traced operator
+_TRACED: dict[Callable[..., Any], Callable[..., Any]] = {
+    not_: _t_not,
+    or_: _nary(_or, or_),
+    and_: _nary(_and, and_),
+    xor: _nary(_xor, xor),
+    impl: _t_impl,
+    ite: _t_ite,
+    mux: _t_mux,
+    add: _t_add,
+    adc: _t_adc,
+    sub: _t_sub,
+    sbc: _t_sbc,
+    neg: _t_neg,
+    ngc: _t_ngc,
+    lsh: _t_lsh,
+    rsh: _t_rsh,
+    cat: _t_cat,
+    rep: _t_rep,
+    uor: _unary(_uor, uor),
+    uand: _unary(_uand, uand),
+    uxor: _unary(_uxor, uxor),
+    eq: _t_eq,
+    ne: _t_ne,
+    lt: _t_lt,
+    le: _t_le,
+    gt: _t_gt,
+    ge: _t_ge,
+    slt: _t_slt,
+    sle: _t_sle,
+    sgt: _t_sgt,
+    sge: _t_sge,
+    match: _t_match,
+}
+
+
+def _rebind(fn: FunctionType) -> FunctionType:
+    """Return a copy of fn where global operators are replaced by traced operators."""
+    pkg = sys.modules[__name__.rpartition(".")[0]]
+    ns = {name: _TRACED.get(f, f) for name, f in vars(pkg).items() if callable(f)}
+
+    globals_ = dict(fn.__globals__)
+    for name, obj in globals_.items():
+        if obj is pkg:
+            globals_[name] = SimpleNamespace(**{**vars(pkg), **ns})
+        elif isinstance(obj, FunctionType) and obj in _TRACED:
+            globals_[name] = _TRACED[obj]
+
+    return FunctionType(fn.__code__, globals_, fn.__name__, fn.__defaults__, fn.__closure__)
+
+
+def _output(b: _Builder, y: Any) -> str:
+    if isinstance(y, _Value):
+        t = b.glob(y._t)
+        return f"{t}._cast_data({y.data[0]}, {y.data[1]})"
+    if isinstance(y, tuple | list):
+        items = ", ".join(_output(b, x) for x in y)
+        return f"({items},)" if isinstance(y, tuple) else f"[{items}]"
+    if isinstance(y, str):
+        y = lit2bv(y)
+    if y is None or isinstance(y, Array):
+        return b.glob(y)
+    raise TypeError(f"Expected Array output, got {type(y).__name__}")
+
+
+def compile_fn[F: Callable[..., Any]](fn: F) -> F:
+    """Compile a function over ``Array`` values into straight-line code.
+
+    Every parameter must have an ``Array`` type annotation.
+    The function is traced once with symbolic arguments,
+    and each operator emits code that works directly on the
+    ``(d0, d1)`` data planes.
+    The compiled function checks its inputs once,
+    and allocates ``Array`` objects only for its outputs.
+
+    For example:
+
+    >>> from bvwx import Array, ite
+    >>> @compile_fn
+    ... def f(s: Array[1], a: Array[4], b: Array[4]) -> Array[4]:
+    ...     return ite(s, a & b, a | b)
+    >>> f("1b1", "4b1100", "4b1010")
+    bits("4b1000")
+    >>> f("1b0", "4b1100", "4b1010")
+    bits("4b1110")
+    >>> f("1bX", "4b1100", "4b1010")
+    bits("4bXXXX")
+
+    Supported operators are ``not_``, ``or_``, ``and_``, ``xor``, ``impl``,
+    ``ite``, ``mux``, ``add``, ``adc``, ``sub``, ``sbc``, ``neg``, ``ngc``,
+    ``lsh``, ``rsh``, ``cat``, ``rep``, ``uor``, ``uand``, ``uxor``,
+    all predicates, and the equivalent Python operators and slices.
+    Shift amounts and slice indices must be constant.
+
+    The function body may not branch on traced values.
+    Operators are only traced when called through a global name,
+    or through the ``bvwx`` module.
+
+    Args:
+        fn: Function with ``Array``-annotated parameters.
+
+    Returns:
+        Function with the same signature and results.
+
+    Raises:
+        TypeError: Missing or invalid annotation, or unsupported operation.
+    """
+    assert isinstance(fn, FunctionType)
+
+    annotations = inspect.get_annotations(fn, eval_str=True)
+    b = _Builder()
+    params: list[str] = []
+    args: list[_Value] = []
+    for i, (name, p) in enumerate(inspect.signature(fn).parameters.items()):
+        if p.kind not in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD):
+            raise TypeError(f"Unsupported parameter kind: {name}")
+        val = annotations.get(name)
+        t = get_origin(val) or val
+        if not (isinstance(t, type) and issubclass(t, Array)):
+            raise TypeError(f"Expected parameter {name} to have an Array type annotation")
+        d0, d1 = _Code(f"_i{i}_0"), _Code(f"_i{i}_1")
+        b.emit(f"{d0}, {d1} = _expect({name}, {t.size})._data")
+        params.append(name)
+        args.append(_Value(b, t, (d0, d1)))
+
+    y = _rebind(fn)(*args)
+    b.emit(f"return {_output(b, y)}")
+
+    locals_: dict[str, Any] = {}
+    exec(b.source(fn.__name__, params), b.globals, locals_)
+    f = locals_[fn.__name__]
+    update_wrapper(f, fn)
+    return f
@@ -18,7 +18,7 @@ def cpop(x: ArrayLike) -> Array:
 
     d1 = x._data[1].bit_count()
     d0 = d1 ^ V._dmax
-    return V(d0, d1)
+    return V._cast_data(d0, d1)
 
 
 def clz(x: ArrayLike) -> Array:
@@ -35,7 +35,7 @@ def clz(x: ArrayLike) -> Array:
 
     d1 = x.size - clog2(x._data[1] + 1)
     d0 = d1 ^ V._dmax
-    return V(d0, d1)
+    return V._cast_data(d0, d1)
 
 
 def ctz(x: ArrayLike) -> Array:
@@ -53,4 +53,4 @@ def ctz(x: ArrayLike) -> Array:
     d = (1 << x.size) - x._data[1]
     d1 = clog2(-d & d)
     d0 = d1 ^ V._dmax
-    return V(d0, d1)
+    return V._cast_data(d0, d1)
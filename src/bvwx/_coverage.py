@@ -0,0 +1,379 @@
+"""Functional Coverage
+
+A ``Covergroup`` counts sampled values in named bins.
+Each ``Coverpoint`` has a fixed ``Array`` type, and a mapping from bin name
+to bin specification:
+
+* A value, for example ``"4b1010"``, ``bits("4b1010")``, or ``10``
+* A wildcard literal, for example ``"4b1--0"``, using ``match`` semantics
+* A ``range`` of unsigned values, for example ``range(1, 8)``
+* A ``list`` of any of the above
+
+Values with unknown bits are counted separately, and hit no bins.
+
+Bins are resolved once per distinct value:
+exact values are a ``dict`` lookup,
+and wildcard/range bins compare precomputed masks against the data planes.
+Counts are stored in ``array("Q")`` buffers.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+from itertools import product
+from typing import Any
+
+from ._bits import Array, ArrayLike, expect_array_size
+from ._enum import EnumType
+
+type BinSpec = ArrayLike | range | list[BinSpec]
+
+# Automatic bins: one per value
+_AUTO_MAX_SIZE = 8
+
+# Maximum memoized values per coverpoint
+_MEMO_SIZE = 1 << 16
+
+
+def _zeros(n: int) -> array[int]:
+    return array("Q", bytes(8 * n))
+
+
+def _auto_bins(t: type[Array]) -> dict[str, BinSpec]:
+    if isinstance(t, EnumType):
+        return {
+            name: t._cast_data(*data)
+            for data, name in t._data2key.items()
+            if name not in ("X", "W")
+        }
+    if t.size <= _AUTO_MAX_SIZE and len(t.shape) == 1:
+        return {str(t._cast_data(i ^ t._dmax, i)): i for i in range(1 << t.size)}
+    s = f"Expected bins for {t.__name__}: auto bins need Enum, or Vector size ≤ {_AUTO_MAX_SIZE}"
+    raise ValueError(s)
+
+
+class Coverpoint:
+    """Count sampled values of one ``Array`` type in bins.
+
+    Create with ``Covergroup.coverpoint``.
+    """
+
+    __slots__ = (
+        "_name",
+        "_t",
+        "_names",
+        "_exact",
+        "_wild",
+        "_ranges",
+        "_memo",
+        "_counts",
+        "_unknown",
+    )
+
+    def __init__(self, name: str, t: type[Array], bins: Mapping[str, BinSpec] | None):
+        self._name = name
+        self._t = t
+        if bins is None:
+            bins = _auto_bins(t)
+        self._names = list(bins)
+
+        # Known value => bins
+        self._exact: dict[int, list[int]] = {}
+        # (care mask, value, bin)
+        self._wild: list[tuple[int, int, int]] = []
+        # (start, stop, bin)
+        self._ranges: list[tuple[int, int, int]] = []
+        for i, spec in enumerate(bins.values()):
+            self._add(i, spec)
+
+        # Known value => hit bins
+        self._memo: dict[int, tuple[int, ...]] = {}
+        self._counts = _zeros(len(self._names))
+        self._unknown = 0
+
+    def __repr__(self) -> str:
+        return f"Coverpoint({self._name!r}, {self._t.__name__})"
+
+    def _add(self, i: int, spec: BinSpec):
+        if isinstance(spec, list):
+            for s in spec:
+                self._add(i, s)
+        elif isinstance(spec, range):
+            if spec.step != 1 or spec.start < 0 or spec.stop > self._t._dmax + 1:
+                s = f"Expected range in [0, {self._t._dmax + 1}] with step 1, got {spec}"
+                raise ValueError(s)
+            self._ranges.append((spec.start, spec.stop, i))
+        else:
+            x = expect_array_size(spec, self._t.size)
+            if x.has_x():
+                raise ValueError(f"Expected bin with no X bits, got {x}")
+            d0, d1 = x._data
+            if x.has_w():
+                care = (d0 & d1) ^ self._t._dmax
+                self._wild.append((care, d1 & care, i))
+            else:
+                self._exact.setdefault(d1, []).append(i)
+
+    def _bins(self, d1: int) -> tuple[int, ...]:
+        try:
+            return self._memo[d1]
+        except KeyError:
+            hits = set(self._exact.get(d1, ()))
+            hits.update(i for care, val, i in self._wild if d1 & care == val)
+            hits.update(i for start, stop, i in self._ranges if start <= d1 < stop)
+            y = tuple(sorted(hits))
+            if len(self._memo) < _MEMO_SIZE:
+                self._memo[d1] = y
+            return y
+
+    def sample(self, x: ArrayLike) -> tuple[int, ...]:
+        """Count one value.
+
+        Args:
+            x: Value with the same size as the coverpoint type.
+
+        Returns:
+            Indices of hit bins.
+
+        Raises:
+            TypeError: ``x`` has the wrong size.
+        """
+        if not isinstance(x, Array) or x.size != self._t.size:
+            x = expect_array_size(x, self._t.size)
+        d0, d1 = x._data
+        if d0 ^ d1 != self._t._dmax:
+            self._unknown += 1
+            return ()
+        hits = self._bins(d1)
+        counts = self._counts
+        for i in hits:
+            counts[i] += 1
+        return hits
+
+    @property
+    def name(self) -> str:
+        """Coverpoint name."""
+        return self._name
+
+    @property
+    def bins(self) -> list[str]:
+        """Bin names."""
+        return list(self._names)
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """Mapping from bin name to number of hits."""
+        return dict(zip(self._names, self._counts))
+
+    @property
+    def unknown(self) -> int:
+        """Number of samples with unknown bits."""
+        return self._unknown
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of bins with at least one hit."""
+        return _coverage(self._counts)
+
+    def reset(self):
+        """Set all counts to zero."""
+        self._counts = _zeros(len(self._names))
+        self._unknown = 0
+
+
+class Cross:
+    """Count combinations of bins hit by coverpoints in the same sample.
+
+    Create with ``Covergroup.cross``.
+    """
+
+    __slots__ = ("_name", "_points", "_strides", "_counts")
+
+    def __init__(self, name: str, points: tuple[Coverpoint, ...]):
+        self._name = name
+        self._points = points
+        self._strides: list[int] = []
+        n = 1
+        for p in reversed(points):
+            self._strides.insert(0, n)
+            n *= len(p._names)
+        self._counts = _zeros(n)
+
+    def __repr__(self) -> str:
+        names = ", ".join(p._name for p in self._points)
+        return f"Cross({self._name!r}, {names})"
+
+    def _sample(self, hits: list[tuple[int, ...]]):
+        counts = self._counts
+        for combo in product(*hits):
+            counts[sum(i * n for i, n in zip(combo, self._strides))] += 1
+
+    @property
+    def name(self) -> str:
+        """Cross name."""
+        return self._name
+
+    @property
+    def bins(self) -> list[tuple[str, ...]]:
+        """Bin names: one tuple per combination of coverpoint bins."""
+        return list(product(*[p._names for p in self._points]))
+
+    @property
+    def counts(self) -> dict[tuple[str, ...], int]:
+        """Mapping from bin names to number of hits."""
+        return dict(zip(self.bins, self._counts))
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of bins with at least one hit."""
+        return _coverage(self._counts)
+
+    def reset(self):
+        """Set all counts to zero."""
+        self._counts = _zeros(len(self._counts))
+
+
+def _coverage(counts: array[int]) -> float:
+    if not counts:
+        return 1.0
+    return (len(counts) - counts.count(0)) / len(counts)
+
+
+class Covergroup:
+    """Group of coverpoints and crosses, sampled together.
+
+    For example:
+
+    >>> from bvwx import Array, Enum
+    >>> class Op(Enum):
+    ...     ADD = "2b00"
+    ...     SUB = "2b01"
+    ...     AND = "2b10"
+    >>> cg = Covergroup()
+    >>> op = cg.coverpoint("op", Op)
+    >>> bins = {"zero": 0, "small": range(1, 16), "neg": "8b1-------"}
+    >>> imm = cg.coverpoint("imm", Array[8], bins)
+    >>> _ = cg.cross("op_imm", op, imm)
+    >>> cg.sample(op=Op.ADD, imm="8h05")
+    >>> cg.sample(op=Op.SUB, imm="8hF0")
+    >>> op.counts
+    {'ADD': 1, 'SUB': 1, 'AND': 0}
+    >>> imm.counts
+    {'zero': 0, 'small': 1, 'neg': 1}
+    >>> cg["op_imm"].coverage
+    0.2222222222222222
+    """
+
+    __slots__ = ("_points", "_crosses")
+
+    def __init__(self):
+        self._points: dict[str, Coverpoint] = {}
+        self._crosses: dict[str, Cross] = {}
+
+    def _check_name(self, name: str):
+        if name in self._points or name in self._crosses:
+            raise ValueError(f"Duplicate name: {name}")
+
+    def coverpoint(
+        self,
+        name: str,
+        t: type[Array],
+        bins: Mapping[str, BinSpec] | None = None,
+    ) -> Coverpoint:
+        """Add a coverpoint.
+
+        Args:
+            name: Coverpoint name.
+                  ``sample`` finds the value by this name.
+            t: ``Array`` type.
+            bins: Mapping from bin name to bin specification.
+                  Defaults to one bin per ``Enum`` member,
+                  or one bin per value for small ``Vector`` types.
+
+        Returns:
+            New coverpoint.
+
+        Raises:
+            TypeError: Bin value has the wrong size.
+            ValueError: Duplicate name, invalid bin,
+                        or no bins for a type without automatic bins.
+        """
+        self._check_name(name)
+        p = Coverpoint(name, t, bins)
+        self._points[name] = p
+        return p
+
+    def cross(self, name: str, *points: Coverpoint) -> Cross:
+        """Add a cross of two or more coverpoints.
+
+        Args:
+            name: Cross name.
+            points: Coverpoints in this group.
+
+        Returns:
+            New cross.
+
+        Raises:
+            ValueError: Duplicate name, fewer than two coverpoints,
+                        or coverpoint not in this group.
+        """
+        self._check_name(name)
+        if len(points) < 2:  # noqa: PLR2004
+            raise ValueError(f"Expected ≥ 2 coverpoints, got {len(points)}")
+        for p in points:
+            if self._points.get(p._name) is not p:
+                raise ValueError(f"Coverpoint not in group: {p._name}")
+        c = Cross(name, points)
+        self._crosses[name] = c
+        return c
+
+    def sample(self, obj: Any = None, /, **values: ArrayLike):
+        """Sample all coverpoints and crosses.
+
+        Either pass an object, such as a ``Struct``,
+        with one attribute per coverpoint name,
+        or pass values by keyword.
+
+        Raises:
+            KeyError: Missing coverpoint value.
+            TypeError: Value has the wrong size.
+        """
+        if obj is None:
+            hits = {name: p.sample(values[name]) for name, p in self._points.items()}
+        else:
+            hits = {name: p.sample(getattr(obj, name)) for name, p in self._points.items()}
+        for c in self._crosses.values():
+            c._sample([hits[p._name] for p in c._points])
+
+    def __getitem__(self, name: str) -> Coverpoint | Cross:
+        try:
+            return self._points[name]
+        except KeyError:
+            return self._crosses[name]
+
+    @property
+    def coverage(self) -> float:
+        """Mean coverage of all coverpoints and crosses."""
+        items = [*self._points.values(), *self._crosses.values()]
+        if not items:
+            return 1.0
+        return sum(x.coverage for x in items) / len(items)
+
+    def reset(self):
+        """Set all counts to zero."""
+        for p in self._points.values():
+            p.reset()
+        for c in self._crosses.values():
+            c.reset()
+
+    def report(self) -> str:
+        """Return a text summary of all bins."""
+        lines = [f"coverage: {self.coverage:.1%}"]
+        for p in self._points.values():
+            lines.append(f"{p._name}: {p.coverage:.1%} (unknown: {p._unknown})")
+            lines.extend(f"  {b}: {n}" for b, n in p.counts.items())
+        for c in self._crosses.values():
+            lines.append(f"{c._name}: {c.coverage:.1%}")
+            lines.extend(f"  {', '.join(b)}: {n}" for b, n in c.counts.items())
+        return "\n".join(lines)
@@ -0,0 +1,108 @@
+"""Cube Operations
+
+A cube is a pair of ``(d0, d1)`` planes with the same encoding as ``bits``:
+``0`` is ``(1, 0)``, ``1`` is ``(0, 1)``, and ``-`` is ``(1, 1)``.
+A cover is a list of cubes.
+Cube operations are bitwise operations on the planes,
+so each one checks every variable at once.
+
+The ``full`` argument has one bit set for each variable.
+"""
+
+type Cube = tuple[int, int]
+
+
+def literals(c: Cube) -> int:
+    """Return the number of literals in cube c."""
+    return (c[0] ^ c[1]).bit_count()
+
+
+def contains(a: Cube, b: Cube) -> bool:
+    """Return True if cube a contains cube b."""
+    return not (b[0] & ~a[0]) | (b[1] & ~a[1])
+
+
+def cofactor(f: list[Cube], c: Cube, full: int) -> list[Cube]:
+    """Return the cofactor of f with respect to cube c."""
+    care = full ^ (c[0] & c[1])
+    return [(f0 | care, f1 | care) for f0, f1 in f if (f0 & c[0]) | (f1 & c[1]) == full]
+
+
+def intersect(f: list[Cube], g: list[Cube], full: int) -> list[Cube]:
+    """Return a cover of every minterm in both cover f and cover g."""
+    ys: list[Cube] = []
+    for f0, f1 in f:
+        for g0, g1 in g:
+            c = (f0 & g0, f1 & g1)
+            if c[0] | c[1] == full:
+                ys.append(c)
+    return ys
+
+
+def _split_var(f: list[Cube], vs: int) -> int:
+    """Return the variable in vs with the most literals in f."""
+    best, best_n = -1, -1
+    for i in range(vs.bit_length()):
+        if (vs >> i) & 1:
+            n = sum(((f0 ^ f1) >> i) & 1 for f0, f1 in f)
+            if n > best_n:
+                best, best_n = i, n
+    return best
+
+
+def _polarity(f: list[Cube], full: int) -> tuple[int, int] | None:
+    """Return (negative, positive) literal masks, or None if f has a universal cube."""
+    neg = pos = 0
+    for f0, f1 in f:
+        if f0 & f1 == full:
+            return None
+        neg |= f0 & ~f1
+        pos |= f1 & ~f0
+    return neg, pos
+
+
+def tautology(f: list[Cube], full: int) -> bool:
+    """Return True if cover f contains every minterm."""
+    if not f:
+        return False
+    p = _polarity(f, full)
+    if p is None:
+        return True
+    # A unate cover is a tautology only if it has a universal cube
+    binate = p[0] & p[1]
+    if not binate:
+        return False
+    b = 1 << _split_var(f, binate)
+    return tautology(cofactor(f, (full, full ^ b), full), full) and tautology(
+        cofactor(f, (full ^ b, full), full), full
+    )
+
+
+def complement(f: list[Cube], full: int) -> list[Cube]:
+    """Return a cover of every minterm not in cover f."""
+    if not f:
+        return [(full, full)]
+    p = _polarity(f, full)
+    if p is None:
+        return []
+    # De Morgan
+    if len(f) == 1:
+        c0, c1 = f[0]
+        ys: list[Cube] = []
+        for i in range(full.bit_length()):
+            b = 1 << i
+            if (c0 ^ c1) & b:
+                ys.append((full ^ b, full) if c0 & b else (full, full ^ b))
+        return ys
+
+    neg, pos = p
+    b = 1 << _split_var(f, (neg & pos) or (neg | pos))
+    ys0 = complement(cofactor(f, (full, full ^ b), full), full)
+    ys1 = complement(cofactor(f, (full ^ b, full), full), full)
+
+    # Merge cubes in both halves
+    both = set(ys0) & set(ys1)
+    ys = [c for c in ys0 if c in both]
+    ys.extend((c0, c1 ^ b) for c0, c1 in ys0 if (c0, c1) not in both)
+    ys.extend((c0 ^ b, c1) for c0, c1 in ys1 if (c0, c1) not in both)
+    return ys
@@ -1,12 +1,23 @@
 """Bits Enum data type."""
 
+from collections.abc import Callable
+from itertools import product
 from typing import Any
 
 from ._bits import Array, ArrayLike, cast_data, expect_array_size, vec_cls
+from ._codegen import expect_inputs, known_inputs_source
 from ._lbool import parse_lit
 from ._util import mask
 
 type Data2Key = dict[tuple[int, int], str]
+type Data2Member = dict[tuple[int, int], Array]
+
+# Maximum size for a dense member table, indexed by known value.
+# Larger enums use only the (d0, d1) => member dict.
+_DENSE_MAX_SIZE = 8
+
+# Maximum total input size for a transition table
+_TRANSITION_MAX_SIZE = 16
 
 
 def _parse_attrs(attrs: dict[str, Any]) -> tuple[dict[str, Any], Data2Key, int]:
@@ -53,10 +64,69 @@ def _vcd_var(self) -> str:
     return "string"
 
 
+def _transition_source(size: int, inputs: tuple[type[Array], ...]) -> str:
+    """Return source code for an unrolled transition table lookup.
+
+    State size, input sizes, masks, and shifts are constants.
+    """
+    lines: list[str] = []
+    s = "".join(f", x{i}" for i in range(len(inputs)))
+    lines.append(f"def next_state(s{s}):\n")
+    lines.append(f"    if not isinstance(s, _Array) or s.size != {size}:\n")
+    lines.append(f"        s = _arg(s, {size})\n")
+    lines.append("    i = _states.get(s._data)\n")
+    lines.append("    if i is None:\n")
+    lines.append(f"        return _fallback(s{s})\n")
+    check, index = known_inputs_source(inputs, f"_fallback(s{s})")
+    lines.append(check)
+    lines.append(f"    return _table[i | {index}]\n")
+    return "".join(lines)
+
+
+def _transitions(
+    t: "EnumType",
+    f: Callable[..., ArrayLike],
+    inputs: tuple[type[Array], ...],
+) -> Callable[..., Array]:
+    size = sum(it.size for it in inputs)
+    if size > _TRANSITION_MAX_SIZE:
+        s = f"Expected total input size ≤ {_TRANSITION_MAX_SIZE}, got {size}"
+        raise ValueError(s)
+
+    # Member data => table offset, excluding X/W
+    members = [getattr(t, key) for key in t._data2key.values() if key not in ("X", "W")]
+    states = {x._data: i << size for i, x in enumerate(members)}
+
+    # Index: state index, then inputs from LSB to MSB
+    table: list[Array] = []
+    for x in members:
+        for ds in product(*[range(1 << it.size) for it in reversed(inputs)]):
+            xs = [it._cast_data(d1 ^ it._dmax, d1) for it, d1 in zip(inputs, reversed(ds))]
+            table.append(t(f(x, *xs)))
+
+    def fallback(s: Array, *xs: ArrayLike) -> Array:
+        # Cast the state and inputs like the table
+        return t(f(t(s), *expect_inputs(xs, inputs)))
+
+    globals_: dict[str, Any] = {
+        "_states": states,
+        "_table": table,
+        "_fallback": fallback,
+        "_Array": Array,
+        "_arg": expect_array_size,
+    }
+    locals_: dict[str, Any] = {}
+    exec(_transition_source(t.size, inputs), globals_, locals_)
+    return locals_["next_state"]
+
+
 class EnumType(type):
     """Enum Metaclass: Create enum base classes."""
 
+    size: int
     _data2key: Data2Key
+    _data2member: Data2Member
+    _dense: list[Array | None] | None
 
     def __new__(
         mcls,
@@ -78,14 +148,41 @@ class EnumType(type):
         V = vec_cls(size)
 
         # Create Enum class
-        ns: dict[str, Any] = {"__slots__": (), "_data2key": data2key}
+        # Members are filled in by __init__
+        data2member: Data2Member = {}
+        dense: list[Array | None] | None = None
+        if size <= _DENSE_MAX_SIZE:
+            dense = [None] * (1 << size)
+        ns: dict[str, Any] = {
+            "__slots__": (),
+            "_data2key": data2key,
+            "_data2member": data2member,
+            "_dense": dense,
+        }
         cls = super().__new__(mcls, name, (V,), ns)
+        dmax = V._dmax
 
-        def _cast_data(cls, d0: int, d1: int) -> Array:
-            try:
-                return getattr(cls, data2key[(d0, d1)])
-            except KeyError:
-                return cast_data(cls, d0, d1)
+        if dense is None:
+
+            def _cast_data(cls, d0: int, d1: int) -> Array:
+                try:
+                    return data2member[(d0, d1)]
+                except KeyError:
+                    return cast_data(cls, d0, d1)
+
+        else:
+
+            def _cast_data(cls, d0: int, d1: int) -> Array:
+                # Known value: index by d1
+                if d0 ^ d1 == dmax:
+                    x = dense[d1]
+                    if x is None:
+                        return cast_data(cls, d0, d1)
+                    return x
+                try:
+                    return data2member[(d0, d1)]
+                except KeyError:
+                    return cast_data(cls, d0, d1)
 
         def _repr(self) -> str:
             try:
@@ -132,13 +229,60 @@ class EnumType(type):
 
         # Instantiate members
         for (d0, d1), key in cls._data2key.items():
-            setattr(cls, key, cast_data(cls, d0, d1))
+            x = cast_data(cls, d0, d1)
+            setattr(cls, key, x)
+            cls._data2member[(d0, d1)] = x
+            if cls._dense is not None and d0 ^ d1 == cls._dmax:
+                cls._dense[d1] = x
 
     def __call__(cls, arg: ArrayLike):
         assert issubclass(cls, Array)  # Help type checker
         x = expect_array_size(arg, cls.size)
         return cls._cast_data(x._data[0], x._data[1])
 
+    def transitions(cls, f: Callable[..., ArrayLike], *inputs: type[Array]) -> Callable[..., Array]:
+        """Precompute a next state function.
+
+        Call ``f`` once for every member, and every known input value.
+
+        For example:
+
+        >>> from bvwx import Array, Enum
+        >>> class State(Enum):
+        ...     IDLE = "2b00"
+        ...     BUSY = "2b01"
+        ...     DONE = "2b10"
+        >>> def f(s, go):
+        ...     match s:
+        ...         case State.IDLE:
+        ...             return State.BUSY if go else State.IDLE
+        ...         case State.BUSY:
+        ...             return State.DONE
+        ...         case _:
+        ...             return State.IDLE
+        >>> next_state = State.transitions(f, Array[1])
+        >>> next_state(State.IDLE, "1b1")
+        State.BUSY
+        >>> next_state(State.BUSY, "1bX")
+        State.DONE
+
+        Args:
+            f: Function from ``(state, *inputs)`` to next state.
+            inputs: Input ``Array`` types.
+
+        Returns:
+            Function with the same arguments as ``f``,
+            that returns the next state cast to this type.
+            States and inputs with unknown bits,
+            and states not in the enumeration, call ``f``.
+            It raises ``TypeError`` if an input has the wrong size.
+
+        Raises:
+            ValueError: Total input size is too large.
+        """
+        assert issubclass(cls, Array)  # Help type checker
+        return _transitions(cls, f, inputs)
+
 
 class Enum(metaclass=EnumType):
     """User-defined enumerated data type.
@@ -0,0 +1,137 @@
+"""Incremental Expression Evaluator"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from ._bits import Array, ArrayLike
+from ._expr import _EVAL, Expr, _input, _result, outputs, topo
+
+
+class Evaluator:
+    """Incrementally evaluate an ``Expr`` DAG as its inputs change.
+
+    Each variable is an input cell, initialized to all ``X``.
+    Setting a variable to a new value schedules its fan-out,
+    and evaluation visits scheduled nodes in topological order.
+    A node whose value does not change stops propagation,
+    so nodes outside the fan-out cone of changed inputs are never recomputed.
+
+    For example:
+
+    >>> from bvwx import Array, var
+    >>> a = var("a", Array[4])
+    >>> b = var("b", Array[4])
+    >>> c = var("c", Array[4])
+    >>> ev = Evaluator(((a & b) | c, a & b))
+    >>> ev.update(a="4b1100", b="4b1010", c="4b0001")
+    (bits("4b1001"), bits("4b1000"))
+    >>> ev.update(c="4b0010")
+    (bits("4b1010"), bits("4b1000"))
+    >>> ev["c"]
+    bits("4b0010")
+
+    Args:
+        y: ``Expr``, or (possibly nested) tuple/list of results.
+    """
+
+    __slots__ = ("_y", "_vars", "_level", "_fanout", "_values", "_queue", "_evals")
+
+    def __init__(self, y: Any):
+        self._y = y
+        self._vars: dict[str, Expr] = {}
+        self._level: dict[Expr, int] = {}
+        self._fanout: dict[Expr, list[Expr]] = {}
+        self._values: dict[Expr, Array] = {}
+        self._evals = 0
+
+        nodes = topo(outputs(y))
+        for x in nodes:
+            self._fanout[x] = []
+            if x._op == "var":
+                name = x._name
+                if name in self._vars:
+                    raise ValueError(f"Duplicate variable name: {name}")
+                self._vars[name] = x
+                self._level[x] = 0
+                self._values[x] = x._t.xs()
+            elif x._value is not None:
+                self._level[x] = 0
+                self._values[x] = x._value
+            else:
+                self._level[x] = 1 + max(self._level[arg] for arg in x._args)
+                for arg in x._args:
+                    self._fanout[arg].append(x)
+
+        # Schedule: level => pending nodes
+        n = 1 + max(self._level.values(), default=0)
+        self._queue: list[dict[Expr, None]] = [{} for _ in range(n)]
+
+        # Initial evaluation
+        for x in nodes:
+            if x._op not in ("var", "const"):
+                self._values[x] = self._compute(x)
+
+    def __getitem__(self, key: str | Expr) -> Array:
+        """Return the current value of a variable name, or any node."""
+        if isinstance(key, str):
+            key = self._vars[key]
+        self._run()
+        return self._values[key]
+
+    def __setitem__(self, name: str, value: ArrayLike):
+        """Set a variable, and schedule its fan-out if the value changed.
+
+        Raises:
+            KeyError: Unknown variable name.
+            TypeError: Value has the wrong size.
+        """
+        x = self._vars[name]
+        y = _input(x, value)
+        if y._data != self._values[x]._data:
+            self._values[x] = y
+            self._schedule(x)
+
+    @property
+    def evaluations(self) -> int:
+        """Total number of operator evaluations, including the initial one."""
+        return self._evals
+
+    def update(self, **values: ArrayLike) -> Any:
+        """Set variables, then return updated results.
+
+        Args:
+            values: Mapping from variable name to value.
+
+        Returns:
+            Results with the same structure as ``y``.
+        """
+        for name, value in values.items():
+            self[name] = value
+        return self.eval()
+
+    def eval(self) -> Any:
+        """Evaluate all scheduled nodes, and return results.
+
+        Returns:
+            Results with the same structure as ``y``.
+        """
+        self._run()
+        return _result(self._y, self._values)
+
+    def _compute(self, x: Expr) -> Array:
+        self._evals += 1
+        return _EVAL[x._op](x._params, *[self._values[arg] for arg in x._args])
+
+    def _schedule(self, x: Expr):
+        for y in self._fanout[x]:
+            self._queue[self._level[y]][y] = None
+
+    def _run(self):
+        for pending in self._queue:
+            while pending:
+                x, _ = pending.popitem()
+                y = self._compute(x)
+                if y._data != self._values[x]._data:
+                    self._values[x] = y
+                    self._schedule(x)
@@ -0,0 +1,820 @@
+"""Lazy Array Expressions
+
+Operators on ``Expr`` objects build a hash-consed DAG instead of computing
+eagerly.
+Identical subterms share one node, and operators over constants fold
+immediately, so evaluating the DAG calls each distinct operator once.
+"""
+
+from __future__ import annotations
+
+import inspect
+import re
+import sys
+from collections.abc import Callable, Hashable, Iterable
+from functools import update_wrapper
+from types import FunctionType, SimpleNamespace
+from typing import Any, get_origin
+from weakref import WeakValueDictionary
+
+from ._arithmetic import adc, add, div, lsh, matmul, mod, mul, neg, ngc, rsh, sbc, srsh, sub
+from ._bits import (
+    Array,
+    ArrayLike,
+    array_cls,
+    expect_array,
+    expect_array_size,
+    expect_scalar,
+    expect_uint,
+    lit2bv,
+    vec_cls,
+)
+from ._bitwise import and_, impl, ite, mux, not_, or_, xor
+from ._predicate import eq, ge, gt, le, lt, match, ne, sge, sgt, sle, slt
+from ._unary import uand, uor, uxor
+from ._word import cat, lrot, pack, rep, rrot, sxt, xt
+
+# (op, type, params, name, value, *args) => node
+_nodes: WeakValueDictionary[tuple[Hashable, ...], Expr] = WeakValueDictionary()
+
+# Expr.type shadows the builtin in the class body
+type _ArrayType = type[Array]
+
+
+class Expr:
+    """Lazy ``Array`` expression.
+
+    Build expressions from variables and constants using the
+    Python operators supported by ``Array``.
+    Expressions are hash-consed:
+    applying the same operator to the same arguments returns the same node.
+
+    For example:
+
+    >>> from bvwx import Array
+    >>> a = var("a", Array[4])
+    >>> b = var("b", Array[4])
+    >>> (a & b) is (a & b)
+    True
+    >>> ((a & b) ^ a).eval(a="4b1100", b="4b1010")
+    bits("4b0100")
+
+    Use ``lazy`` to build expressions from functions that call
+    ``bvwx`` operators.
+    """
+
+    __slots__ = ("__weakref__", "_op", "_t", "_params", "_name", "_value", "_args")
+
+    _op: str
+    _t: _ArrayType
+    _params: tuple[Hashable, ...]
+    # Variable name
+    _name: str
+    # Constant value
+    _value: Array | None
+    _args: tuple[Expr, ...]
+
+    def __repr__(self) -> str:
+        if self._op == "var":
+            return f'var("{self._name}", {self._t.__name__})'
+        if self._op == "const":
+            return f"Expr({self._value!r})"
+        return f"Expr({self._op}, {self._t.__name__})"
+
+    @property
+    def type(self) -> _ArrayType:
+        """Result ``Array`` type."""
+        return self._t
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self._t.shape
+
+    @property
+    def size(self) -> int:
+        return self._t.size
+
+    @property
+    def _data(self):
+        raise TypeError("Unsupported operation on an expression")
+
+    def __getattr__(self, name: str):
+        if name.startswith("__") or not hasattr(Array, name):
+            raise AttributeError(f"'Expr' object has no attribute '{name}'")
+        raise TypeError(f"Unsupported operation on an expression: {name}")
+
+    def __bool__(self) -> bool:
+        raise TypeError("Cannot use an expression as a condition")
+
+    # Expressions are hash-consed, so node equality is identity
+    def __eq__(self, obj: Any) -> bool:
+        if not isinstance(obj, Expr):
+            raise TypeError("Cannot compare an expression; use eq or match")
+        return self is obj
+
+    def __ne__(self, obj: Any) -> bool:
+        if not isinstance(obj, Expr):
+            raise TypeError("Cannot compare an expression; use ne or match")
+        return self is not obj
+
+    __hash__ = object.__hash__
+
+    def eval(self, **env: ArrayLike) -> Array:
+        """Evaluate the expression.
+
+        Args:
+            env: Mapping from variable name to value.
+
+        Returns:
+            ``Array`` value.
+
+        Raises:
+            KeyError: Missing variable.
+            TypeError: Variable value has the wrong size.
+        """
+        values = {x: _input(x, env[x._name]) for x in _vars([self])}
+        return evaluate([self], values)[self]
+
+    def __invert__(self) -> Expr:
+        return _not(self)
+
+    def __or__(self, other: Expr | ArrayLike) -> Expr:
+        return _binop("or", self, _expect_size(other, self.size))
+
+    def __ror__(self, other: Expr | ArrayLike) -> Expr:
+        return _binop("or", _expect_size(other, self.size), self)
+
+    def __and__(self, other: Expr | ArrayLike) -> Expr:
+        return _binop("and", self, _expect_size(other, self.size))
+
+    def __rand__(self, other: Expr | ArrayLike) -> Expr:
+        return _binop("and", _expect_size(other, self.size), self)
+
+    def __xor__(self, other: Expr | ArrayLike) -> Expr:
+        return _binop("xor", self, _expect_size(other, self.size))
+
+    def __rxor__(self, other: Expr | ArrayLike) -> Expr:
+        return _binop("xor", _expect_size(other, self.size), self)
+
+    def __lshift__(self, n: Expr | ArrayLike) -> Expr:
+        return _shift("lsh", self, n)
+
+    def __rshift__(self, n: Expr | ArrayLike) -> Expr:
+        return _shift("rsh", self, n)
+
+    def __add__(self, other: Expr | ArrayLike) -> Expr:
+        return _add("adc", self, _expect(other), _const(expect_scalar(0)))
+
+    def __radd__(self, other: Expr | ArrayLike) -> Expr:
+        return _add("adc", _expect(other), self, _const(expect_scalar(0)))
+
+    def __sub__(self, other: Expr | ArrayLike) -> Expr:
+        return _sub("adc", self, _expect_size(other, self.size))
+
+    def __rsub__(self, other: Expr | ArrayLike) -> Expr:
+        return _sub("adc", _expect_size(other, self.size), self)
+
+    def __neg__(self) -> Expr:
+        return _neg("adc", self)
+
+    def __mul__(self, other: Expr | ArrayLike) -> Expr:
+        return _BUILD[mul](self, other)
+
+    def __rmul__(self, other: Expr | ArrayLike) -> Expr:
+        return _BUILD[mul](other, self)
+
+    def __floordiv__(self, other: Expr | ArrayLike) -> Expr:
+        return _BUILD[div](self, other)
+
+    def __rfloordiv__(self, other: Expr | ArrayLike) -> Expr:
+        return _BUILD[div](other, self)
+
+    def __mod__(self, other: Expr | ArrayLike) -> Expr:
+        return _BUILD[mod](self, other)
+
+    def __matmul__(self, other: Expr | ArrayLike) -> Expr:
+        return _BUILD[matmul](self, other)
+
+    def __rmatmul__(self, other: Expr | ArrayLike) -> Expr:
+        return _BUILD[matmul](other, self)
+
+    def __getitem__(self, key: Any) -> Expr:
+        keys = list(key) if isinstance(key, tuple) else [key]
+        for k in keys:
+            if isinstance(k, Expr):
+                raise TypeError("Expected constant index")
+        nkey = self._t._norm_key(keys)
+        (start, stop), key_r = nkey[0], nkey[1:]
+        # Only contiguous selects: any slice of dim 0, full slices of other dims
+        if any((i, j) != (0, n) for (i, j), n in zip(key_r, self.shape[1:])):
+            raise TypeError("Expected full slices for all dimensions but the first")
+        if len(self.shape) == 1:
+            t = vec_cls(stop - start)
+        elif stop - start == 1:
+            t = array_cls(self.shape[1:])
+        else:
+            t = array_cls((stop - start,) + self.shape[1:])
+        return _node("slice", t, nkey, self)
+
+
+def var(name: str, t: type[Array]) -> Expr:
+    """Return an expression variable.
+
+    Args:
+        name: Variable name
+        t: ``Array`` type
+
+    Returns:
+        ``Expr`` leaf node.
+    """
+    t = get_origin(t) or t
+    return _node("var", t, (), name=name)
+
+
+def _const(x: Array) -> Expr:
+    return _node("const", type(x), (), value=x)
+
+
+def _node(
+    op: str,
+    t: type[Array],
+    params: tuple[Hashable, ...],
+    *args: Expr,
+    name: str = "",
+    value: Array | None = None,
+) -> Expr:
+    key = (op, t, params, name, value, *args)
+    try:
+        return _nodes[key]
+    except KeyError:
+        pass
+
+    # Constant folding
+    if args and all(x._op == "const" for x in args):
+        y = _EVAL[op](params, *[x._value for x in args])
+        assert isinstance(y, Array)
+        return _const(y)
+
+    node = object.__new__(Expr)
+    node._op = op
+    node._t = t
+    node._params = params
+    node._name = name
+    node._value = value
+    node._args = args
+    _nodes[key] = node
+    return node
+
+
+def _has_x(x: Expr) -> bool:
+    return x._value is not None and x._value.has_x()
+
+
+def _is_xs(x: Expr) -> bool:
+    return x._value is not None and x._value._data == (0, 0)
+
+
+def _expect(arg: Expr | ArrayLike) -> Expr:
+    if isinstance(arg, Expr):
+        return arg
+    return _const(expect_array(arg))
+
+
+def _expect_size(arg: Expr | ArrayLike, size: int) -> Expr:
+    if isinstance(arg, Expr):
+        if arg.size != size:
+            raise TypeError(f"Expected size {size}, got {arg.size}")
+        return arg
+    return _const(expect_array_size(arg, size))
+
+
+def _expect_scalar(arg: Expr | ArrayLike) -> Expr:
+    if isinstance(arg, Expr):
+        return _expect_size(arg, 1)
+    return _const(expect_scalar(arg))
+
+
+def _resolve(x0: Expr, x1: Expr) -> type[Array]:
+    # T (op) T -> T
+    if x0._t is x1._t:
+        return x0._t
+    # Otherwise, downgrade to Vector
+    return vec_cls(x0.size)
+
+
+def _is_expr(*args: Any) -> bool:
+    return any(isinstance(arg, Expr) for arg in args)
+
+
+# Bitwise
+def _not(x: Expr) -> Expr:
+    if x._op == "not":
+        return x._args[0]
+    return _node("not", x._t, (), x)
+
+
+def _binop(op: str, x0: Expr, x1: Expr) -> Expr:
+    t = _resolve(x0, x1)
+    # X dominates all bitwise operators
+    if _is_xs(x0) or _is_xs(x1):
+        return _const(t.xs())
+    return _node(op, t, (), x0, x1)
+
+
+def _e_not(x: Expr | ArrayLike) -> Any:
+    if not isinstance(x, Expr):
+        return not_(x)
+    return _not(x)
+
+
+def _nary(op: str, f: Callable[..., Array]):
+    def g(x0: Expr | ArrayLike, *xs: Expr | ArrayLike) -> Any:
+        if not _is_expr(x0, *xs):
+            return f(x0, *xs)
+        y = _expect(x0)
+        for x in xs:
+            y = _binop(op, y, _expect_size(x, y.size))
+        return y
+
+    return g
+
+
+def _e_impl(p: Expr | ArrayLike, q: Expr | ArrayLike) -> Any:
+    if not isinstance(p, Expr) and not isinstance(q, Expr):
+        return impl(p, q)
+    p = _expect(p)
+    return _binop("impl", p, _expect_size(q, p.size))
+
+
+def _e_ite(s: Expr | ArrayLike, x1: Expr | ArrayLike, x0: Expr | ArrayLike) -> Any:
+    if not isinstance(s, Expr) and not isinstance(x1, Expr) and not isinstance(x0, Expr):
+        return ite(s, x1, x0)
+    s = _expect_scalar(s)
+    x1 = _expect(x1)
+    x0 = _expect_size(x0, x1.size)
+    t = _resolve(x1, x0)
+    if _has_x(s):
+        return _const(t.xs())
+    return _node("ite", t, (), s, x1, x0)
+
+
+_MUX_XN_RE = re.compile(r"x(\d+)")
+
+
+def _e_mux(s: Expr | ArrayLike, **xs: Expr | ArrayLike) -> Any:
+    consts = {name: x for name, x in xs.items() if not isinstance(x, Expr)}
+    if not isinstance(s, Expr) and len(consts) == len(xs):
+        return mux(s, **consts)
+    s = _expect(s)
+    n = 1 << s.size
+
+    # Parse and check inputs
+    x0 = None
+    t = None
+    _xs: dict[int, Expr] = {}
+    for name, value in xs.items():
+        if m := _MUX_XN_RE.match(name):
+            i = int(m.group(1))
+            if not 0 <= i < n:
+                raise ValueError(f"Expected x in [x0, ..., x{n - 1}]; got {name}")
+            if x0 is None:
+                x = _expect(value)
+                x0, t = x, x._t
+            else:
+                x = _expect_size(value, x0.size)
+                t = _resolve(x0, x)
+            _xs[i] = x
+        else:
+            raise ValueError(f"Invalid input name: {name}")
+
+    if t is None:
+        raise ValueError("Expected at least one mux input")
+
+    if _has_x(s):
+        return _const(t.xs())
+    idxs = tuple(sorted(_xs))
+    return _node("mux", t, idxs, s, *[_xs[i] for i in idxs])
+
+
+# Arithmetic
+def _add(op: str, a: Expr, b: Expr, ci: Expr) -> Expr:
+    if a.size == b.size:
+        t = _resolve(a, b)
+    else:
+        t = vec_cls(max(a.size, b.size))
+    if op == "adc":
+        t = vec_cls(t.size + 1)
+    if _has_x(a) or _has_x(b) or _has_x(ci):
+        return _const(t.xs())
+    return _node(op, t, (), a, b, ci)
+
+
+def _sub(op: str, a: Expr, b: Expr) -> Expr:
+    return _add(op, a, _not(b), _const(expect_scalar(1)))
+
+
+def _neg(op: str, x: Expr) -> Expr:
+    return _add(op, _not(x), _const(x._t.zeros()), _const(expect_scalar(1)))
+
+
+def _e_add(op: str, f: Callable[..., Array]):
+    def g(a: Expr | ArrayLike, b: Expr | ArrayLike, ci: Expr | ArrayLike | None = None) -> Any:
+        if not _is_expr(a, b, ci):
+            return f(a, b, ci)
+        ci = _expect_scalar(0 if ci is None else ci)
+        return _add(op, _expect(a), _expect(b), ci)
+
+    return g
+
+
+def _e_sub(op: str, f: Callable[..., Array]):
+    def g(a: Expr | ArrayLike, b: Expr | ArrayLike) -> Any:
+        if not _is_expr(a, b):
+            return f(a, b)
+        a = _expect(a)
+        return _sub(op, a, _expect_size(b, a.size))
+
+    return g
+
+
+def _e_neg(op: str, f: Callable[..., Array]):
+    def g(x: Expr | ArrayLike) -> Any:
+        if not _is_expr(x):
+            return f(x)
+        return _neg(op, _expect(x))
+
+    return g
+
+
+def _shift(op: str, x: Expr, n: Any) -> Expr:
+    if isinstance(n, Expr):
+        raise TypeError("Expected constant shift amount")
+    n = expect_uint(n)
+    if n.has_x():
+        return _const(x._t.xs())
+    if n.has_w():
+        return _const(x._t.ws())
+    _n = n.to_uint()
+    if _n > x.size:
+        raise ValueError(f"Expected n ≤ {x.size}, got {_n}")
+    if _n == 0:
+        return x
+    return _node(op, x._t, (_n,), x)
+
+
+def _e_shift(op: str, f: Callable[..., Array]):
+    def g(x: Expr | ArrayLike, n: Any) -> Any:
+        if not _is_expr(x):
+            return f(x, n)
+        return _shift(op, _expect(x), n)
+
+    return g
+
+
+def _e_call(op: str, f: Callable[..., Array], nargs: int):
+    """Build an operator on nargs operands, and constant parameters."""
+    sig = inspect.signature(f)
+
+    def g(*args: Any, **kwargs: Any) -> Any:
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        xs, params = bound.args[:nargs], bound.args[nargs:]
+        if not _is_expr(*xs, *params):
+            return f(*args, **kwargs)
+        if _is_expr(*params):
+            raise TypeError(f"Expected constant {op} parameters")
+        ys = [_expect(x) for x in xs]
+        # Result type only depends on operand types and parameters
+        t = type(f(*[y._t.xs() for y in ys], *params))
+        return _node(op, t, params, *ys)
+
+    return g
+
+
+# Word
+def _e_cat(*objs: Expr | ArrayLike) -> Any:
+    consts = [obj for obj in objs if not isinstance(obj, Expr)]
+    if len(consts) == len(objs):
+        return cat(*consts)
+    xs: list[Expr] = []
+    for obj in objs:
+        if isinstance(obj, Expr):
+            xs.append(obj)
+        elif isinstance(obj, int) and obj in (0, 1):
+            xs.append(_expect_scalar(obj))
+        elif isinstance(obj, str):
+            xs.append(_const(lit2bv(obj)))
+        elif isinstance(obj, Array):
+            xs.append(_const(obj))
+        else:
+            raise TypeError(f"Invalid input: {obj}")
+    if len(xs) == 1:
+        return xs[0]
+    return _node("cat", vec_cls(sum(x.size for x in xs)), (), *xs)
+
+
+def _e_rep(obj: Expr | ArrayLike, n: int) -> Any:
+    if not isinstance(obj, Expr):
+        return rep(obj, n)
+    return _e_cat(*[obj] * n)
+
+
+# Unary / Predicate
+def _e_reduce(op: str, f: Callable[..., Array], nargs: int):
+    def g(*args: Expr | ArrayLike) -> Any:
+        assert len(args) == nargs
+        if not _is_expr(*args):
+            return f(*args)
+        xs = [_expect(args[0])]
+        xs.extend(_expect_size(arg, xs[0].size) for arg in args[1:])
+        t = vec_cls(1)
+        if any(_has_x(x) for x in xs):
+            return _const(t.xs())
+        return _node(op, t, (), *xs)
+
+    return g
+
+
+_UNARY: dict[str, Callable[[Array], Array]] = {
+    "uor": uor,
+    "uand": uand,
+    "uxor": uxor,
+}
+
+_PREDICATES: dict[str, Callable[[Array, Array], Array]] = {
+    "eq": eq,
+    "ne": ne,
+    "lt": lt,
+    "le": le,
+    "gt": gt,
+    "ge": ge,
+    "slt": slt,
+    "sle": sle,
+    "sgt": sgt,
+    "sge": sge,
+    "match": match,
+}
+
+
+def _eval_slice(key: tuple[tuple[int, int], ...], x: Array) -> Array:
+    return x[tuple(slice(i, j) for i, j in key)]
+
+
+def _eval_mux(idxs: tuple[Hashable, ...], s: Array, *xs: Array) -> Array:
+    return mux(s, **{f"x{i}": x for i, x in zip(idxs, xs)})
+
+
+def _eval_func(f: Callable[..., Array]) -> Callable[..., Array]:
+    def g(_: tuple[Hashable, ...], *xs: Array) -> Array:
+        return f(*xs)
+
+    return g
+
+
+def _eval_call(f: Callable[..., Array]) -> Callable[..., Array]:
+    def g(params: tuple[Hashable, ...], *xs: Array) -> Array:
+        return f(*xs, *params)
+
+    return g
+
+
+# Operator => Operand count, for operators with constant parameters
+_CALLS: dict[str, tuple[Callable[..., Array], int]] = {
+    "mul": (mul, 2),
+    "div": (div, 2),
+    "mod": (mod, 2),
+    "matmul": (matmul, 2),
+    "xt": (xt, 1),
+    "sxt": (sxt, 1),
+    "lrot": (lrot, 1),
+    "rrot": (rrot, 1),
+    "pack": (pack, 1),
+}
+
+
+# Operator => Evaluate
+_EVAL: dict[str, Callable[..., Array]] = {
+    "not": lambda _, x: ~x,
+    "or": lambda _, x0, x1: x0 | x1,
+    "and": lambda _, x0, x1: x0 & x1,
+    "xor": lambda _, x0, x1: x0 ^ x1,
+    "impl": lambda _, p, q: impl(p, q),
+    "ite": lambda _, s, x1, x0: ite(s, x1, x0),
+    "mux": _eval_mux,
+    "add": lambda _, a, b, ci: add(a, b, ci),
+    "adc": lambda _, a, b, ci: adc(a, b, ci),
+    "lsh": lambda p, x: lsh(x, p[0]),
+    "rsh": lambda p, x: rsh(x, p[0]),
+    "srsh": lambda p, x: srsh(x, p[0]),
+    "slice": _eval_slice,
+    "cat": lambda _, *xs: cat(*xs),
+    **{op: _eval_func(f) for op, f in _UNARY.items()},
+    **{op: _eval_func(f) for op, f in _PREDICATES.items()},
+    **{op: _eval_call(f) for op, (f, _) in _CALLS.items()},
+}
+
+# Operator => Expression builder
+_BUILD: dict[Callable[..., Any], Callable[..., Any]] = {
+    not_: _e_not,
+    or_: _nary("or", or_),
+    and_: _nary("and", and_),
+    xor: _nary("xor", xor),
+    impl: _e_impl,
+    ite: _e_ite,
+    mux: _e_mux,
+    add: _e_add("add", add),
+    adc: _e_add("adc", adc),
+    sub: _e_sub("add", sub),
+    sbc: _e_sub("adc", sbc),
+    neg: _e_neg("add", neg),
+    ngc: _e_neg("adc", ngc),
+    lsh: _e_shift("lsh", lsh),
+    rsh: _e_shift("rsh", rsh),
+    srsh: _e_shift("srsh", srsh),
+    cat: _e_cat,
+    rep: _e_rep,
+    **{f: _e_reduce(op, f, 1) for op, f in _UNARY.items()},
+    **{f: _e_reduce(op, f, 2) for op, f in _PREDICATES.items()},
+    **{f: _e_call(op, f, nargs) for op, (f, nargs) in _CALLS.items()},
+}
+
+
+def topo(ys: Iterable[Expr]) -> list[Expr]:
+    """Return all nodes reachable from ys, in topological order."""
+    order: list[Expr] = []
+    done: set[Expr] = set()
+    for y in ys:
+        stack = [(y, False)]
+        while stack:
+            x, expanded = stack.pop()
+            if x in done:
+                continue
+            if expanded:
+                done.add(x)
+                order.append(x)
+            else:
+                stack.append((x, True))
+                stack.extend((arg, False) for arg in reversed(x._args) if arg not in done)
+    return order
+
+
+def _vars(ys: Iterable[Expr]) -> list[Expr]:
+    return [x for x in topo(ys) if x._op == "var"]
+
+
+def _input(x: Expr, arg: ArrayLike) -> Array:
+    y = expect_array_size(arg, x.size)
+    if type(y) is x._t:
+        return y
+    return x._t._cast_data(y._data[0], y._data[1])
+
+
+def evaluate(ys: Iterable[Expr], values: dict[Expr, Array]) -> dict[Expr, Array]:
+    """Evaluate each node reachable from ys exactly once.
+
+    Args:
+        ys: Output nodes
+        values: Mapping from variable node to value
+
+    Returns:
+        Mapping from node to value.
+    """
+    memo = dict(values)
+    for x in topo(ys):
+        if x in memo:
+            continue
+        if x._value is not None:
+            memo[x] = x._value
+        elif x._op == "var":
+            raise KeyError(x._name)
+        else:
+            memo[x] = _EVAL[x._op](x._params, *[memo[arg] for arg in x._args])
+    return memo
+
+
+def _unsupported(f: FunctionType) -> Callable[..., Any]:
+    def g(*args: Any, **kwargs: Any) -> Any:
+        if _is_expr(*args, *kwargs.values()):
+            raise TypeError(f"unsupported operator '{f.__name__}'")
+        return f(*args, **kwargs)
+
+    return g
+
+
+def _build(f: Any) -> Any:
+    if f in _BUILD:
+        return _BUILD[f]
+    if isinstance(f, FunctionType):
+        return _unsupported(f)
+    return f
+
+
+def _rebind(fn: FunctionType) -> FunctionType:
+    """Return a copy of fn where global operators build expressions.
+
+    Other ``bvwx`` functions raise ``TypeError`` for expression arguments.
+    """
+    pkg = sys.modules[__name__.rpartition(".")[0]]
+    ns = {name: _build(f) for name, f in vars(pkg).items() if callable(f)}
+    funcs = {f for f in vars(pkg).values() if isinstance(f, FunctionType)}
+
+    globals_ = dict(fn.__globals__)
+    for name, obj in globals_.items():
+        if obj is pkg:
+            globals_[name] = SimpleNamespace(**{**vars(pkg), **ns})
+        elif isinstance(obj, FunctionType) and (obj in _BUILD or obj in funcs):
+            globals_[name] = _build(obj)
+
+    return FunctionType(fn.__code__, globals_, fn.__name__, fn.__defaults__, fn.__closure__)
+
+
+def outputs(y: Any) -> list[Expr]:
+    """Return all expressions in a (possibly nested) tuple/list of results."""
+    if isinstance(y, Expr):
+        return [y]
+    if isinstance(y, tuple | list):
+        return [x for obj in y for x in outputs(obj)]
+    return []
+
+
+def trace(fn: Callable[..., Any]) -> tuple[list[Expr], Any]:
+    """Build the expression for a function with ``Array``-annotated parameters.
+
+    Returns:
+        Variables for each parameter, and function result.
+
+    Raises:
+        TypeError: Missing or invalid annotation, or unsupported operation.
+    """
+    assert isinstance(fn, FunctionType)
+
+    annotations = inspect.get_annotations(fn, eval_str=True)
+    xs: list[Expr] = []
+    for name, p in inspect.signature(fn).parameters.items():
+        if p.kind not in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD):
+            raise TypeError(f"Unsupported parameter kind: {name}")
+        val = annotations.get(name)
+        t = get_origin(val) or val
+        if not (isinstance(t, type) and issubclass(t, Array)):
+            raise TypeError(f"Expected parameter {name} to have an Array type annotation")
+        xs.append(var(name, t))
+
+    return xs, _rebind(fn)(*xs)
+
+
+def _result(y: Any, memo: dict[Expr, Array]) -> Any:
+    if isinstance(y, Expr):
+        return memo[y]
+    if isinstance(y, tuple):
+        return tuple(_result(x, memo) for x in y)
+    if isinstance(y, list):
+        return [_result(x, memo) for x in y]
+    if isinstance(y, str):
+        return lit2bv(y)
+    return y
+
+
+def lazy[F: Callable[..., Any]](fn: F) -> F:
+    """Evaluate a function over ``Array`` values as a shared expression DAG.
+
+    Every parameter must have an ``Array`` type annotation.
+    The function is traced once into an ``Expr`` DAG,
+    where identical subexpressions share one node,
+    and subexpressions over constants fold.
+    Each call evaluates every distinct node exactly once.
+
+    For example:
+
+    >>> from bvwx import Array, eq
+    >>> @lazy
+    ... def f(op: Array[2]):
+    ...     return eq(op, "2b01") | eq(op, "2b10"), eq(op, "2b01")
+    >>> f("2b10")
+    (bits("1b1"), bits("1b0"))
+
+    Supports the same operators as ``compile_fn``,
+    and also ``srsh``, ``mul``, ``div``, ``mod``, ``matmul``,
+    ``xt``, ``sxt``, ``lrot``, ``rrot``, and ``pack``.
+    Shift amounts and other parameters must be constant.
+    Other ``bvwx`` functions raise ``TypeError`` on expression arguments.
+
+    Args:
+        fn: Function with ``Array``-annotated parameters.
+
+    Returns:
+        Function with the same signature and results.
+
+    Raises:
+        TypeError: Missing or invalid annotation, or unsupported operation.
+    """
+    xs, y = trace(fn)
+    ys = outputs(y)
+    sig = inspect.signature(fn)
+
+    def f(*args: ArrayLike, **kwargs: ArrayLike) -> Any:
+        bound = sig.bind(*args, **kwargs)
+        values = {x: _input(x, arg) for x, arg in zip(xs, bound.arguments.values())}
+        return _result(y, evaluate(ys, values))
+
+    g: Any = update_wrapper(f, fn)
+    return g
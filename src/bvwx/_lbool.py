@@ -39,6 +39,62 @@ to_vcd_char: dict[lbv, str] = {
 
 _LIT_PREFIX_RE = re.compile(r"(?P<Size>[1-9][0-9]*)(?P<Base>[bdh])")
 
+# Binary char => d0, d1 bit
+_BIN_CHARS = "X01-W"
+_BIN_D0 = str.maketrans(_BIN_CHARS, "01011")
+_BIN_D1 = str.maketrans(_BIN_CHARS, "00111")
+_BIN_DEL = str.maketrans("", "", _BIN_CHARS)
+
+# Hex char => d0, d1 nibble
+_HEX_KNOWN = "0123456789abcdefABCDEF"
+_HEX_UNKNOWN = "X-W"
+_HEX_D0 = str.maketrans(_HEX_KNOWN + _HEX_UNKNOWN, "fedcba9876543210543210" + "0ff")
+_HEX_D1 = str.maketrans(_HEX_UNKNOWN, "0ff")
+_HEX_DEL = str.maketrans("", "", _HEX_KNOWN + _HEX_UNKNOWN)
+
+
+def _parse_bin(lit: str, size: int, digits: str) -> lbv:
+    digits = digits.replace("_", "")
+    if len(digits) != size:
+        s = f"Expected {size} digits, got {len(digits)}"
+        raise ValueError(s)
+    if digits.translate(_BIN_DEL):
+        raise ValueError(f"Invalid lit: {lit}")
+    return int(digits.translate(_BIN_D0), base=2), int(digits.translate(_BIN_D1), base=2)
+
+
+def _parse_hex(lit: str, size: int, digits: str) -> lbv:
+    dmax = mask(size)
+
+    # Known digits
+    if not any(c in digits for c in _HEX_UNKNOWN):
+        d1 = int(digits, base=16)
+        if d1 < 0:
+            raise ValueError(f"Expected digits ≥ 0, got {digits}")
+        if d1 > dmax:
+            s = f"Expected digits in range [0, {dmax}], got {digits}"
+            raise ValueError(s)
+        return d1 ^ dmax, d1
+
+    # Unknown digits: X => XXXX, - => ----
+    digits = digits.replace("_", "")
+    if not digits or digits.translate(_HEX_DEL):
+        raise ValueError(f"Invalid lit: {lit}")
+    d0 = int(digits.translate(_HEX_D0), base=16)
+    d1 = int(digits.translate(_HEX_D1), base=16)
+    n = 4 * len(digits)
+    # Pad with known zeros
+    if n < size:
+        return d0 | (dmax ^ mask(n)), d1
+    # The most significant digit may be all X/W
+    if n - size < 4 and digits[0] in _HEX_UNKNOWN:  # noqa: PLR2004
+        return d0 & dmax, d1 & dmax
+    # Bits beyond size must be known zeros
+    if d0 >> size != mask(n - size) or d1 >> size:
+        s = f"Expected {size}-bit digits, got {digits}"
+        raise ValueError(s)
+    return d0 & dmax, d1
+
 
 def parse_lit(lit: str) -> tuple[int, lbv]:
     m = _LIT_PREFIX_RE.match(lit)
@@ -53,19 +109,7 @@ def parse_lit(lit: str) -> tuple[int, lbv]:
 
     # Binary
     if base == "b":
-        digits = digits.replace("_", "")
-        if len(digits) != size:
-            s = f"Expected {size} digits, got {len(digits)}"
-            raise ValueError(s)
-        d0, d1 = 0, 0
-        for i, c in enumerate(reversed(digits)):
-            try:
-                x = from_char[c]
-            except KeyError as e:
-                raise ValueError(f"Invalid lit: {lit}") from e
-            d0 |= x[0] << i
-            d1 |= x[1] << i
-        return size, (d0, d1)
+        return size, _parse_bin(lit, size, digits)
 
     # Decimal
     if base == "d":
@@ -80,14 +124,93 @@ def parse_lit(lit: str) -> tuple[int, lbv]:
 
     # Hexadecimal
     assert base == "h"
-    d1 = int(digits, base=16)
-    if d1 < 0:
-        raise ValueError(f"Expected digits ≥ 0, got {digits}")
-    dmax = mask(size)
-    if d1 > dmax:
-        s = f"Expected digits in range [0, {dmax}], got {digits}"
-        raise ValueError(s)
-    return size, (d1 ^ dmax, d1)
+    return size, _parse_hex(lit, size, digits)
+
+
+# Merged plane char => string char
+# Known zero/one bits are "2" and "1", and underscores are "a"
+_TO_STR = bytes.maketrans(b"0123a", b"X10-_")
+_TO_VCD_STR = bytes.maketrans(b"0123", b"x10x")
+
+
+def _merge_planes(a: lbv, spec: str) -> bytes:
+    """Format both planes in binary, and merge them char by char.
+
+    Each bit char becomes ord("0") + d1 + 2 * d0.
+    """
+    c0 = format(a[0], spec).encode()
+    c1 = format(a[1], spec).encode()
+    n = len(c1)
+    ones = int.from_bytes(b"\x01" * n, "big")
+    c = int.from_bytes(c1, "big") + ((int.from_bytes(c0, "big") & ones) << 1)
+    return c.to_bytes(n, "big")
+
+
+def to_str(a: lbv, n: int) -> str:
+    """Format n bits as chars, most significant first.
+
+    Chars are grouped by four, separated by underscores.
+    """
+    if n == 0:
+        return ""
+    spec = f"0{n + (n - 1) // 4}_b"
+    if a[0] ^ a[1] == mask(n):
+        return format(a[1], spec)
+    return _merge_planes(a, spec).translate(_TO_STR).decode()
+
+
+# Unknown digit char "0" (0x30), with flags: 0x80 | X: 0x01 | W: 0x02
+_TO_HEX = bytes(range(0x80)) + b"?" * 0x30 + b"?X-" + b"?" * 0x4D
+
+
+def _digit_flags(f: int, k: int) -> int:
+    """Spread one flag bit per hex digit to one flag bit per char byte."""
+    return int.from_bytes(format(f, f"0{k}x").encode(), "big") & int.from_bytes(b"\x01" * k, "big")
+
+
+def to_hex_str(a: lbv, n: int) -> str:
+    """Format n bits as hex digits, most significant first.
+
+    A digit with unknown bits is 'X' if all of its bits are X,
+    '-' if all of its bits are W, and '?' otherwise.
+    Bits above n in the most significant digit are ignored.
+    """
+    if n == 0:
+        return ""
+    k = -(-n // 4)
+    spec = f"0{k}X"
+    if a[0] ^ a[1] == mask(n):
+        return format(a[1], spec)
+
+    d0, d1 = a
+    pad = mask(4 * k) ^ mask(n)
+    ones = int("1" * k, 16)
+
+    # One flag bit per digit
+    u = ~(d0 ^ d1) & mask(n)
+    u = (u | u >> 1 | u >> 2 | u >> 3) & ones
+    xs = (~(d0 | d1) & mask(n)) | pad
+    xs &= xs >> 1 & xs >> 2 & xs >> 3 & ones
+    ws = (d0 & d1) | pad
+    ws &= ws >> 1 & ws >> 2 & ws >> 3 & ones
+
+    # Unknown digits => "0", then set flags
+    c = int.from_bytes(format(d1 & ~(u * 0xF), spec).encode(), "big")
+    c |= _digit_flags(u, k) << 7 | _digit_flags(xs, k) | _digit_flags(ws, k) << 1
+    return c.to_bytes(k, "big").translate(_TO_HEX).decode()
+
+
+def to_vcd_str(a: lbv, n: int) -> str:
+    """Format n bits as VCD value chars, most significant first.
+
+    Known bits are '0' or '1', and unknown bits are 'x'.
+    """
+    if n == 0:
+        return ""
+    spec = f"0{n}b"
+    if a[0] ^ a[1] == mask(n):
+        return format(a[1], spec)
+    return _merge_planes(a, spec).translate(_TO_VCD_STR).decode()
 
 
 def not_(a: lbv) -> lbv:
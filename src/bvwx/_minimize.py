@@ -0,0 +1,162 @@
+"""Two-Level Logic Minimization
+
+A heuristic minimizer in the style of Espresso:
+expand each cube against the OFF set,
+remove redundant cubes,
+then reduce, expand, and remove redundant cubes again
+until the cover stops shrinking.
+
+Cubes are ``(d0, d1)`` plane pairs, with the operations in ``_cube``.
+Expansion checks a cube against the whole OFF set at once,
+with one lane per OFF cube in packed ``int`` planes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from . import _swar as sw
+from ._bits import Array, ArrayLike, expect_array, expect_array_size, vec_cls
+from ._cube import Cube, cofactor, complement, contains, literals, tautology
+from ._util import mask
+
+
+def _cost(f: list[Cube]) -> tuple[int, int]:
+    return len(f), sum(literals(c) for c in f)
+
+
+def _expand(f: list[Cube], r: list[Cube], full: int) -> list[Cube]:
+    """Expand each cube to a prime that does not intersect the OFF set r.
+
+    Cubes contained by an expanded cube are removed.
+    """
+    if not r:
+        return [(full, full)] if f else []
+
+    # Pack the OFF set: one lane per cube
+    n = full.bit_length()
+    lsbs, msbs, dmax = sw.masks(len(r), n)
+    lows = dmax ^ msbs
+    r0 = r1 = 0
+    for i, (c0, c1) in enumerate(r):
+        r0 |= c0 << (i * n)
+        r1 |= c1 << (i * n)
+
+    def disjoint(c0: int, c1: int) -> bool:
+        # Lane bits where the intersection is empty
+        z = dmax ^ ((c0 * lsbs & r0) | (c1 * lsbs & r1))
+        return (((z & lows) + lows) | z) & msbs == msbs
+
+    # Raise literals of the most common free variables first
+    free = [sum(((c0 & c1) >> i) & 1 for c0, c1 in f) for i in range(n)]
+    order = sorted(range(n), key=lambda i: -free[i])
+
+    ys: list[Cube] = []
+    for c in sorted(f, key=literals):
+        if any(contains(y, c) for y in ys):
+            continue
+        c0, c1 = c
+        for i in order:
+            b = 1 << i
+            if (c0 ^ c1) & b and disjoint(c0 | b, c1 | b):
+                c0, c1 = c0 | b, c1 | b
+        y = (c0, c1)
+        ys = [x for x in ys if not contains(y, x)]
+        ys.append(y)
+    return ys
+
+
+def _irredundant(f: list[Cube], d: list[Cube], full: int) -> list[Cube]:
+    """Remove cubes covered by the other cubes and the DC set d."""
+    ys = list(f)
+    for c in sorted(f, key=literals, reverse=True):
+        others = [x for x in ys if x != c]
+        if tautology(cofactor(others + d, c, full), full):
+            ys = others
+    return ys
+
+
+def _reduce(f: list[Cube], d: list[Cube], full: int) -> list[Cube]:
+    """Reduce each cube to the smallest cube with the same essential minterms."""
+    ys = list(f)
+    for c in sorted(f, key=literals):
+        i = ys.index(c)
+        others = ys[:i] + ys[i + 1 :]
+        comp = complement(cofactor(others + d, c, full), full)
+        if not comp:
+            ys = others
+            continue
+        # Supercube of the complement
+        s0 = s1 = 0
+        for x0, x1 in comp:
+            s0 |= x0
+            s1 |= x1
+        ys[i] = (c[0] & s0, c[1] & s1)
+    return ys
+
+
+def minimize_cover(f: list[Cube], d: list[Cube], r: list[Cube] | None, full: int) -> list[Cube]:
+    """Minimize ON set f, with DC set d, and optional OFF set r.
+
+    If r is None, the OFF set is the complement of f and d.
+    """
+    if r is None:
+        r = complement(f + d, full)
+    f = _irredundant(_expand(list(dict.fromkeys(f)), r, full), d, full)
+    while True:
+        g = _irredundant(_expand(_reduce(f, d, full), r, full), d, full)
+        if _cost(g) >= _cost(f):
+            return f
+        f = g
+
+
+def _cubes(xs: Iterable[ArrayLike], size: int | None) -> tuple[list[Cube], int | None]:
+    cubes: list[Cube] = []
+    for arg in xs:
+        x = expect_array(arg) if size is None else expect_array_size(arg, size)
+        if x.has_x():
+            raise ValueError(f"Expected pattern with no X bits, got {x}")
+        size = x.size
+        cubes.append(x._data)
+    return cubes, size
+
+
+def minimize(on: Iterable[ArrayLike], dc: Iterable[ArrayLike] = ()) -> list[Array]:
+    """Minimize a list of ``match`` patterns.
+
+    Return a smaller list of patterns that matches the same values:
+    a value matches some returned pattern if and only if
+    it matches some ``on`` pattern,
+    except that values matching a ``dc`` pattern may go either way.
+
+    For example:
+
+    >>> minimize(["3b000", "3b001", "3b011", "3b111"])
+    [bits("3b00-"), bits("3b-11")]
+    >>> minimize(["3b000", "3b001", "3b011", "3b111"], dc=["3b010"])
+    [bits("3b0--"), bits("3b-11")]
+
+    The result is not always the smallest possible,
+    but it is irredundant: no pattern can be removed,
+    and no pattern bit can be changed to ``-``.
+
+    Args:
+        on: ``Array`` or string literals with ``-`` wildcards,
+            all the same size.
+        dc: Don't care patterns, with the same size.
+
+    Returns:
+        List of ``Vector`` patterns.
+
+    Raises:
+        TypeError: Pattern size mismatch.
+        ValueError: A pattern has ``X`` bits.
+    """
+    f, size = _cubes(on, None)
+    d, size = _cubes(dc, size)
+    if size is None or not f:
+        return []
+    V = vec_cls(size)
+    if size == 0:
+        return [V._cast_data(0, 0)]
+    return [V._cast_data(c0, c1) for c0, c1 in minimize_cover(f, d, None, mask(size))]
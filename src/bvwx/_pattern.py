@@ -0,0 +1,371 @@
+"""Wildcard Pattern Sets
+
+A ``PatternSet`` compiles many ``match`` patterns into a decision tree.
+Each internal node tests one bit that is fixed (``0`` or ``1``)
+in many of the remaining patterns.
+Patterns with a ``-`` at that bit belong to both subtrees.
+Leaves hold a few patterns, checked against both data planes at once.
+
+A ``Dispatch`` maps patterns to handler functions,
+and memoizes the selected handler by subject data.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from ._bits import Array, ArrayLike, expect_array, expect_array_size, vec_cls
+
+# (index, d0, d1)
+type _Pattern = tuple[int, int, int]
+
+# Leaf: patterns sorted by index
+# Node: (bit, zero subtree, one subtree)
+type _Tree = list[_Pattern] | tuple[int, _Tree, _Tree]
+
+# Maximum patterns in a leaf
+_LEAF_SIZE = 4
+
+
+def _split(pats: list[_Pattern], size: int) -> int | None:
+    """Return the most discriminating bit, or None.
+
+    The best bit minimizes the size of the larger subtree.
+    """
+    best, best_score = None, len(pats)
+    for i in range(size):
+        n0 = n1 = 0
+        for _, d0, d1 in pats:
+            b0 = (d0 >> i) & 1
+            b1 = (d1 >> i) & 1
+            if b0 and not b1:
+                n0 += 1
+            elif b1 and not b0:
+                n1 += 1
+        # Limit duplication: at least half the patterns must test this bit
+        if 2 * (n0 + n1) < len(pats):
+            continue
+        # Size of the larger subtree
+        score = len(pats) - min(n0, n1)
+        if score < best_score:
+            best, best_score = i, score
+    return best
+
+
+def _build(pats: list[_Pattern], size: int) -> _Tree:
+    if len(pats) <= _LEAF_SIZE:
+        return pats
+    i = _split(pats, size)
+    if i is None:
+        return pats
+    zero = [p for p in pats if not (p[2] >> i) & 1 or (p[1] >> i) & 1]
+    one = [p for p in pats if not (p[1] >> i) & 1 or (p[2] >> i) & 1]
+    return i, _build(zero, size), _build(one, size)
+
+
+class PatternSet:
+    """Compiled set of ``match`` patterns with the same size.
+
+    For example, an instruction decoder:
+
+    >>> ps = PatternSet(["8b0000_----", "8b01--_----", "8b0-11_0000"])
+    >>> ps.first("8b0111_0000")
+    1
+    >>> ps.all("8b0111_0000")
+    [1, 2]
+    >>> ps.first("8b1000_0000") is None
+    True
+    >>> ps.match("8b0011_0000")
+    bits("3b100")
+
+    Results are consistent with the ``match`` operator:
+    a ``-`` bit in the subject matches any pattern bit,
+    and a subject with any ``X`` bits matches no patterns.
+
+    Args:
+        patterns: ``Array`` or string literals, all the same size.
+
+    Raises:
+        TypeError: Pattern size mismatch.
+        ValueError: No patterns, or a pattern has ``X`` bits.
+    """
+
+    __slots__ = ("_patterns", "_size", "_dmax", "_tree")
+
+    def __init__(self, patterns: Iterable[ArrayLike]):
+        xs: list[Array] = []
+        for p in patterns:
+            x = expect_array(p) if not xs else expect_array_size(p, xs[0].size)
+            if x.has_x():
+                raise ValueError(f"Expected pattern with no X bits, got {x}")
+            xs.append(x)
+        if not xs:
+            raise ValueError("Expected at least one pattern")
+
+        self._patterns = xs
+        self._size = xs[0].size
+        self._dmax = xs[0]._dmax
+        pats = [(i, x._data[0], x._data[1]) for i, x in enumerate(xs)]
+        self._tree = _build(pats, self._size)
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def __getitem__(self, i: int) -> Array:
+        return self._patterns[i]
+
+    def __repr__(self) -> str:
+        return f"PatternSet(<{len(self._patterns)} patterns>, size={self._size})"
+
+    @property
+    def size(self) -> int:
+        """Pattern size, in bits."""
+        return self._size
+
+    def _subject(self, x: ArrayLike) -> tuple[int, int] | None:
+        if not isinstance(x, Array) or x.size != self._size:
+            x = expect_array_size(x, self._size)
+        d0, d1 = x._data
+        # Subject has X => no matches
+        if (d0 | d1) != self._dmax:
+            return None
+        return d0, d1
+
+    def _leaves(self, s0: int, s1: int) -> list[list[_Pattern]]:
+        leaves: list[list[_Pattern]] = []
+        stack: list[_Tree] = [self._tree]
+        while stack:
+            t = stack.pop()
+            while isinstance(t, tuple):
+                i, zero, one = t
+                b0 = (s0 >> i) & 1
+                b1 = (s1 >> i) & 1
+                # Subject W: both subtrees
+                if b0 and b1:
+                    stack.append(one)
+                    t = zero
+                else:
+                    t = one if b1 else zero
+            leaves.append(t)
+        return leaves
+
+    def first(self, x: ArrayLike) -> int | None:
+        """Return the index of the first matching pattern, or None.
+
+        Raises:
+            TypeError: ``x`` has the wrong size.
+        """
+        s = self._subject(x)
+        if s is None:
+            return None
+        return self._first(*s)
+
+    def _first(self, s0: int, s1: int) -> int | None:
+        found = None
+        for leaf in self._leaves(s0, s1):
+            for i, d0, d1 in leaf:
+                if found is not None and i >= found:
+                    break
+                if not (s0 ^ d0) & (s1 ^ d1):
+                    found = i
+                    break
+        return found
+
+    def all(self, x: ArrayLike) -> list[int]:
+        """Return indices of all matching patterns, in ascending order.
+
+        Raises:
+            TypeError: ``x`` has the wrong size.
+        """
+        s = self._subject(x)
+        if s is None:
+            return []
+        return self._all(*s)
+
+    def _all(self, s0: int, s1: int) -> list[int]:
+        found = {
+            i for leaf in self._leaves(s0, s1) for i, d0, d1 in leaf if not (s0 ^ d0) & (s1 ^ d1)
+        }
+        return sorted(found)
+
+    def match(self, x: ArrayLike) -> Array:
+        """Match all patterns.
+
+        Returns:
+            ``Vector`` with one bit per pattern,
+            where bit ``i`` equals ``match(x, patterns[i])``.
+
+        Raises:
+            TypeError: ``x`` has the wrong size.
+        """
+        n = len(self._patterns)
+        V = vec_cls(n)
+        s = self._subject(x)
+        if s is None:
+            return V.xs()
+        d1 = 0
+        for i in self._all(*s):
+            d1 |= 1 << i
+        return V._cast_data(d1 ^ V._dmax, d1)
+
+
+# Maximum memoized subjects per Dispatch
+_MEMO_SIZE = 1 << 16
+
+
+class Dispatch:
+    """Precompiled pattern dispatch: a fast ``match`` statement.
+
+    Replaces a ``match`` statement over string literal cases.
+    Cases are tried in order, using ``match`` operator semantics,
+    so ``-`` pattern bits are wildcards.
+
+    For example:
+
+    >>> from bvwx import Array, bits
+    >>> alu = Dispatch(Array[4])
+    >>> @alu.case("2b00")
+    ... def _(op, a, b):
+    ...     return a & b
+    >>> @alu.case("2b1-")
+    ... def _(op, a, b):
+    ...     return a | b
+    >>> a, b = bits("4b1100"), bits("4b1010")
+    >>> alu("2b00", a, b)
+    bits("4b1000")
+    >>> alu("2b11", a, b)
+    bits("4b1110")
+
+    Without a ``default`` handler, a subject that matches no case
+    returns ``result.xprop(subject)``, like the ``case _`` idiom:
+
+    >>> alu("2b01", a, b)
+    bits("4b----")
+    >>> alu("2bX0", a, b)
+    bits("4bXXXX")
+
+    A subject with ``X`` bits matches no case.
+
+    Args:
+        result: ``Array`` type returned when no case matches.
+        default: Handler called when no case matches.
+                 Takes precedence over ``result``.
+    """
+
+    __slots__ = ("_result", "_default", "_patterns", "_handlers", "_ps", "_memo")
+
+    def __init__(
+        self,
+        result: type[Array] | None = None,
+        default: Callable[..., Any] | None = None,
+    ):
+        self._result = result
+        self._default = default
+        self._patterns: list[Array] = []
+        self._handlers: list[Callable[..., Any]] = []
+        self._ps: PatternSet | None = None
+        # Subject data => handler
+        self._memo: dict[tuple[int, int], Callable[..., Any]] = {}
+
+    def __repr__(self) -> str:
+        return f"Dispatch(<{len(self._patterns)} cases>)"
+
+    def case(self, pattern: ArrayLike) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator: add a case handler.
+
+        The handler is called with the subject and any extra arguments.
+
+        Args:
+            pattern: ``Array`` or string literal, with optional ``-`` bits.
+
+        Raises:
+            TypeError: Pattern size does not match previous patterns.
+            ValueError: Pattern has ``X`` bits.
+        """
+        if self._patterns:
+            x = expect_array_size(pattern, self._patterns[0].size)
+        else:
+            x = expect_array(pattern)
+        if x.has_x():
+            raise ValueError(f"Expected pattern with no X bits, got {x}")
+
+        def decorator(f: Callable[..., Any]) -> Callable[..., Any]:
+            self._patterns.append(x)
+            self._handlers.append(f)
+            self._ps = None
+            self._memo.clear()
+            return f
+
+        return decorator
+
+    def default(self, f: Callable[..., Any]) -> Callable[..., Any]:
+        """Decorator: set the handler called when no case matches."""
+        self._default = f
+        self._memo.clear()
+        return f
+
+    def _xprop(self, x: Array, *args: Any, **kwargs: Any) -> Any:
+        if self._result is None:
+            raise ValueError(f"No matching case for {x}")
+        return self._result.xprop(x)
+
+    def _compile(self) -> PatternSet:
+        ps = PatternSet(self._patterns)
+        self._ps = ps
+        # Exact patterns resolve without a search
+        for x in self._patterns:
+            if not x.has_w():
+                self._memo.setdefault(x._data, self._resolve(ps, x._data))
+        return ps
+
+    def _resolve(self, ps: PatternSet, data: tuple[int, int]) -> Callable[..., Any]:
+        d0, d1 = data
+        i = None if (d0 | d1) != ps._dmax else ps._first(d0, d1)
+        if i is not None:
+            return self._handlers[i]
+        if self._default is not None:
+            return self._default
+        return self._xprop
+
+    def handler(self, x: ArrayLike) -> Callable[..., Any]:
+        """Return the handler for a subject.
+
+        Raises:
+            TypeError: ``x`` has the wrong size.
+            ValueError: No cases.
+        """
+        ps = self._ps
+        if ps is None:
+            if not self._patterns:
+                raise ValueError("Expected at least one case")
+            ps = self._compile()
+        if not isinstance(x, Array) or x.size != ps._size:
+            x = expect_array_size(x, ps._size)
+        try:
+            return self._memo[x._data]
+        except KeyError:
+            f = self._resolve(ps, x._data)
+            if len(self._memo) < _MEMO_SIZE:
+                self._memo[x._data] = f
+            return f
+
+    def __call__(self, x: ArrayLike, *args: Any, **kwargs: Any) -> Any:
+        """Call the handler for a subject.
+
+        Args:
+            x: Subject.
+            args: Extra positional arguments for the handler.
+            kwargs: Extra keyword arguments for the handler.
+
+        Returns:
+            Handler return value.
+
+        Raises:
+            TypeError: ``x`` has the wrong size.
+            ValueError: No cases, or no matching case,
+                        with no ``default`` handler and no ``result`` type.
+        """
+        if not isinstance(x, Array):
+            x = expect_array(x)
+        return self.handler(x)(x, *args, **kwargs)
@@ -0,0 +1,511 @@
+"""Espresso PLA Files
+
+Read and write two-level logic covers in the Espresso ``.pla`` format,
+and evaluate them on ``Array`` values.
+
+A cover is a list of cubes.
+Each cube has an input part with ``0``, ``1``, and ``-`` characters,
+stored as ``(d0, d1)`` planes with the same encoding as ``bits``,
+and an output part that adds the cube to the ON, OFF, or DC set
+of each output.
+
+The input part reads like a ``bits`` literal:
+the leftmost character is the most significant bit.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+from typing import Any
+
+from . import _swar as sw
+from ._batch import ArrayBatch
+from ._bits import Array, ArrayLike, expect_array_size, vec_cls
+from ._cube import Cube, complement, intersect
+from ._minimize import minimize_cover
+from ._util import mask
+
+# (d0, d1, on, dc, off)
+type _Cube = tuple[int, int, int, int, int]
+
+# (cubes, k-bit lsbs, c1, care, n-bit out masks)
+type _Pack = tuple[int, int, int, int, int]
+
+_ON, _DC, _OFF = 0, 1, 2
+
+# Output character => set, or None for no meaning
+_OUT_CHARS: dict[str, dict[str, int | None]] = {
+    "f": {"1": _ON, "0": None, "-": None, "~": None},
+    "fd": {"1": _ON, "0": None, "-": _DC, "~": None},
+    "fr": {"1": _ON, "0": _OFF, "-": None, "~": None},
+    "fdr": {"1": _ON, "0": _OFF, "-": _DC, "~": None},
+}
+
+# Output character with no meaning
+_NONE_CHAR = {"f": "0", "fd": "0", "fr": "-", "fdr": "~"}
+
+_IN_D0 = str.maketrans("01-", "101")
+_IN_D1 = str.maketrans("01-", "011")
+
+
+def _parse_inputs(s: str, n: int) -> tuple[int, int]:
+    if len(s) != n or s.strip("01-"):
+        raise ValueError(f"Expected {n} input chars in 01-, got {s!r}")
+    return int(s.translate(_IN_D0), 2), int(s.translate(_IN_D1), 2)
+
+
+def _any_flags(x: int, n: int, k: int) -> int:
+    return sw.any_set(x, n, k) if x else 0
+
+
+class Cover:
+    """Two-level logic cover: a list of cubes.
+
+    For example, a 2:4 decoder with an enable input:
+
+    >>> f = Cover(3, 4, [("100", "0001"), ("101", "0010"), ("110", "0100"), ("111", "1000")])
+    >>> f.eval("3b110")
+    bits("4b0100")
+    >>> f.eval("3b0--")
+    bits("4b0000")
+    >>> f.eval("3b1-1")
+    bits("4b-0-0")
+
+    Input ``-`` bits propagate conservatively, one cube at a time:
+    an output is known only if a single cube decides it
+    for every value of the ``-`` bits, or no cube matches any value.
+    Otherwise, it is ``-``, even if the matching cubes together
+    give the same output for every value:
+
+    >>> g = Cover(2, 1, [("10", "1"), ("11", "1")])
+    >>> g.eval("2b1-")
+    bits("1b-")
+
+    Inputs with any ``X`` bits evaluate to all ``X`` outputs.
+
+    The cover type selects which sets the output characters describe,
+    like the Espresso ``.type`` directive:
+
+    * ``f``: ``1`` is ON; other outputs are ``0``.
+    * ``fd``: ``1`` is ON, ``-`` is DC; other outputs are ``0``.
+    * ``fr``: ``1`` is ON, ``0`` is OFF; other outputs are ``-``.
+    * ``fdr``: ``1`` is ON, ``0`` is OFF, ``-`` is DC; other outputs are ``-``.
+
+    DC outputs evaluate to ``-``, unless an ON cube also matches.
+
+    Args:
+        ninputs: Number of inputs.
+        noutputs: Number of outputs.
+        cubes: Pairs of input part and output part strings.
+        kind: Cover type: ``f``, ``fd``, ``fr``, or ``fdr``.
+
+    Raises:
+        ValueError: Invalid size, type, or cube.
+    """
+
+    __slots__ = ("_ninputs", "_noutputs", "_type", "_ilb", "_ob", "_cubes", "_packs")
+
+    def __init__(
+        self,
+        ninputs: int,
+        noutputs: int,
+        cubes: Iterable[tuple[str, str]] = (),
+        kind: str = "fd",
+    ):
+        if ninputs < 1 or noutputs < 1:
+            raise ValueError(f"Expected ninputs, noutputs ≥ 1, got {ninputs}, {noutputs}")
+        if kind not in _OUT_CHARS:
+            raise ValueError(f"Expected type in {{f, fd, fr, fdr}}, got {kind}")
+        self._ninputs = ninputs
+        self._noutputs = noutputs
+        self._type = kind
+        self._ilb: list[str] | None = None
+        self._ob: list[str] | None = None
+        self._cubes: list[_Cube] = []
+        self._packs: list[_Pack] | None = None
+
+        for inputs, outputs in cubes:
+            self.add(inputs, outputs)
+
+    def __repr__(self) -> str:
+        return f"Cover({self._ninputs}, {self._noutputs}, <{len(self._cubes)} cubes>)"
+
+    def __len__(self) -> int:
+        return len(self._cubes)
+
+    @property
+    def ninputs(self) -> int:
+        """Number of inputs."""
+        return self._ninputs
+
+    @property
+    def noutputs(self) -> int:
+        """Number of outputs."""
+        return self._noutputs
+
+    @property
+    def type(self) -> str:
+        """Cover type."""
+        return self._type
+
+    @property
+    def ilb(self) -> list[str] | None:
+        """Input labels, most significant first, or None."""
+        return self._ilb
+
+    @ilb.setter
+    def ilb(self, labels: list[str] | None):
+        if labels is not None and len(labels) != self._ninputs:
+            raise ValueError(f"Expected {self._ninputs} input labels, got {len(labels)}")
+        self._ilb = labels
+
+    @property
+    def ob(self) -> list[str] | None:
+        """Output labels, most significant first, or None."""
+        return self._ob
+
+    @ob.setter
+    def ob(self, labels: list[str] | None):
+        if labels is not None and len(labels) != self._noutputs:
+            raise ValueError(f"Expected {self._noutputs} output labels, got {len(labels)}")
+        self._ob = labels
+
+    @property
+    def cubes(self) -> list[tuple[str, str]]:
+        """Pairs of input part and output part strings."""
+        return [self._cube_str(c) for c in self._cubes]
+
+    def add(self, inputs: str | Array, outputs: str):
+        """Add a cube.
+
+        Args:
+            inputs: Input part with ``0``, ``1``, and ``-`` characters,
+                    or ``Array`` with no ``X`` bits.
+            outputs: Output part, with characters for the cover type.
+
+        Raises:
+            TypeError: ``Array`` has the wrong size.
+            ValueError: Invalid characters or length.
+        """
+        if isinstance(inputs, Array):
+            x = expect_array_size(inputs, self._ninputs)
+            if x.has_x():
+                raise ValueError(f"Expected cube with no X bits, got {x}")
+            d0, d1 = x._data
+        else:
+            d0, d1 = _parse_inputs(inputs, self._ninputs)
+
+        if len(outputs) != self._noutputs:
+            raise ValueError(f"Expected {self._noutputs} output chars, got {outputs!r}")
+        chars = _OUT_CHARS[self._type]
+        sets = [0, 0, 0]
+        for i, c in enumerate(reversed(outputs)):
+            try:
+                j = chars[c]
+            except KeyError as e:
+                raise ValueError(f"Invalid output char: {c!r}") from e
+            if j is not None:
+                sets[j] |= 1 << i
+
+        self._cubes.append((d0, d1, sets[_ON], sets[_DC], sets[_OFF]))
+        self._packs = None
+
+    def minimize(self) -> Cover:
+        """Return an equivalent cover with fewer cubes.
+
+        Each output is minimized with ``minimize``,
+        using its DC set (and for ``r`` types, every minterm in no set)
+        as don't cares.
+        Cubes shared by several outputs are merged.
+
+        For example:
+
+        >>> f = Cover(2, 2, [("00", "10"), ("01", "11"), ("11", "-1")])
+        >>> f.minimize().cubes
+        [('-1', '01'), ('0-', '10')]
+
+        Returns:
+            ``Cover`` with type ``f``,
+            the same labels,
+            and the same value for every minterm
+            where the original value is not ``-``.
+        """
+        full = mask(self._ninputs)
+        sets: list[list[list[Cube]]] = [[[], [], []] for _ in range(self._noutputs)]
+        for d0, d1, *masks in self._cubes:
+            for j, o in enumerate(masks):
+                for i in range(self._noutputs):
+                    if (o >> i) & 1:
+                        sets[i][j].append((d0, d1))
+
+        # Input part => ON outputs
+        ons: dict[Cube, int] = {}
+        for i, (f, dc, r) in enumerate(sets):
+            if not f:
+                continue
+            # ON takes precedence over DC
+            d = intersect(dc, complement(f, full), full)
+            if "r" in self._type:
+                d += complement(f + r, full)
+            for c in minimize_cover(f, d, None, full):
+                ons[c] = ons.get(c, 0) | (1 << i)
+
+        cover = Cover(self._ninputs, self._noutputs, kind="f")
+        cover._ilb, cover._ob = self._ilb, self._ob
+        cover._cubes = [(d0, d1, on, 0, 0) for (d0, d1), on in ons.items()]
+        return cover
+
+    def _cube_str(self, cube: _Cube) -> tuple[str, str]:
+        d0, d1, on, dc, off = cube
+        ins = []
+        for i in reversed(range(self._ninputs)):
+            if not ((d0 ^ d1) >> i) & 1:
+                ins.append("-")
+            else:
+                ins.append("1" if (d1 >> i) & 1 else "0")
+        none = _NONE_CHAR[self._type]
+        outs = []
+        for i in reversed(range(self._noutputs)):
+            if (on >> i) & 1:
+                outs.append("1")
+            elif (dc >> i) & 1:
+                outs.append("-")
+            elif (off >> i) & 1:
+                outs.append("0")
+            else:
+                outs.append(none)
+        return "".join(ins), "".join(outs)
+
+    def _pack(self) -> list[_Pack]:
+        """Pack the ON, DC, and OFF sets into cube lanes."""
+        if self._packs is not None:
+            return self._packs
+        k, m = self._ninputs, self._noutputs
+        self._packs = []
+        for j in (_ON, _DC, _OFF):
+            cubes = [c for c in self._cubes if c[2 + j]]
+            c1 = care = o = 0
+            for i, (d0, d1, *sets) in enumerate(cubes):
+                c1 |= d1 << (i * k)
+                care |= (d0 ^ d1) << (i * k)
+                o |= sets[j] << (i * m)
+            lsbs, _, _ = sw.masks(len(cubes), k)
+            self._packs.append((len(cubes), lsbs, c1, care, o))
+        return self._packs
+
+    def _outputs(self, p: _Pack, flags: int) -> int:
+        """Return the OR of output masks of flagged cubes."""
+        n, _, _, _, o = p
+        m = self._noutputs
+        s = sw.fill(flags, n, m) & o
+        if not s:
+            return 0
+        col, _, _ = sw.masks(n, m)
+        y = 0
+        for i in range(m):
+            if s & (col << i):
+                y |= 1 << i
+        return y
+
+    def _match(self, p: _Pack, x0: int, x1: int) -> tuple[int, int]:
+        """Return output masks for (known match, maybe match)."""
+        n, lsbs, c1, care, _ = p
+        if not n:
+            return 0, 0
+        k = self._ninputs
+        known = (x0 ^ x1) * lsbs
+        miss = _any_flags(care & known & (x1 * lsbs ^ c1), n, k)
+        maybe = _any_flags(care & ~known, n, k)
+        hit = mask(n) ^ miss
+        return self._outputs(p, hit & ~maybe), self._outputs(p, hit & maybe)
+
+    def _combine(self, on1: int, onw: int, dc: int, off1: int, m: int) -> tuple[int, int]:
+        """Return output planes, with all-ones mask m."""
+        w = onw | dc
+        if "r" in self._type:
+            w |= m ^ off1
+        w &= m ^ on1
+        return m ^ on1, on1 | w
+
+    def eval(self, x: ArrayLike) -> Array:
+        """Evaluate the cover.
+
+        Each set of cubes is checked at once,
+        with one group of bits per cube in packed ``int`` planes.
+
+        Args:
+            x: ``Array`` or string literal with ``ninputs`` bits.
+
+        Returns:
+            ``Vector[noutputs]``
+
+        Raises:
+            TypeError: ``x`` has the wrong size.
+        """
+        x = expect_array_size(x, self._ninputs)
+        V = vec_cls(self._noutputs)
+        x0, x1 = x._data
+        if (x0 | x1) != x._dmax:
+            return V.xs()
+        on, dc, off = self._pack()
+        on1, onw = self._match(on, x0, x1)
+        dc1, dcw = self._match(dc, x0, x1)
+        off1, _ = self._match(off, x0, x1)
+        d0, d1 = self._combine(on1, onw, dc1 | dcw, off1, V._dmax)
+        return V._cast_data(d0, d1)
+
+    def eval_batch(self, xs: ArrayBatch) -> ArrayBatch:
+        """Evaluate the cover on every lane of a batch.
+
+        Each cube is checked against all lanes at once.
+
+        Args:
+            xs: ``ArrayBatch`` with ``ninputs``-bit lanes.
+
+        Returns:
+            ``ArrayBatch`` with ``noutputs``-bit lanes.
+
+        Raises:
+            TypeError: ``xs`` has the wrong size.
+        """
+        k, m = self._ninputs, self._noutputs
+        if xs.size != k:
+            raise TypeError(f"Expected size {k}, got {xs.size}")
+        n = len(xs)
+        lsbs, msbs, dmax = sw.masks(n, k)
+        lows = dmax ^ msbs
+        x0, x1 = xs._data
+        known = x0 ^ x1
+        unknown = dmax ^ known
+
+        def any_bits(x: int) -> int:
+            """Return flags in the LSB of each lane with at least one bit set."""
+            return ((((x & lows) + lows) | x) & msbs) >> (k - 1)
+
+        # (set, known/maybe, output) => lane flags
+        acc = [[[0] * m, [0] * m] for _ in range(3)]
+        for d0, d1, *masks in self._cubes:
+            care = (d0 ^ d1) * lsbs
+            hit = lsbs ^ any_bits(care & known & (x1 ^ d1 * lsbs))
+            maybe = any_bits(care & unknown) if unknown else 0
+            one, w = hit & ~maybe, hit & maybe
+            for j, o in enumerate(masks):
+                for i in range(m):
+                    if (o >> i) & 1:
+                        acc[j][0][i] |= one
+                        acc[j][1][i] |= w
+
+        # Deposit lane flags into output lanes
+        sets = [
+            [
+                sum(sw.spread(sw.gather(f, n, k, 0), n, m) << i for i, f in enumerate(fs))
+                for fs in kinds
+            ]
+            for kinds in acc
+        ]
+        (on1, onw), (dc1, dcw), (off1, _) = sets
+        omax = sw.masks(n, m)[2]
+        d0, d1 = self._combine(on1, onw, dc1 | dcw, off1, omax)
+
+        # Lanes with X inputs => all X
+        hx, _ = xs._xw()
+        keep = omax ^ sw.fill(hx, n, m)
+        return ArrayBatch(vec_cls(m), n, d0 & keep, d1 & keep)
+
+
+_DIRECTIVES = (".i", ".o", ".p", ".type", ".ilb", ".ob", ".e", ".end")
+
+# Directives that describe the cover, and must precede the product terms
+_HEADER = (".i", ".o", ".type", ".ilb", ".ob")
+
+
+def readpla(path: str | os.PathLike[str]) -> Cover:
+    """Read an Espresso ``.pla`` file.
+
+    Supports the ``.i``, ``.o``, ``.p``, ``.type``, ``.ilb``, ``.ob``,
+    and ``.e`` directives, and ``#`` comments.
+
+    Args:
+        path: File path
+
+    Returns:
+        ``Cover`` with one cube per product term.
+
+    Raises:
+        ValueError: Syntax error, unsupported directive,
+                    header directive after a product term,
+                    or ``.p`` does not match the number of cubes.
+    """
+    header: dict[str, Any] = {"type": "fd"}
+    cover: Cover | None = None
+
+    with open(path, encoding="utf-8") as f:
+        for lineno, text in enumerate(f, start=1):
+            line = text.split("#", 1)[0].strip()
+            if not line:
+                continue
+            try:
+                if line.startswith("."):
+                    if _directive(header, line.split(), cover is not None):
+                        break
+                    continue
+                if cover is None:
+                    cover = _new_cover(header)
+                s = "".join(line.split())
+                cover.add(s[: cover.ninputs], s[cover.ninputs :])
+            except (IndexError, ValueError) as e:
+                raise ValueError(f"{path}:{lineno}: {e}") from e
+
+    if cover is None:
+        cover = _new_cover(header)
+    if ".p" in header and header[".p"] != len(cover):
+        raise ValueError(f"Expected {header['.p']} product terms, got {len(cover)}")
+    return cover
+
+
+def _directive(header: dict[str, Any], words: list[str], started: bool) -> bool:
+    """Parse a directive into header; return True at the end of the file."""
+    d = words[0]
+    if d not in _DIRECTIVES:
+        raise ValueError(f"Unsupported directive: {d}")
+    if started and d in _HEADER:
+        raise ValueError(f"Expected {d} directive before product terms")
+    if d in (".e", ".end"):
+        return True
+    if d in (".i", ".o", ".p"):
+        header[d] = int(words[1])
+    elif d == ".type":
+        header["type"] = words[1]
+    else:
+        header[d] = words[1:]
+    return False
+
+
+def _new_cover(header: dict[str, Any]) -> Cover:
+    if ".i" not in header or ".o" not in header:
+        raise ValueError("Expected .i and .o directives before product terms")
+    cover = Cover(header[".i"], header[".o"], kind=header["type"])
+    cover.ilb = header.get(".ilb")
+    cover.ob = header.get(".ob")
+    return cover
+
+
+def writepla(path: str | os.PathLike[str], cover: Cover):
+    """Write an Espresso ``.pla`` file.
+
+    Args:
+        path: File path
+        cover: ``Cover`` to write
+    """
+    lines = [f".i {cover.ninputs}", f".o {cover.noutputs}"]
+    if cover.ilb is not None:
+        lines.append(" ".join([".ilb", *cover.ilb]))
+    if cover.ob is not None:
+        lines.append(" ".join([".ob", *cover.ob]))
+    lines.append(f".type {cover.type}")
+    lines.append(f".p {len(cover)}")
+    lines.extend(f"{ins} {outs}" for ins, outs in cover.cubes)
+    lines.append(".e")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
@@ -13,8 +13,6 @@ from ._bits import (
     bool2scalar,
     expect_array,
     expect_array_size,
-    scalar0,
-    scalar1,
     scalarW,
     scalarX,
 )
@@ -377,12 +375,10 @@ def _match(x0: Array, x1: Array) -> Array:
     if x0.has_x() or x1.has_x():
         return scalarX
 
-    for i in range(x0.size):
-        a0, a1 = x0._get_index(i)
-        b0, b1 = x1._get_index(i)
-        if a0 ^ b0 and a1 ^ b1:
-            return scalar0
-    return scalar1
+    # Bits mismatch if they have no value in common
+    a0, a1 = x0._data
+    b0, b1 = x1._data
+    return bool2scalar[not (a0 ^ b0) & (a1 ^ b1)]
 
 
 def match(x0: ArrayLike, x1: ArrayLike) -> Array:
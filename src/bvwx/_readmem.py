@@ -0,0 +1,354 @@
+"""Verilog Memory Files
+
+Read and write ``$readmemh`` / ``$readmemb`` style text files.
+
+A memory file contains whitespace-separated data words,
+``//`` and ``/* */`` comments,
+and ``@addr`` directives that set the address of the next word.
+Addresses are always hexadecimal.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+from typing import BinaryIO
+
+from ._bits import Array, array_cls, vec_cls
+from ._util import mask
+
+type _Part = tuple[int, int, int]
+
+# Maximum data words per regex match
+_RUN = 65536
+
+_MEM_RE = re.compile(
+    rb"(?P<comment>//[^\n]*|/\*.*?\*/)"
+    rb"|@(?P<addr>[0-9a-fA-F_]+)"
+    rb"|(?P<data>(?:[^\s/@]+\s*){1,%d})"
+    rb"|(?P<space>\s+)"
+    rb"|(?P<error>.)" % _RUN,
+    re.DOTALL,
+)
+
+_SPACE_RE = re.compile(rb"\s")
+
+# Bytes per chunk
+_CHUNK = 1 << 22
+
+_UNKNOWN = b"xXzZ?"
+
+
+class _Format:
+    """Memory file digit format."""
+
+    def __init__(self, base: int, spec: str, digits: bytes, d0: bytes):
+        self.base = base
+        self.spec = spec
+        self.bits = base.bit_length() - 1
+        self.valid = digits + _UNKNOWN
+        self.d0 = bytes.maketrans(self.valid, d0 + b"0" * len(_UNKNOWN))
+        self.d1 = bytes.maketrans(_UNKNOWN, b"0" * len(_UNKNOWN))
+
+
+_HEX = _Format(16, "x", b"0123456789abcdefABCDEF", b"fedcba9876543210543210")
+_BIN = _Format(2, "b", b"01", b"10")
+
+
+def _word(fmt: _Format, tok: bytes, width: int) -> tuple[int, int]:
+    """Parse one data word."""
+    d0 = int(tok.translate(fmt.d0), fmt.base)
+    d1 = int(tok.translate(fmt.d1), fmt.base)
+    n = fmt.bits * len(tok)
+    if n < width:
+        # Extend with X if the leftmost digit is unknown, otherwise zero
+        if tok[0] not in _UNKNOWN:
+            d0 |= mask(width) ^ mask(n)
+    elif n > width:
+        # Unknown partial top digit => X
+        if n - width < fmt.bits and tok[0] in _UNKNOWN:
+            return d0 & mask(width), d1 & mask(width)
+        # Bits beyond width must be known zeros
+        if d0 >> width != mask(n - width) or d1 >> width:
+            raise ValueError(f"Expected {width}-bit word, got {tok.decode()}")
+        d0 &= mask(width)
+    return d0, d1
+
+
+def _run(fmt: _Format, run: bytes, width: int) -> tuple[int, int, int]:
+    """Parse a run of data words.
+
+    Returns:
+        Number of words, and planes with word 0 in the least significant bits.
+    """
+    tokens = run.replace(b"_", b"").split()
+    joined = b"".join(reversed(tokens))
+    if joined.translate(None, fmt.valid):
+        raise ValueError(f"Invalid data: {run.split()[0].decode()} ...")
+
+    k = len(tokens)
+    n = len(tokens[0])
+
+    # Fast path: every word has exactly width bits
+    if fmt.bits * n == width and len(joined) == k * n:
+        d0 = int(joined.translate(fmt.d0), fmt.base)
+        d1 = int(joined.translate(fmt.d1), fmt.base)
+        return k, d0, d1
+
+    _, d0, d1 = _merge([(i * width, *_word(fmt, tok, width)) for i, tok in enumerate(tokens)])
+    return k, d0, d1
+
+
+def _merge(parts: list[_Part]) -> _Part:
+    """Merge non-overlapping parts, sorted by bit offset.
+
+    Balance the merge tree so each bit is shifted O(log n) times.
+    """
+
+    def f(lo: int, hi: int) -> _Part:
+        if hi - lo == 1:
+            return parts[lo]
+        mid = (lo + hi) // 2
+        b0, x0, x1 = f(lo, mid)
+        b1, y0, y1 = f(mid, hi)
+        n = b1 - b0
+        return b0, x0 | (y0 << n), x1 | (y1 << n)
+
+    if not parts:
+        return 0, 0, 0
+    base, d0, d1 = f(0, len(parts))
+    return 0, d0 << base, d1 << base
+
+
+def _mem_cls(depth: int, width: int) -> type[Array]:
+    shape = tuple(n for n in (depth, width) if n != 1)
+    if not shape:
+        return vec_cls(1)
+    if depth == 0 or width == 0:
+        return vec_cls(0)
+    return array_cls(shape)
+
+
+def _scan(
+    fmt: _Format,
+    mm: mmap.mmap,
+    depth: int,
+    width: int,
+    segs: list[tuple[int, int, int, int]],
+):
+    """Scan a memory file, and append (address, words, d0, d1) segments."""
+    addr = 0
+
+    def data(run: bytes):
+        nonlocal addr
+        k, d0, d1 = _run(fmt, run, width)
+        if addr + k > depth:
+            s = f"Expected address < {depth}, got {addr + k - 1}"
+            raise ValueError(s)
+        segs.append((addr, k, d0, d1))
+        addr += k
+
+    pos, size = 0, len(mm)
+    while pos < size:
+        # Chunk ends on whitespace
+        end = min(pos + _CHUNK, size)
+        m = _SPACE_RE.search(mm, end)
+        end = size if m is None else m.start()
+
+        # Fast path: data words only
+        chunk = mm[pos:end]
+        if b"/" not in chunk and b"@" not in chunk:
+            if chunk.strip():
+                data(chunk)
+            pos = end
+            continue
+
+        while pos < end:
+            m = _MEM_RE.match(mm, pos)
+            assert m is not None
+            kind = m.lastgroup
+            if kind == "data":
+                data(m.group(kind))
+            elif kind == "addr":
+                addr = int(m.group(kind).replace(b"_", b""), 16)
+                if addr >= depth:
+                    raise ValueError(f"Expected address < {depth}, got {addr}")
+            elif kind == "error":
+                s = f"Invalid character at offset {m.start()}: {m.group(kind)!r}"
+                raise ValueError(s)
+            pos = m.end()
+
+
+def _readmem(fmt: _Format, path: str | os.PathLike[str], depth: int, width: int) -> Array:
+    if depth < 0 or width < 0:
+        raise ValueError(f"Expected depth, width ≥ 0, got {depth}, {width}")
+
+    # (address, words, d0, d1)
+    segs: list[tuple[int, int, int, int]] = []
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                _scan(fmt, mm, depth, width, segs)
+
+    segs_sorted = sorted(segs, key=lambda seg: seg[0])
+    overlap = any(
+        a0 + k0 > a1 for (a0, k0, _, _), (a1, _, _, _) in zip(segs_sorted, segs_sorted[1:])
+    )
+
+    if overlap:
+        # Later words overwrite earlier words
+        d0, d1 = 0, 0
+        for a, k, x0, x1 in segs:
+            m = mask(k * width) << (a * width)
+            d0 = (d0 & ~m) | (x0 << (a * width))
+            d1 = (d1 & ~m) | (x1 << (a * width))
+    else:
+        _, d0, d1 = _merge([(a * width, x0, x1) for a, _, x0, x1 in segs_sorted])
+
+    # Unwritten words are X
+    return _mem_cls(depth, width)._cast_data(d0, d1)
+
+
+def readmemh(path: str | os.PathLike[str], depth: int, width: int) -> Array:
+    """Read a ``$readmemh`` style memory file.
+
+    The file is memory-mapped, and parsed in large runs of words.
+    Each run of equal-size words converts to one ``int`` per data plane.
+
+    Digits ``x`` and ``z`` (or ``?``) are read as ``X``.
+    Words shorter than ``width`` extend with ``X`` if the leftmost digit
+    is unknown, and with zeros otherwise.
+    Words longer than ``width`` must have known zeros in the extra bits,
+    or an unknown leftmost digit that is only partly in ``width``.
+    Unwritten words are ``X``.
+    If words overlap, the last one in the file wins.
+
+    Args:
+        path: File path
+        depth: Number of words
+        width: Number of bits per word
+
+    Returns:
+        ``Array[depth, width]``
+
+    Raises:
+        ValueError: Syntax error, address out of range,
+                    or word does not fit in ``width`` bits.
+    """
+    return _readmem(_HEX, path, depth, width)
+
+
+def readmemb(path: str | os.PathLike[str], depth: int, width: int) -> Array:
+    """Read a ``$readmemb`` style memory file.
+
+    Same as ``readmemh``, but data words are binary.
+
+    Args:
+        path: File path
+        depth: Number of words
+        width: Number of bits per word
+
+    Returns:
+        ``Array[depth, width]``
+
+    Raises:
+        ValueError: Syntax error, address out of range,
+                    or word does not fit in ``width`` bits.
+    """
+    return _readmem(_BIN, path, depth, width)
+
+
+# Byte with high bit set => x
+_TO_CHAR = bytes(range(0x80)) + b"x" * 0x80
+
+
+def _repack(d: int, depth: int, width: int, pad: int) -> int:
+    """Insert pad zero bits above each word."""
+    s = format(d, f"0{depth * width}b")
+    z = "0" * pad
+    return int("".join(z + s[i : i + width] for i in range(0, len(s), width)), 2)
+
+
+def _chars(fmt: _Format, d0: int, d1: int, n: int) -> bytes:
+    """Format planes as n digits, most significant first."""
+    if n == 0:
+        return b""
+    spec = f"0{n}{fmt.spec}"
+
+    # Unknown bits => one flag bit per digit
+    x = ~(d0 ^ d1) & mask(fmt.bits * n)
+    u = x
+    for i in range(1, fmt.bits):
+        u |= x >> i
+    u &= int("1" * n, fmt.base)
+
+    # Set the high bit of unknown digit chars
+    c1 = int.from_bytes(format(d1, spec).encode(), "big")
+    cu = int.from_bytes(format(u, spec).encode(), "big") & int.from_bytes(b"\x01" * n, "big")
+    return (c1 | cu << 7).to_bytes(n, "big").translate(_TO_CHAR)
+
+
+def _writemem(fmt: _Format, path: str | os.PathLike[str], x: Array, width: int | None):
+    if width is None:
+        width = x.shape[-1]
+    if width < 0 or width and x.size % width or not width and x.size:
+        raise ValueError(f"Expected width to divide size {x.size}, got {width}")
+    depth = x.size // width if width else 0
+    n = -(-width // fmt.bits)
+
+    d0, d1 = x._data
+    pad = fmt.bits * n - width
+    if pad:
+        d0 = _repack(d0 ^ mask(x.size), depth, width, pad) ^ mask(depth * fmt.bits * n)
+        d1 = _repack(d1, depth, width, pad)
+
+    s = _chars(fmt, d0, d1, depth * n)
+
+    with open(path, "wb") as f:
+        _write_lines(f, s, depth, n)
+
+
+def _write_lines(f: BinaryIO, s: bytes, depth: int, n: int):
+    # Address zero is the least significant word
+    for i in range(0, depth, _RUN):
+        j = min(i + _RUN, depth)
+        lines = [s[(depth - a - 1) * n : (depth - a) * n] for a in range(i, j)]
+        f.write(b"\n".join(lines) + b"\n")
+
+
+def writememh(path: str | os.PathLike[str], x: Array, width: int | None = None):
+    """Write a ``$readmemh`` style memory file.
+
+    Writes one word per line, starting from address zero.
+    Hex digits with any unknown bits are written as ``x``,
+    so ``W`` bits do not survive a round trip.
+
+    Args:
+        path: File path
+        x: ``Array`` to write
+        width: Number of bits per word.
+               Defaults to the size of the last dimension of ``x``.
+
+    Raises:
+        ValueError: ``width`` does not divide the size of ``x``.
+    """
+    _writemem(_HEX, path, x, width)
+
+
+def writememb(path: str | os.PathLike[str], x: Array, width: int | None = None):
+    """Write a ``$readmemb`` style memory file.
+
+    Same as ``writememh``, but data words are binary.
+
+    Args:
+        path: File path
+        x: ``Array`` to write
+        width: Number of bits per word.
+               Defaults to the size of the last dimension of ``x``.
+
+    Raises:
+        ValueError: ``width`` does not divide the size of ``x``.
+    """
+    _writemem(_BIN, path, x, width)
@@ -1,13 +1,14 @@
 """Bits Struct data type."""
 
 import sys
-from functools import partial
-from typing import Any, get_origin
+from collections.abc import Callable
+from typing import Any, Self, get_origin
 
 if sys.version_info >= (3, 14):
     from annotationlib import Format, get_annotate_from_class_namespace
 
 from ._bits import Array, ArrayLike, expect_array_size, vec_cls
+from ._codegen import cast_func
 
 type Field = tuple[str, int, type[Array]]
 
@@ -24,16 +25,204 @@ def _get_annotations(attrs: dict[str, Any]) -> dict[str, Any]:
         raise ValueError("Empty Struct is not supported") from e
 
 
+# Local and global names used by the generated __init__ method
+_INIT_NAMES = frozenset(["self", "_arg", "_d0", "_d1", "_x0", "_x1"])
+
+
 def _struct_init_source(fields: list[Field]) -> str:
-    """Return source code for Struct __init__ method with fields."""
+    """Return source code for Struct __init__ method with fields.
+
+    The loop over fields is unrolled,
+    with offsets and masks as constants.
+    Arguments of the exact field type, and in-range ints,
+    skip ``expect_array_size``.
+    """
     lines: list[str] = []
     s = ", ".join(f"{fn}=None" for fn, _, _ in fields)
     lines.append(f"def init(self, {s}):\n")
-    s = ", ".join(fn for fn, _, _ in fields)
-    lines.append(f"    _init_body(self, {s})\n")
+    lines.append("    _d0 = _d1 = 0\n")
+    for i, (fn, fo, ft) in enumerate(fields):
+        shift = f" << {fo}" if fo else ""
+        mask = f"{ft._dmax:#x}"
+        # None => X
+        lines.append(f"    if {fn} is None:\n")
+        lines.append("        pass\n")
+        lines.append(f"    elif {fn}.__class__ is _t{i}:\n")
+        lines.append(f"        _x0, _x1 = {fn}._data\n")
+        lines.append(f"        _d0 |= _x0{shift}\n")
+        lines.append(f"        _d1 |= _x1{shift}\n")
+        lines.append(f"    elif {fn}.__class__ is int and 0 <= {fn} <= {mask}:\n")
+        lines.append(f"        _d0 |= ({fn} ^ {mask}){shift}\n")
+        lines.append(f"        _d1 |= {fn}{shift}\n")
+        # Literals hit the lit2bv cache
+        lines.append("    else:\n")
+        lines.append(f"        _x0, _x1 = _arg({fn}, {ft.size})._data\n")
+        lines.append(f"        _d0 |= _x0{shift}\n")
+        lines.append(f"        _d1 |= _x1{shift}\n")
+    lines.append("    self._data = (_d0, _d1)\n")
+    return "".join(lines)
+
+
+def _struct_init(fields: list[Field]) -> Callable[..., None]:
+    """Return Struct __init__ method."""
+    globals_: dict[str, Any] = {"_arg": expect_array_size}
+    for i, (fn, _, ft) in enumerate(fields):
+        if fn in _INIT_NAMES or fn.removeprefix("_t").isdigit():
+            raise ValueError(f"Cannot use reserved field name: {fn}")
+        globals_[f"_t{i}"] = ft
+    locals_: dict[str, Any] = {}
+    exec(_struct_init_source(fields), globals_, locals_)
+    return locals_["init"]
+
+
+def _field_expr(fo: int, ft: type[Array], plane: str) -> str:
+    if fo == 0:
+        return f"{plane} & {ft._dmax:#x}"
+    return f"({plane} >> {fo}) & {ft._dmax:#x}"
+
+
+def _struct_fget_source(i: int, fo: int, ft: type[Array]) -> str:
+    """Return source code for Struct field i getter."""
+    lines: list[str] = []
+    lines.append(f"def fget{i}(self):\n")
+    lines.append("    d0, d1 = self._data\n")
+    d0, d1 = _field_expr(fo, ft, "d0"), _field_expr(fo, ft, "d1")
+    lines.append(f"    return _cast{i}(_t{i}, {d0}, {d1})\n")
     return "".join(lines)
 
 
+def _struct_unpack_source(fields: list[Field]) -> str:
+    """Return source code for Struct unpack method with fields."""
+    lines: list[str] = []
+    lines.append("def unpack(self):\n")
+    lines.append("    d0, d1 = self._data\n")
+    lines.append("    return (\n")
+    for i, (_, fo, ft) in enumerate(fields):
+        d0, d1 = _field_expr(fo, ft, "d0"), _field_expr(fo, ft, "d1")
+        lines.append(f"        _cast{i}(_t{i}, {d0}, {d1}),\n")
+    lines.append("    )\n")
+    return "".join(lines)
+
+
+def _struct_accessors(
+    fields: list[Field],
+) -> tuple[list[Callable[..., Array]], Callable[..., tuple]]:
+    """Return Struct field getters, and unpack method.
+
+    Field offsets and masks are constants in the generated code.
+    """
+    globals_: dict[str, Any] = {}
+    sources: list[str] = []
+    for i, (_, fo, ft) in enumerate(fields):
+        globals_[f"_t{i}"] = ft
+        globals_[f"_cast{i}"] = cast_func(ft)
+        sources.append(_struct_fget_source(i, fo, ft))
+    sources.append(_struct_unpack_source(fields))
+    locals_: dict[str, Any] = {}
+    exec("".join(sources), globals_, locals_)
+
+    unpack = locals_["unpack"]
+    unpack.__doc__ = "Return a tuple of all field values, in field order."
+    return [locals_[f"fget{i}"] for i in range(len(fields))], unpack
+
+
+# Field name => (offset, type, clear mask)
+type Layout = dict[str, tuple[int, type[Array], int]]
+
+
+def _layout(fields: list[Field], dmax: int) -> Layout:
+    return {fn: (fo, ft, dmax ^ (ft._dmax << fo)) for fn, fo, ft in fields}
+
+
+def _update(
+    layout: Layout, d0: int, d1: int, values: dict[str, ArrayLike | None]
+) -> tuple[int, int]:
+    """Clear each field, then OR in its new value."""
+    for fn, arg in values.items():
+        try:
+            fo, ft, clear = layout[fn]
+        except KeyError as e:
+            raise TypeError(f"Unknown field: {fn}") from e
+        d0 &= clear
+        d1 &= clear
+        # None => X
+        if arg is not None:
+            if isinstance(arg, Array) and type(arg) is ft:
+                x = arg
+            else:
+                x = expect_array_size(arg, ft.size)
+            d0 |= x._data[0] << fo
+            d1 |= x._data[1] << fo
+    return d0, d1
+
+
+class StructBuilder:
+    """Mutable Struct value, for many field updates in place.
+
+    Create with ``Struct.builder``.
+    """
+
+    __slots__ = ("_t", "_layout", "_d0", "_d1")
+
+    def __init__(self, t: type[Array], layout: Layout, d0: int, d1: int):
+        self._t = t
+        self._layout = layout
+        self._d0 = d0
+        self._d1 = d1
+
+    def __repr__(self) -> str:
+        return f"StructBuilder({self._t.__name__})"
+
+    def set(self, **fields: ArrayLike | None) -> Self:
+        """Update fields in place.
+
+        Args:
+            fields: Mapping from field name to new value.
+                    ``None`` sets a field to ``X``.
+
+        Returns:
+            This builder, for chaining.
+
+        Raises:
+            TypeError: Unknown field name, or value has the wrong size.
+        """
+        self._d0, self._d1 = _update(self._layout, self._d0, self._d1, fields)
+        return self
+
+    def build(self) -> Array:
+        """Return a new Struct value."""
+        return self._t._cast_data(self._d0, self._d1)
+
+
+def _struct_update_methods(
+    layout: Layout,
+) -> tuple[Callable[..., Array], Callable[..., StructBuilder]]:
+    def replace(self, **fields: ArrayLike | None):
+        """Return a copy with some fields replaced.
+
+        Only the given fields are checked and updated.
+
+        Args:
+            fields: Mapping from field name to new value.
+                    ``None`` sets a field to ``X``.
+
+        Raises:
+            TypeError: Unknown field name, or value has the wrong size.
+        """
+        d0, d1 = _update(layout, self._data[0], self._data[1], fields)
+        return self._cast_data(d0, d1)
+
+    def builder(self) -> StructBuilder:
+        """Return a ``StructBuilder`` that starts with this value.
+
+        Use it to apply many updates in place,
+        then ``build`` a new value at the end.
+        """
+        return StructBuilder(type(self), layout, self._data[0], self._data[1])
+
+    return replace, builder
+
+
 class StructType(type):
     """Struct Metaclass: Create struct base classes."""
 
@@ -77,23 +266,10 @@ class StructType(type):
         V = vec_cls(field_offset)
 
         # Create Struct class
-        ns: dict[str, Any] = {"__slots__": ()}
+        layout = _layout(fields, V._dmax)
+        ns: dict[str, Any] = {"__slots__": (), "_layout": layout}
         cls = super().__new__(mcls, name, (V,), ns)
 
-        def _init_body(obj: Array, *args: ArrayLike | None):
-            d0, d1 = 0, 0
-            for arg, (_, fo, ft) in zip(args, fields):
-                if arg is not None:
-                    x = expect_array_size(arg, ft.size)
-                    d0 |= x._data[0] << fo
-                    d1 |= x._data[1] << fo
-            obj._data = (d0, d1)
-
-        source = _struct_init_source(fields)
-        globals_: dict[str, Any] = {"_init_body": _init_body}
-        locals_: dict[str, Any] = {}
-        exec(source, globals_, locals_)
-
         def _repr(self) -> str:
             parts = [f"{name}("]
             for fn, _, _ in fields:
@@ -112,21 +288,21 @@ class StructType(type):
             parts.append(")")
             return "\n".join(parts)
 
-        def _fget(fo: int, ft: type[Array], self):
-            d0 = (self._data[0] >> fo) & ft._dmax
-            d1 = (self._data[1] >> fo) & ft._dmax
-            return ft._cast_data(d0, d1)
-
         # Override Array methods
-        setattr(cls, "__init__", locals_["init"])
+        setattr(cls, "__init__", _struct_init(fields))
         setattr(cls, "__repr__", _repr)
         setattr(cls, "__str__", _str)
 
+        fgets, unpack = _struct_accessors(fields)
+        replace, builder = _struct_update_methods(layout)
+        for fn, f in (("unpack", unpack), ("replace", replace), ("builder", builder)):
+            setattr(cls, fn, f)
+
         # Create Struct fields
-        for fn, fo, ft in fields:
+        for (fn, _, _), fget in zip(fields, fgets):
             if hasattr(cls, fn):
                 raise ValueError(f"Cannot use reserved field name: {fn}")
-            setattr(cls, fn, property(fget=partial(_fget, fo, ft)))
+            setattr(cls, fn, property(fget=fget))
 
         return cls
 
@@ -164,4 +340,22 @@ class Struct(metaclass=StructType):
 
     >>> maize[8:16] == maize.green
     True
+
+    Use the ``unpack`` method to get all fields at once:
+
+    >>> red, green, blue = maize.unpack()
+    >>> blue
+    bits("8b0000_0101")
+
+    Use the ``replace`` method to update some fields:
+
+    >>> maize.replace(blue="8h00").blue
+    bits("8b0000_0000")
+
+    Field names that are ``Array`` attributes,
+    or ``unpack``, ``replace``, and ``builder``, are reserved.
+    So are the names used by the generated constructor:
+    ``self``, ``_arg``, ``_d0``, ``_d1``, ``_x0``, ``_x1``,
+    and ``_t`` followed by digits.
+    Defining a field with a reserved name raises ``ValueError``.
     """
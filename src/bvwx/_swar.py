@@ -0,0 +1,109 @@
+"""SWAR Lane Primitives
+
+SIMD Within A Register: N lanes of K bits each, packed into one ``int``.
+Lane ``i`` occupies bits ``[i*K, (i+1)*K)``.
+Arithmetic on packed lanes keeps carries confined to each lane.
+
+These kernels work on plain ``int`` planes,
+and are shared by ``ArrayBatch``, the logic minimizer, and PLA covers.
+"""
+
+from functools import lru_cache
+
+from ._util import mask
+
+
+@lru_cache(maxsize=256)
+def masks(n: int, k: int) -> tuple[int, int, int]:
+    """Return (lsbs, msbs, dmax) masks for N lanes of K bits."""
+    lsbs = int(("0" * (k - 1) + "1") * n, base=2) if n else 0
+    msbs = lsbs << (k - 1)
+    return lsbs, msbs, mask(n * k)
+
+
+@lru_cache(maxsize=64)
+def _fill_table(k: int) -> dict[int, str]:
+    return {ord("0"): "0" * k, ord("1"): "1" * k}
+
+
+def fill(x: int, n: int, k: int) -> int:
+    """Expand N one-bit lane flags to N K-bit lane masks."""
+    if k == 1 or x == 0:
+        return x
+    s = format(x, "b").zfill(n)
+    return int(s.translate(_fill_table(k)), base=2)
+
+
+@lru_cache(maxsize=64)
+def _spread_table(k: int) -> dict[int, str]:
+    return {ord("0"): "0" * k, ord("1"): "0" * (k - 1) + "1"}
+
+
+def spread(x: int, n: int, k: int) -> int:
+    """Deposit N one-bit lane flags to bit zero of N K-bit lanes."""
+    if k == 1 or x == 0:
+        return x
+    s = format(x, "b").zfill(n)
+    return int(s.translate(_spread_table(k)), base=2)
+
+
+def gather(x: int, n: int, k: int, i: int) -> int:
+    """Collect bit i of N K-bit lanes into N one-bit lane flags."""
+    if k == 1 or x == 0:
+        return x
+    s = format(x, "b").zfill(n * k)
+    return int(s[k - 1 - i :: k], base=2)
+
+
+def any_set(x: int, n: int, k: int) -> int:
+    """Return N one-bit flags: lane has at least one bit set."""
+    _, msbs, dmax = masks(n, k)
+    lows = dmax ^ msbs
+    y = (((x & lows) + lows) | x) & msbs
+    return gather(y, n, k, k - 1)
+
+
+def parity(x: int, n: int, k: int) -> int:
+    """Return N one-bit flags: lane has an odd number of bits set."""
+    lsbs, _, _ = masks(n, k)
+    y = x
+    for i in range(1, k):
+        y ^= x >> i
+    return gather(y & lsbs, n, k, 0)
+
+
+def borrow(a1: int, b1: int, n: int, k: int) -> int:
+    """Return N one-bit flags: lane borrow out of a - b (known values)."""
+    _, msbs, dmax = masks(n, k)
+    lows = dmax ^ msbs
+    t = (a1 | msbs) - (b1 & lows)
+    bi = ~t & msbs
+    bo = ((~a1 & b1) | (~(a1 ^ b1) & bi)) & msbs
+    return gather(bo, n, k, k - 1)
+
+
+def add(a1: int, b1: int, c1: int, n: int, k: int) -> tuple[int, int]:
+    """Return lane sums and N one-bit carry-out flags of a + b + c (known values).
+
+    Carry-in ``c1`` is N one-bit lane flags.
+    """
+    lsbs, msbs, dmax = masks(n, k)
+    lows = dmax ^ msbs
+    low = (a1 & lows) + (b1 & lows) + (fill(c1, n, k) & lsbs)
+    s1 = low ^ ((a1 ^ b1) & msbs)
+    ci = low & msbs
+    co = ((a1 & b1) | ((a1 ^ b1) & ci)) & msbs
+    return s1 & dmax, gather(co, n, k, k - 1)
+
+
+def add_nc(a1: int, b1: int, n: int, k: int) -> int:
+    """Return lane sums of a + b, with NO carry-out (known values)."""
+    _, msbs, dmax = masks(n, k)
+    lows = dmax ^ msbs
+    return ((a1 & lows) + (b1 & lows)) ^ ((a1 ^ b1) & msbs)
+
+
+def extract(x: int, n: int, k: int, i: int, j: int) -> int:
+    """Collect bits [i, j) of N K-bit lanes into N (j-i)-bit lanes."""
+    s = format(x, "b").zfill(n * k)
+    return int("".join(s[p + k - j : p + k - i] for p in range(0, n * k, k)) or "0", base=2)
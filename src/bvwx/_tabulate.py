@@ -0,0 +1,161 @@
+"""Tabulate small functions over Arrays into lookup tables.
+
+The ``tabulate`` function evaluates a function once for every known input
+value, and stores the output data planes in two ``array`` buffers.
+Calls with known inputs are a table lookup.
+Calls with unknown inputs evaluate the function.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable
+from functools import update_wrapper
+from itertools import product
+from typing import Any
+
+from ._bits import Array, expect_array_size, lit2bv
+from ._codegen import cast_func, expect_inputs, known_inputs_source
+
+# Maximum total input size
+_TABULATE_MAX_SIZE = 16
+
+
+def _planes(size: int, n: int) -> array[int] | list[int]:
+    """Return a zero buffer with n items, each at least size bits."""
+    for tc in "BHILQ":
+        if 8 * array(tc).itemsize >= size:
+            return array(tc, bytes(array(tc).itemsize * n))
+    return [0] * n
+
+
+def _output(y: Any) -> list[Array]:
+    ys = list(y) if isinstance(y, tuple) else [y]
+    for i, x in enumerate(ys):
+        if isinstance(x, str):
+            ys[i] = lit2bv(x)
+        elif not isinstance(x, Array):
+            raise TypeError(f"Expected Array output, got {type(x).__name__}")
+    return ys
+
+
+def _source(inputs: tuple[type[Array], ...], outputs: list[type[Array]], tup: bool) -> str:
+    """Return source code for an unrolled table lookup.
+
+    Input sizes, masks, and shifts are constants.
+    """
+    lines: list[str] = []
+    params = ", ".join(f"x{i}" for i in range(len(inputs)))
+    lines.append(f"def f({params}):\n")
+    check, index = known_inputs_source(inputs, f"_fallback({params})")
+    lines.append(check)
+    lines.append(f"    i = {index}\n")
+    lines.append("    d0, d1 = _d0[i], _d1[i]\n")
+    ys: list[str] = []
+    offset = 0
+    for i, ot in enumerate(outputs):
+        if offset:
+            d0, d1 = f"(d0 >> {offset})", f"(d1 >> {offset})"
+        else:
+            d0, d1 = "d0", "d1"
+        if len(outputs) > 1:
+            d0, d1 = f"{d0} & {ot._dmax:#x}", f"{d1} & {ot._dmax:#x}"
+        ys.append(f"_cast{i}(_t{i}, {d0}, {d1})")
+        offset += ot.size
+    y = f"({''.join(f'{x}, ' for x in ys)})" if tup else ys[0]
+    lines.append(f"    return {y}\n")
+    return "".join(lines)
+
+
+def tabulate[F: Callable[..., Any]](fn: F, *inputs: type[Array]) -> F:
+    """Tabulate a small function over ``Array`` values into a lookup table.
+
+    Call ``fn`` once for every known input value,
+    and store the output data planes in two compact ``array`` buffers.
+    Later calls with known inputs are a table lookup.
+    Calls with any unknown (``X`` or ``-``) input bits call ``fn``,
+    so results are the same as calling ``fn`` directly.
+
+    The function must be pure,
+    and return an ``Array``, or a ``tuple`` of ``Array``,
+    with the same types for all known inputs.
+
+    For example:
+
+    >>> from bvwx import Array, encode_priority
+    >>> f = tabulate(encode_priority, Array[8])
+    >>> f("8b0010_0110")
+    (bits("3b101"), bits("1b1"))
+    >>> f("8b0010_01-0")
+    (bits("3b101"), bits("1b1"))
+    >>> f("8b0000_000X")
+    (bits("3bXXX"), bits("1bX"))
+
+    Args:
+        fn: Pure function over ``Array`` values.
+        inputs: Input ``Array`` types.
+                Total input size must be at most 16 bits.
+
+    Returns:
+        Function with the same positional parameters and results.
+        It raises ``TypeError`` if an input has the wrong size.
+
+    Raises:
+        TypeError: Output type is not ``Array``,
+                   or output types vary with input values.
+        ValueError: Total input size is too large.
+    """
+    size = sum(it.size for it in inputs)
+    if size > _TABULATE_MAX_SIZE:
+        s = f"Expected total input size ≤ {_TABULATE_MAX_SIZE}, got {size}"
+        raise ValueError(s)
+
+    # Inputs from LSB to MSB
+    outputs: list[type[Array]] = []
+    tup = False
+    d0s: array[int] | list[int] = []
+    d1s: array[int] | list[int] = []
+    for i, ds in enumerate(product(*[range(1 << it.size) for it in reversed(inputs)])):
+        xs = [it._cast_data(d1 ^ it._dmax, d1) for it, d1 in zip(inputs, reversed(ds))]
+        y = fn(*xs)
+        ys = _output(y)
+        if i == 0:
+            outputs = [type(x) for x in ys]
+            tup = isinstance(y, tuple)
+            n = sum(ot.size for ot in outputs)
+            d0s, d1s = _planes(n, 1 << size), _planes(n, 1 << size)
+        elif [type(x) for x in ys] != outputs or isinstance(y, tuple) != tup:
+            s = ", ".join(ot.__name__ for ot in outputs)
+            raise TypeError(f"Expected outputs ({s}), got {y}")
+        d0 = d1 = offset = 0
+        for x, ot in zip(ys, outputs):
+            d0 |= x._data[0] << offset
+            d1 |= x._data[1] << offset
+            offset += ot.size
+        d0s[i] = d0
+        d1s[i] = d1
+
+    def fallback(*xs: Any) -> Any:
+        # Cast inputs and outputs like the table
+        y = fn(*expect_inputs(xs, inputs))
+        ys = _output(y)
+        if len(ys) != len(outputs) or isinstance(y, tuple) != tup:
+            s = ", ".join(ot.__name__ for ot in outputs)
+            raise TypeError(f"Expected outputs ({s}), got {y}")
+        return tuple(ys) if tup else ys[0]
+
+    globals_: dict[str, Any] = {
+        "_d0": d0s,
+        "_d1": d1s,
+        "_fallback": fallback,
+        "_Array": Array,
+        "_arg": expect_array_size,
+    }
+    for i, ot in enumerate(outputs):
+        globals_[f"_t{i}"] = ot
+        globals_[f"_cast{i}"] = cast_func(ot)
+    locals_: dict[str, Any] = {}
+    exec(_source(inputs, outputs, tup), globals_, locals_)
+    f = locals_["f"]
+    update_wrapper(f, fn)
+    return f
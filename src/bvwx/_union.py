@@ -63,11 +63,17 @@ class UnionType(type):
         ns: dict[str, Any] = {"__slots__": ()}
         cls = super().__new__(mcls, name, (V,), ns)
 
+        # Field types, in declaration order
+        types = tuple(dict.fromkeys(ft for _, ft in fields))
+
         def _init(self, arg: ArrayLike):
+            # Fast path: exact field type
+            if isinstance(arg, Array) and arg.__class__ in types:
+                self._data = arg._data
+                return
             x = expect_array(arg)
-            ts = {ft for _, ft in fields}
-            if not isinstance(x, tuple(ts)):
-                s = ", ".join(t.__name__ for t in ts)
+            if not isinstance(x, types):
+                s = ", ".join(t.__name__ for t in types)
                 s = f"Expected arg to be {{{s}}}, or str literal"
                 raise TypeError(s)
             self._data = x._data
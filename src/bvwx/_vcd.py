@@ -0,0 +1,280 @@
+"""Value Change Dump (VCD) Writer
+
+Stream value changes to a VCD file.
+Values are formatted with ``Array.vcd_var`` and ``Array.vcd_val``,
+so ``Enum`` signals dump as ``string`` variables.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from types import TracebackType
+from typing import TextIO
+
+from ._bits import Array, ArrayLike, expect_array_size
+
+# Identifier code chars: printable ASCII, except space
+_ID_FIRST = 33
+_ID_BASE = 127 - _ID_FIRST
+
+# Default output buffer size, in chars
+_FLUSH_SIZE = 1 << 16
+
+
+def _id_code(i: int) -> str:
+    """Return a short, unique identifier code for variable i."""
+    cs = [chr(_ID_FIRST + i % _ID_BASE)]
+    i //= _ID_BASE
+    while i:
+        i -= 1
+        cs.append(chr(_ID_FIRST + i % _ID_BASE))
+        i //= _ID_BASE
+    return "".join(cs)
+
+
+class VCDVar:
+    """Handle to a VCD variable, returned by ``VCDWriter.register``."""
+
+    __slots__ = ("_scope", "_name", "_t", "_var", "_code", "_value")
+
+    def __init__(self, scope: str, name: str, init: Array, code: str):
+        self._scope = scope
+        self._name = name
+        self._t = type(init)
+        self._var = init.vcd_var()
+        self._code = code
+        self._value = init
+
+    def __repr__(self) -> str:
+        return f"VCDVar({self._scope!r}, {self._name!r}, {self._code!r})"
+
+    @property
+    def name(self) -> str:
+        """Variable name."""
+        return self._name
+
+    @property
+    def value(self) -> Array:
+        """Most recent value."""
+        return self._value
+
+    def _change(self, value: Array) -> str:
+        if self._var == "string":
+            return f"s{value.vcd_val()} {self._code}\n"
+        if value.size == 1:
+            return f"{value.vcd_val()}{self._code}\n"
+        return f"b{value.vcd_val()} {self._code}\n"
+
+
+class VCDWriter:
+    """Streaming VCD writer with buffered, change-only output.
+
+    Register variables, then report value changes in non-decreasing time order.
+    Changes that do not modify a variable's value are dropped,
+    and a timestamp is written only when at least one value changes.
+    Output accumulates in a buffer,
+    which is written to the file when it reaches ``flush_size`` chars.
+
+    For example:
+
+    >>> import io
+    >>> from bvwx import bits
+    >>> f = io.StringIO()
+    >>> with VCDWriter(f, date=None, version=None) as vcd:
+    ...     a = vcd.register("top", "a", bits("4b0000"))
+    ...     vcd.change(a, 10, "4b1X01")
+    ...     vcd.change(a, 20, "4b1X01")
+    >>> print(f.getvalue(), end="")
+    $timescale 1ns $end
+    $scope module top $end
+    $var logic 4 ! a $end
+    $upscope $end
+    $enddefinitions $end
+    #0
+    $dumpvars
+    b0000 !
+    $end
+    #10
+    b1x01 !
+
+    Args:
+        f: File path, or text file object.
+        timescale: Time unit, for example ``"1ns"`` or ``"10ps"``.
+        flush_size: Buffer size, in chars.
+        date: ``$date`` text, or ``None`` to omit. Defaults to now.
+        version: ``$version`` text, or ``None`` to omit.
+
+    Raises:
+        ValueError: ``flush_size`` is negative.
+    """
+
+    def __init__(
+        self,
+        f: str | os.PathLike[str] | TextIO,
+        timescale: str = "1ns",
+        flush_size: int = _FLUSH_SIZE,
+        date: str | None = "",
+        version: str | None = "bvwx",
+    ):
+        if flush_size < 0:
+            raise ValueError(f"Expected flush_size ≥ 0, got {flush_size}")
+
+        if isinstance(f, (str, os.PathLike)):
+            self._f: TextIO = open(f, "w", encoding="ascii")
+            self._owner = True
+        else:
+            self._f = f
+            self._owner = False
+
+        self._timescale = timescale
+        self._flush_size = flush_size
+        self._date = datetime.now().ctime() if date == "" else date
+        self._version = version
+
+        self._vars: list[VCDVar] = []
+        self._started = False
+        self._closed = False
+        self._time = 0
+        self._time_written = True
+
+        self._buf: list[str] = []
+        self._buf_size = 0
+
+    def __enter__(self) -> VCDWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ):
+        self.close()
+
+    @property
+    def time(self) -> int:
+        """Most recent time."""
+        return self._time
+
+    def register(self, scope: str, name: str, init: Array) -> VCDVar:
+        """Register a variable.
+
+        Args:
+            scope: Dot-separated scope path, for example ``"top.cpu"``.
+            name: Variable name.
+            init: Initial value, dumped at time zero.
+
+        Returns:
+            Variable handle.
+
+        Raises:
+            TypeError: ``init`` is not an ``Array``.
+            ValueError: Output has already started.
+        """
+        if not isinstance(init, Array):
+            raise TypeError(f"Expected init to be Array, got {type(init).__name__}")
+        if self._started:
+            raise ValueError("Cannot register variable after output has started")
+        v = VCDVar(scope, name, init, _id_code(len(self._vars)))
+        self._vars.append(v)
+        return v
+
+    def change(self, var: VCDVar, time: int, value: ArrayLike):
+        """Report a variable value at a time.
+
+        Args:
+            var: Variable handle, returned by ``register``.
+            time: Simulation time, in timescale units.
+            value: New value, with the same size as the variable.
+
+        Raises:
+            TypeError: ``value`` has the wrong size.
+            ValueError: ``time`` is less than the previous time,
+                        or the writer is closed.
+        """
+        if not self._started:
+            self._start()
+        elif self._closed:
+            raise ValueError("VCDWriter is closed")
+
+        if time != self._time:
+            if time < self._time:
+                raise ValueError(f"Expected time ≥ {self._time}, got {time}")
+            self._time = time
+            self._time_written = False
+
+        x = expect_array_size(value, var._value.size)
+        if x._data == var._value._data:
+            return
+        if type(x) is not var._t:
+            x = var._t._cast_data(x._data[0], x._data[1])
+        var._value = x
+
+        if not self._time_written:
+            self._write(f"#{time}\n")
+            self._time_written = True
+        self._write(var._change(x))
+
+    def flush(self):
+        """Write buffered output to the file."""
+        if self._buf:
+            self._f.write("".join(self._buf))
+            self._buf.clear()
+            self._buf_size = 0
+        self._f.flush()
+
+    def close(self):
+        """Flush output, and close the file if the writer opened it."""
+        if self._closed:
+            return
+        if not self._started:
+            self._start()
+        self.flush()
+        if self._owner:
+            self._f.close()
+        self._closed = True
+
+    def _write(self, s: str):
+        self._buf.append(s)
+        self._buf_size += len(s)
+        if self._buf_size >= self._flush_size:
+            self.flush()
+
+    def _start(self):
+        self._started = True
+
+        if self._date is not None:
+            self._write(f"$date {self._date} $end\n")
+        if self._version is not None:
+            self._write(f"$version {self._version} $end\n")
+        self._write(f"$timescale {self._timescale} $end\n")
+
+        # Nested scopes
+        scopes: dict[tuple[str, ...], list[VCDVar]] = {}
+        for v in self._vars:
+            path = tuple(v._scope.split(".")) if v._scope else ()
+            scopes.setdefault(path, []).append(v)
+
+        stack: tuple[str, ...] = ()
+        for path, vs in sorted(scopes.items()):
+            n = 0
+            while n < min(len(stack), len(path)) and stack[n] == path[n]:
+                n += 1
+            for _ in range(len(stack) - n):
+                self._write("$upscope $end\n")
+            for name in path[n:]:
+                self._write(f"$scope module {name} $end\n")
+            stack = path
+            for v in vs:
+                size = 1 if v._var == "string" else v._value.size
+                self._write(f"$var {v._var} {size} {v._code} {v._name} $end\n")
+        for _ in stack:
+            self._write("$upscope $end\n")
+        self._write("$enddefinitions $end\n")
+
+        # Initial values
+        self._write("#0\n$dumpvars\n")
+        for v in self._vars:
+            self._write(v._change(v._value))
+        self._write("$end\n")
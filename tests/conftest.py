@@ -0,0 +1,11 @@
+"""Pytest configuration."""
+
+import random
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _seed(request: pytest.FixtureRequest):
+    """Seed fuzz tests, so every failure reproduces."""
+    random.seed(request.node.nodeid)
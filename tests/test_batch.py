@@ -0,0 +1,318 @@
+"""Test bvwx ArrayBatch."""
+
+import pytest
+
+from bvwx import (
+    Array,
+    ArrayBatch,
+    Enum,
+    adc,
+    add,
+    batch,
+    bits,
+    div,
+    eq,
+    ge,
+    gt,
+    impl,
+    ite,
+    le,
+    lsh,
+    lt,
+    match,
+    matmul,
+    mod,
+    mul,
+    mux,
+    ne,
+    neg,
+    ngc,
+    rsh,
+    sbc,
+    sge,
+    sgt,
+    sle,
+    slt,
+    srsh,
+    sub,
+    uand,
+    uor,
+    uxor,
+)
+
+from .util import rand4s
+
+N = 200
+
+
+def test_basic():
+    xs = ["4b0001", "4b0010", "4bX-10"]
+    x = batch(xs)
+    assert len(x) == 3
+    assert x.size == 4
+    assert x.type is Array[4].__origin__
+    assert x[0] == "4b0001"
+    assert x[-1] == "4bX-10"
+    assert x.to_arrays() == [bits(s) for s in xs]
+    assert list(x) == [bits(s) for s in xs]
+    assert x == batch(xs)
+    assert x != batch(xs[:2])
+    assert hash(x) == hash(batch(xs))
+    assert repr(x) == "ArrayBatch(Vector[4], 3)"
+
+    with pytest.raises(IndexError):
+        _ = x[3]
+    with pytest.raises(ValueError):
+        batch([])
+    with pytest.raises(TypeError):
+        batch(["4b0000", "3b000"])
+    with pytest.raises(TypeError):
+        batch([bits()])
+
+    r = ArrayBatch.rand(Array[8], 10)
+    assert len(r) == 10
+    assert not any(y.has_xw() for y in r)
+
+
+def test_type():
+    class Color(Enum):
+        RED = "2b00"
+        GREEN = "2b01"
+        BLUE = "2b10"
+
+    x = batch([Color.RED, Color.GREEN])
+    assert x.type is Color
+    assert (~x).to_arrays() == [Color("2b11"), Color.BLUE]
+    assert (~x)[1] is Color.BLUE
+
+    # Downgrade Enum to Vector
+    y = batch([Color.RED, "2b01"])
+    assert y.type is Array[2].__origin__
+
+
+def test_bitwise():
+    for size in (1, 3, 8, 17):
+        xs0 = rand4s(size, N)
+        xs1 = rand4s(size, N)
+        b0, b1 = batch(xs0), batch(xs1)
+        assert (~b0).to_arrays() == [~x for x in xs0]
+        assert (b0 | b1).to_arrays() == [x0 | x1 for x0, x1 in zip(xs0, xs1)]
+        assert (b0 & b1).to_arrays() == [x0 & x1 for x0, x1 in zip(xs0, xs1)]
+        assert (b0 ^ b1).to_arrays() == [x0 ^ x1 for x0, x1 in zip(xs0, xs1)]
+        assert b0.impl(b1).to_arrays() == [impl(x0, x1) for x0, x1 in zip(xs0, xs1)]
+
+        # Broadcast
+        c = xs1[0]
+        assert (b0 | c).to_arrays() == [x0 | c for x0 in xs0]
+        assert (b0 ^ c).to_arrays() == [x0 ^ c for x0 in xs0]
+        lit = str(c)
+        assert (lit & b0).to_arrays() == [lit & x0 for x0 in xs0]
+
+
+def test_ite_mux():
+    for size in (1, 5, 16):
+        ss = rand4s(1, N)
+        xs0 = rand4s(size, N)
+        xs1 = rand4s(size, N)
+        s, b0, b1 = batch(ss), batch(xs0), batch(xs1)
+        y = s.ite(b1, b0)
+        assert y.to_arrays() == [ite(*args) for args in zip(ss, xs1, xs0)]
+        y = s.ite(xs1[0], b0)
+        assert y.to_arrays() == [ite(s, xs1[0], x0) for s, x0 in zip(ss, xs0)]
+
+        ss = rand4s(2, N)
+        xs2 = rand4s(size, N)
+        s, b2 = batch(ss), batch(xs2)
+        y = s.mux(x0=b0, x1=b1, x2=b2)
+        assert y.to_arrays() == [
+            mux(s, x0=x0, x1=x1, x2=x2) for s, x0, x1, x2 in zip(ss, xs0, xs1, xs2)
+        ]
+
+    with pytest.raises(TypeError):
+        batch(["2b00"]).ite("1b0", "1b1")
+    s = batch(["1b0"])
+    with pytest.raises(ValueError):
+        s.mux(x2="4b0000")
+    with pytest.raises(ValueError):
+        s.mux(y0="4b0000")
+    with pytest.raises(ValueError):
+        s.mux()
+
+
+def test_unary():
+    for size in (1, 2, 7, 32):
+        xs = rand4s(size, N)
+        b = batch(xs)
+        assert b.uor().to_arrays() == [uor(x) for x in xs]
+        assert b.uand().to_arrays() == [uand(x) for x in xs]
+        assert b.uxor().to_arrays() == [uxor(x) for x in xs]
+
+
+PREDICATES = [
+    ("eq", eq),
+    ("ne", ne),
+    ("lt", lt),
+    ("le", le),
+    ("gt", gt),
+    ("ge", ge),
+    ("slt", slt),
+    ("sle", sle),
+    ("sgt", sgt),
+    ("sge", sge),
+    ("match", match),
+]
+
+
+def test_predicate():
+    for size in (1, 3, 8):
+        xs0 = rand4s(size, N)
+        xs1 = rand4s(size, N)
+        # Force some equal values
+        xs1[::4] = xs0[::4]
+        b0, b1 = batch(xs0), batch(xs1)
+        for name, f in PREDICATES:
+            y = getattr(b0, name)(b1)
+            assert y.to_arrays() == [f(x0, x1) for x0, x1 in zip(xs0, xs1)], name
+
+    with pytest.raises(ValueError):
+        batch(["2b00"]).eq(batch(["2b00", "2b01"]))
+    with pytest.raises(TypeError):
+        batch(["2b00"]).eq(batch(["3b000"]))
+
+
+def test_arithmetic():
+    for size in (1, 4, 13):
+        xs0 = rand4s(size, N)
+        xs1 = rand4s(size, N)
+        cis = rand4s(1, N)
+        b0, b1, ci = batch(xs0), batch(xs1), batch(cis)
+        assert b0.add(b1).to_arrays() == [add(x0, x1) for x0, x1 in zip(xs0, xs1)]
+        assert b0.add(b1, ci).to_arrays() == [add(*args) for args in zip(xs0, xs1, cis)]
+        assert b0.adc(b1, ci).to_arrays() == [adc(*args) for args in zip(xs0, xs1, cis)]
+        assert b0.sub(b1).to_arrays() == [sub(x0, x1) for x0, x1 in zip(xs0, xs1)]
+        assert b0.sbc(b1).to_arrays() == [sbc(x0, x1) for x0, x1 in zip(xs0, xs1)]
+        assert b0.neg().to_arrays() == [neg(x) for x in xs0]
+        assert b0.ngc().to_arrays() == [ngc(x) for x in xs0]
+        assert (b0 + b1).to_arrays() == [x0 + x1 for x0, x1 in zip(xs0, xs1)]
+        assert (b0 - b1).to_arrays() == [x0 - x1 for x0, x1 in zip(xs0, xs1)]
+        assert (-b0).to_arrays() == [-x for x in xs0]
+
+    # Unequal sizes
+    xs0, xs1 = rand4s(5, N), rand4s(3, N)
+    b0, b1 = batch(xs0), batch(xs1)
+    assert (b0 + b1).to_arrays() == [x0 + x1 for x0, x1 in zip(xs0, xs1)]
+    assert (b1 + b0).to_arrays() == [x1 + x0 for x0, x1 in zip(xs0, xs1)]
+    assert ("2b11" + b1).to_arrays() == ["2b11" + x for x in xs1]
+    assert (xs0[0] + b1).to_arrays() == [xs0[0] + x for x in xs1]
+    assert (xs1[0] - b1).to_arrays() == [xs1[0] - x for x in xs1]
+    assert (xs1[0] & b1).to_arrays() == [xs1[0] & x for x in xs1]
+    xs = rand4s(1, N)
+    assert (1 - batch(xs)).to_arrays() == [1 - x for x in xs]
+
+
+def test_mul_div():
+    for size0, size1 in ((1, 1), (4, 4), (8, 3)):
+        xs0 = rand4s(size0, N)
+        # Known divisors must be nonzero
+        xs1 = [x if x.has_unknown() or x.to_uint() else ~x for x in rand4s(size1, N)]
+        b0, b1 = batch(xs0), batch(xs1)
+        assert b0.mul(b1).to_arrays() == [mul(x0, x1) for x0, x1 in zip(xs0, xs1)]
+        assert (b1 * b0).to_arrays() == [x1 * x0 for x0, x1 in zip(xs0, xs1)]
+        assert b0.div(b1).to_arrays() == [div(x0, x1) for x0, x1 in zip(xs0, xs1)]
+        assert (b0 // b1).to_arrays() == [x0 // x1 for x0, x1 in zip(xs0, xs1)]
+        assert b0.mod(b1).to_arrays() == [mod(x0, x1) for x0, x1 in zip(xs0, xs1)]
+        assert (b0 % b1).to_arrays() == [x0 % x1 for x0, x1 in zip(xs0, xs1)]
+        # Array left operand
+        y = xs0[0]
+        assert (y * b1).to_arrays() == [y * x1 for x1 in xs1]
+        assert (y // b1).to_arrays() == [y // x1 for x1 in xs1]
+        assert (y % b1).to_arrays() == [y % x1 for x1 in xs1]
+
+    b = batch(["4b1001", "4b0110"])
+    assert (b * "2b11").to_arrays() == [bits("6b01_1011"), bits("6b01_0010")]
+    assert ("8d100" // b).to_arrays() == [bits("8d11"), bits("8d16")]
+    assert (bits("8d100") % b).to_arrays() == [bits("4d1"), bits("4d4")]
+    assert (b // batch(["2b0X", "2b-0"])).to_arrays() == [Array[4].xs(), Array[4].ws()]
+    assert (b % batch(["2b-1", "2b1X"])).to_arrays() == [Array[2].ws(), Array[2].xs()]
+    with pytest.raises(ZeroDivisionError):
+        b // batch(["2b00", "2b01"])
+    with pytest.raises(ValueError):
+        batch(["2b00"]) // batch(["3b001"])
+
+
+def test_matmul():
+    for shape0, shape1 in (((3,), (3,)), ((3,), (3, 2)), ((2, 3), (3,)), ((2, 3), (3, 4))):
+        xs0 = [x.reshape(shape0) for x in rand4s(Array[shape0].size, N)]
+        xs1 = [x.reshape(shape1) for x in rand4s(Array[shape1].size, N)]
+        b0, b1 = batch(xs0), batch(xs1)
+        assert b0.matmul(b1).to_arrays() == [matmul(x0, x1) for x0, x1 in zip(xs0, xs1)]
+        assert (b0 @ b1).to_arrays() == [x0 @ x1 for x0, x1 in zip(xs0, xs1)]
+        assert (b0 @ xs1[0]).to_arrays() == [x0 @ xs1[0] for x0 in xs0]
+        assert (xs0[0] @ b1).to_arrays() == [xs0[0] @ x1 for x1 in xs1]
+
+
+def test_shift():
+    xs = rand4s(8, N)
+    b = batch(xs)
+    for n in range(9):
+        assert b.lsh(n).to_arrays() == [lsh(x, n) for x in xs]
+        assert (b << n).to_arrays() == [lsh(x, n) for x in xs]
+        assert b.rsh(n).to_arrays() == [rsh(x, n) for x in xs]
+        assert (b >> n).to_arrays() == [rsh(x, n) for x in xs]
+        assert b.srsh(n).to_arrays() == [srsh(x, n) for x in xs]
+
+    assert b.lsh("2bX1").to_arrays() == [Array[8].xs()] * N
+    assert b.rsh("2b-1").to_arrays() == [Array[8].ws()] * N
+    with pytest.raises(ValueError):
+        b.lsh(9)
+
+
+def test_transpose():
+    for size in (1, 3, 8):
+        xs = rand4s(size, N)
+        b = batch(xs)
+        slices = b.transpose()
+        assert len(slices) == size
+        for i, s in enumerate(slices):
+            assert s.size == 1
+            assert s.to_arrays() == [x[i] for x in xs]
+        assert ArrayBatch.from_slices(slices) == b
+        assert ArrayBatch.from_slices(slices, b.type).to_arrays() == xs
+
+    assert ArrayBatch(Array[4], 0, 0, 0).transpose() == [ArrayBatch(Array[1], 0, 0, 0)] * 4
+
+    with pytest.raises(ValueError):
+        ArrayBatch.from_slices([])
+    with pytest.raises(TypeError):
+        ArrayBatch.from_slices([batch(["1b0"])], Array[2])
+    with pytest.raises(TypeError):
+        ArrayBatch.from_slices([batch(["2b00"])])
+    with pytest.raises(ValueError):
+        ArrayBatch.from_slices([batch(["1b0"]), batch(["1b0", "1b1"])])
+
+
+def test_bitsliced():
+    """Bit-sliced gates agree with the equivalent vector operators."""
+    ss = rand4s(2, N)
+    xs0 = rand4s(4, N)
+    xs1 = rand4s(4, N)
+    xs2 = rand4s(4, N)
+    s = batch(ss).transpose()
+    x0 = batch(xs0).transpose()
+    x1 = batch(xs1).transpose()
+    x2 = batch(xs2).transpose()
+
+    # ITE: one lifted op per bit
+    y = ArrayBatch.from_slices([s[0].ite(a, b) for a, b in zip(x1, x0)])
+    assert y.to_arrays() == [ite(s[0], a, b) for s, a, b in zip(ss, xs1, xs0)]
+
+    # MUX: select bits are scalar batches
+    sel = ArrayBatch.from_slices(s)
+    y = ArrayBatch.from_slices([sel.mux(x0=a, x1=b, x2=c) for a, b, c in zip(x0, x1, x2)])
+    assert y.to_arrays() == [mux(s, x0=a, x1=b, x2=c) for s, a, b, c in zip(ss, xs0, xs1, xs2)]
+
+    # MATCH: AND of per-bit matches
+    y = x0[0].match(x1[0])
+    for a, b in zip(x0[1:], x1[1:]):
+        y &= a.match(b)
+    assert y.to_arrays() == [match(a, b) for a, b in zip(xs0, xs1)]
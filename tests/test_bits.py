@@ -1,5 +1,6 @@
 """Test Bits methods."""
 
+import random
 from typing import get_origin
 
 import pytest
@@ -92,6 +93,15 @@ def test_hash():
     s.add(u2bv(0))
     assert len(s) == 4
 
+    # Equal values of different types
+    x = bits(["4b0011", "4b1100"])
+    y = cast(Array[8], x)
+    assert x == y and hash(x) == hash(y)
+    assert y == "8b1100_0011"
+    # All X values of different sizes
+    assert bits("4bXXXX") != bits("8bXXXX_XXXX")
+    assert len({bits("4bXXXX"), bits("8bXXXX_XXXX")}) == 2
+
 
 class MyStruct(Struct):
     a: Array[8]
@@ -180,6 +190,73 @@ def test_str():
     assert str(X5) == X5_STR
 
 
+def test_str_round_trip():
+    chars = "X01-"
+    for n in range(1, 70):
+        for _ in range(10):
+            s = "".join(random.choice(chars) for _ in range(n))
+            x = bits(f"{n}b{s}")
+            assert str(x).replace("_", "") == f"{n}b{s}"
+            assert x.vcd_val() == s.replace("X", "x").replace("-", "x")
+            assert bits(str(x)) == x
+    assert str(bits("9b1_0000_1111")) == "9b1_0000_1111"
+    assert str(bits("9b1_0000_X111")) == "9b1_0000_X111"
+
+
+def _hex_digit(s: str) -> str:
+    if set(s) == {"X"}:
+        return "X"
+    if set(s) == {"-"}:
+        return "-"
+    if set(s) <= {"0", "1"}:
+        return f"{int(s, 2):X}"
+    return "?"
+
+
+def test_to_hex():
+    chars = "X01-"
+    for n in range(1, 40):
+        for _ in range(20):
+            s = "".join(random.choice(chars) for _ in range(n))
+            # Pad the most significant digit
+            t = s[: n % 4] if n % 4 else ""
+            p = ({"X": "X", "-": "-"}.get(t[0], "0") * (4 - n % 4) + t) if t else ""
+            ds = [_hex_digit(p)] if t else []
+            ds += [_hex_digit(s[i : i + 4]) for i in range(n % 4, n, 4)]
+            x = bits(f"{n}b{s}")
+            assert x.to_hex() == f"{n}h" + "".join(ds)
+
+    # Round trip, including sizes that are not a multiple of four
+    for n in range(1, 40):
+        for _ in range(20):
+            # Each digit is all X, all -, or known
+            widths = [n % 4] if n % 4 else []
+            widths += [4] * (n // 4)
+            s = "".join(
+                random.choice(["X" * w, "-" * w, format(random.getrandbits(w), f"0{w}b")])
+                for w in widths
+            )
+            x = bits(f"{n}b{s}")
+            assert bits(x.to_hex()) == x
+    assert bits("3bXXX").to_hex() == "3hX"
+    assert bits("3hX") == "3bXXX"
+    assert bits(bits("5b-_0001").to_hex()) == "5b-_0001"
+
+    x = bits("16hbeef")
+    assert bits(x.to_hex()) == x
+    x = bits("16b1010_XXXX_----_0101")
+    assert x.to_hex() == "16hAX-5"
+    assert bits(x.to_hex()) == x
+    assert bits([]).to_hex() == "0h"
+
+    assert f"{x}" == str(x)
+    assert f"{x:b}" == "16b1010_XXXX_----_0101"
+    assert f"{x:h}" == "16hAX-5"
+    assert format(bits(["2b01", "2b10"]), "b") == "4b1001"
+    with pytest.raises(ValueError):
+        format(x, "d")
+
+
 def test_vec_getitem():
     assert X1[0] == "1b0"
 
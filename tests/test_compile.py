@@ -0,0 +1,193 @@
+"""Test bvwx compile decorator."""
+
+import pytest
+
+import bvwx
+from bvwx import (
+    Array,
+    Enum,
+    adc,
+    add,
+    and_,
+    cat,
+    compile_fn,
+    eq,
+    ge,
+    impl,
+    ite,
+    lsh,
+    lt,
+    match,
+    mux,
+    ne,
+    neg,
+    ngc,
+    not_,
+    or_,
+    rep,
+    rsh,
+    sbc,
+    sgt,
+    sle,
+    sub,
+    uand,
+    uor,
+    uxor,
+    xor,
+)
+
+from .util import rand4
+
+N = 200
+
+
+def _check(f, *sizes: int):
+    g = compile_fn(f)
+    for _ in range(N):
+        args = [rand4(size) for size in sizes]
+        assert g(*args) == f(*args), args
+
+
+def f_bitwise(a: Array[8], b: Array[8], c: Array[8]):
+    return (
+        ~a,
+        a | b,
+        a & "8b1100_XX-0",
+        a ^ b ^ c,
+        not_(a),
+        or_(a, b, c),
+        and_(a, b, c),
+        xor(a, b),
+        impl(a, b),
+    )
+
+
+def f_ite(s: Array[1], a: Array[8], b: Array[8]):
+    return ite(s, a, b), ite("1b1", a, b), bvwx.ite(s, b, 0)
+
+
+def f_mux(s: Array[2], a: Array[4], b: Array[4], c: Array[4]):
+    return mux(s, x0=a, x1=b, x2=c), mux(s, x3="4b1010"), mux(s[0], x0=a, x1=c)
+
+
+def f_arith(a: Array[6], b: Array[6], ci: Array[1]):
+    return (
+        add(a, b),
+        add(a, b, ci),
+        adc(a, b, ci),
+        sub(a, b),
+        sbc(a, b),
+        neg(a),
+        ngc(a),
+        a + b,
+        a - b,
+        -a,
+        add(a, "6b0000_01"),
+        add(a, b[:3]),
+    )
+
+
+def f_word(a: Array[8], b: Array[4]):
+    return (
+        a[0],
+        a[-1],
+        a[2:6],
+        cat(a[:4], b, "2b01", 1),
+        rep(b, 3),
+        lsh(a, 3),
+        rsh(a, 5),
+        a << 2,
+        a >> "2b11",
+    )
+
+
+def f_unary(a: Array[7]):
+    return uor(a), uand(a), uxor(a)
+
+
+def f_predicate(a: Array[5], b: Array[5]):
+    return eq(a, b), ne(a, b), lt(a, b), ge(a, b), sgt(a, b), sle(a, b), match(a, b)
+
+
+def test_ops():
+    _check(f_bitwise, 8, 8, 8)
+    _check(f_ite, 1, 8, 8)
+    _check(f_mux, 2, 4, 4, 4)
+    _check(f_arith, 6, 6, 1)
+    _check(f_word, 8, 4)
+    _check(f_unary, 7)
+    _check(f_predicate, 5, 5)
+
+
+def test_const():
+    @compile_fn
+    def f(a: Array[4]):
+        return add("4b0001", "4b0010"), add(a, "4bXXXX"), uor("4b0100"), None
+
+    assert f("4b0000") == (bvwx.bits("4b0011"), bvwx.bits("4bXXXX"), bvwx.bits("1b1"), None)
+
+
+class Color(Enum):
+    RED = "2b00"
+    GREEN = "2b01"
+    BLUE = "2b10"
+
+
+def test_types():
+    @compile_fn
+    def f(a: Color, b: Color):
+        return ~a, a & b, a & "2b10"
+
+    y0, y1, y2 = f(Color.GREEN, Color.BLUE)
+    assert y0 is Color.BLUE
+    assert y1 is Color.RED
+    assert type(y2) is Vector2
+
+    @compile_fn
+    def g(a: Array[2, 4]):
+        return a[1], a[0:1], a[1:]
+
+    x = bvwx.bits(["4b0001", "4b0010"])
+    assert g(x) == (x[1], x[0:1], x[1:])
+
+
+Vector2 = type(bvwx.bits("2b00"))
+
+
+def test_errors():
+    # Missing annotation
+    def f(a):
+        return a
+
+    with pytest.raises(TypeError):
+        compile_fn(f)
+
+    # Invalid annotation
+    def g(a: int):
+        return a
+
+    with pytest.raises(TypeError):
+        compile_fn(g)
+
+    # Branch on traced value
+    def h(a: Array[1]):
+        return a if a else ~a
+
+    with pytest.raises(TypeError):
+        compile_fn(h)
+
+    # Unsupported operator
+    def k(a: Array[4], b: Array[4]):
+        return bvwx.mul(a, b)
+
+    with pytest.raises(TypeError):
+        compile_fn(k)
+
+    # Input size
+    @compile_fn
+    def m(a: Array[4]):
+        return a
+
+    with pytest.raises(TypeError):
+        m("3b000")
+    assert m("4b1010") == "4b1010"
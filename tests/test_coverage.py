@@ -0,0 +1,141 @@
+"""Test bvwx functional coverage."""
+
+import random
+
+import pytest
+
+from bvwx import Array, Covergroup, Enum, Struct, bits, match, u2bv
+
+
+class Op(Enum):
+    ADD = "2b00"
+    SUB = "2b01"
+    AND = "2b10"
+
+
+class Insn(Struct):
+    op: Op
+    imm: Array[8]
+
+
+def test_bins():
+    cg = Covergroup()
+    bins = {
+        "zero": 0,
+        "one": bits("8h01"),
+        "small": range(1, 16),
+        "neg": "8b1-------",
+        "odd_neg": ["8b1------1"],
+        "edges": [0, "8hff", range(0x7E, 0x80)],
+    }
+    p = cg.coverpoint("imm", Array[8], bins)
+    assert p.bins == list(bins)
+
+    # Compare with a linear match over each bin
+    def ref(x) -> tuple[int, ...]:
+        hits = []
+        for i, spec in enumerate(bins.values()):
+            specs = spec if isinstance(spec, list) else [spec]
+            for s in specs:
+                if isinstance(s, range):
+                    hit = x.to_uint() in s
+                else:
+                    hit = bool(match(x, s))
+                if hit:
+                    hits.append(i)
+                    break
+        return tuple(hits)
+
+    expected = [0] * len(bins)
+    for _ in range(500):
+        x = u2bv(random.getrandbits(8), 8)
+        hits = p.sample(x)
+        assert hits == ref(x)
+        for i in hits:
+            expected[i] += 1
+    assert list(p.counts.values()) == expected
+
+    # Unknown values hit no bins
+    assert p.sample("8b0000_000X") == ()
+    assert p.sample("8b1---_----") == ()
+    assert p.unknown == 2
+
+    p.reset()
+    assert set(p.counts.values()) == {0}
+    assert p.unknown == 0
+    assert p.coverage == 0.0
+
+
+def test_auto_bins():
+    cg = Covergroup()
+    op = cg.coverpoint("op", Op)
+    assert op.bins == ["ADD", "SUB", "AND"]
+    a = cg.coverpoint("a", Array[2])
+    assert a.bins == ["2b00", "2b01", "2b10", "2b11"]
+
+    cg.sample(op=Op.SUB, a=3)
+    cg.sample(op="2b01", a="2b10")
+    assert op.counts == {"ADD": 0, "SUB": 2, "AND": 0}
+    assert a.counts == {"2b00": 0, "2b01": 0, "2b10": 1, "2b11": 1}
+    assert op.coverage == 1 / 3
+    assert a.coverage == 1 / 2
+
+    with pytest.raises(ValueError):
+        cg.coverpoint("b", Array[9])
+    with pytest.raises(ValueError):
+        cg.coverpoint("c", Insn)
+
+
+def test_cross():
+    cg = Covergroup()
+    op = cg.coverpoint("op", Op)
+    imm = cg.coverpoint("imm", Array[8], {"lo": range(0, 128), "hi": "8b1-------", "ff": "8hff"})
+    c = cg.cross("op_imm", op, imm)
+    assert len(c.bins) == 9
+
+    cg.sample(Insn(op=Op.ADD, imm="8h05"))
+    cg.sample(Insn(op=Op.AND, imm="8hff"))
+    cg.sample(Insn(op=Op.AND, imm="8bXXXX_0000"))
+    counts = c.counts
+    assert counts["ADD", "lo"] == 1
+    assert counts["AND", "hi"] == 1
+    assert counts["AND", "ff"] == 1
+    assert sum(counts.values()) == 3
+    assert c.coverage == 3 / 9
+    assert cg["op_imm"] is c
+    assert cg["op"] is op
+
+    assert cg.coverage == (2 / 3 + 3 / 3 + 3 / 9) / 3
+    text = cg.report()
+    assert "op_imm: 33.3%" in text
+    assert "  AND, ff: 1" in text
+
+    cg.reset()
+    assert cg.coverage == 0.0
+
+
+def test_errors():
+    cg = Covergroup()
+    a = cg.coverpoint("a", Array[4], {"x": 1})
+    with pytest.raises(ValueError):
+        cg.coverpoint("a", Array[4], {"x": 1})
+    with pytest.raises(ValueError):
+        cg.cross("c", a)
+    other = Covergroup().coverpoint("b", Array[4], {"x": 1})
+    with pytest.raises(ValueError):
+        cg.cross("c", a, other)
+
+    with pytest.raises(ValueError):
+        cg.coverpoint("b", Array[4], {"x": "4b000X"})
+    with pytest.raises(ValueError):
+        cg.coverpoint("b", Array[4], {"x": range(0, 17)})
+    with pytest.raises(ValueError):
+        cg.coverpoint("b", Array[4], {"x": range(0, 16, 2)})
+    with pytest.raises(TypeError):
+        cg.coverpoint("b", Array[4], {"x": "3b000"})
+
+    with pytest.raises(TypeError):
+        a.sample("3b000")
+    with pytest.raises(KeyError):
+        cg.sample(b=0)
+    assert Covergroup().coverage == 1.0
@@ -2,7 +2,7 @@
 
 import pytest
 
-from bvwx import Enum
+from bvwx import Array, Enum, bits, ite, mux, u2bv
 from bvwx._bits import vec_obj
 
 
@@ -69,6 +69,94 @@ def test_typing():
     assert (Color.BLUE >> 1) is Color.GREEN
 
 
+class Wide(Enum):
+    A = "9h000"
+    B = "9h1FE"
+
+
+class Dense(Enum):
+    A = "8h00"
+    B = "8hFE"
+
+
+def test_cast_data():
+    assert Color._dense is not None and len(Color._dense) == 4
+    assert Color._dense[3] is None
+    assert Color._cast_data(0b10, 0b01) is Color.GREEN
+    assert Color._cast_data(0b00, 0b00) is Color.X
+    assert Color._cast_data(0b11, 0b11) is Color.W
+    assert Color._cast_data(0b00, 0b11) == "2b11"
+    assert Color._cast_data(0b10, 0b00) == "2b0X"
+    assert ite("1b1", Color.GREEN, Color.RED) is Color.GREEN
+    assert mux("2b10", x0=Color.RED, x1=Color.GREEN, x2=Color.BLUE) is Color.BLUE
+
+    # Dense table up to 8 bits
+    assert Dense._dense is not None and len(Dense._dense) == 256
+    assert Wide._dense is None
+    for E in (Dense, Wide):
+        dmax = E._dmax
+        assert E._cast_data(dmax, 0) is E.A
+        assert E._cast_data(1, dmax ^ 1) is E.B
+        assert E._cast_data(0, 0) is E.X
+        assert E._cast_data(dmax, dmax) is E.W
+        assert E(1).name.startswith(f"{E.__name__}(")
+        assert (~E.A)._data == (0, dmax)
+
+
+def _next_color(s, a, b):
+    if a.has_unknown():
+        return Color.X
+    if s == Color.RED:
+        return Color.GREEN if a else Color.RED
+    if s == Color.GREEN:
+        return Color.BLUE if b == "3b101" else Color.GREEN
+    if s == Color.BLUE:
+        return "2b00"
+    return Color.W
+
+
+def test_transitions():
+    f = Color.transitions(_next_color, Array[1], Array[3])
+    for s in (Color.RED, Color.GREEN, Color.BLUE):
+        for i in range(2):
+            for j in range(8):
+                a, b = u2bv(i, 1), u2bv(j, 3)
+                assert f(s, a, b) is Color(_next_color(s, a, b))
+    assert f(Color.GREEN, 0, "3b101") is Color.BLUE
+    assert f(Color.BLUE, "1b0", 7) is Color.RED
+
+    # Literal states
+    assert f("2b01", 0, "3b101") is Color.BLUE
+    assert f("2bX1", 0, "3b101") is Color.W
+
+    # Unknown states and inputs call the function
+    assert f(Color.RED, "1bX", "3b000") is Color.X
+    assert f(Color.GREEN, "1b-", "3b101") is Color.X
+    assert f(Color.BLUE, "1b0", "3b1X1") is Color.RED
+    assert f(Color.X, "1b0", "3b000") is Color.W
+    assert f(Color("2b11"), "1b0", "3b000") is Color.W
+
+    # Inputs have their declared types, with or without unknown bits
+    def _types(s, c, x):
+        assert type(s) is Color and type(c) is Color and x.shape == (2, 2)
+        return c
+
+    g = Color.transitions(_types, Color, Array[2, 2])
+    assert g(bits("2b00"), "2b01", "4b0110") is Color.GREEN
+    assert g(Color.RED, "2bX1", "4b0110") == "2bX1"
+    assert g(Color.RED, "2b10", "4bX110") is Color.BLUE
+    assert g(bits("2b11"), "2b10", "4b0110") is Color.BLUE
+
+    with pytest.raises(TypeError):
+        f(Color.RED, "1b0")
+    with pytest.raises(TypeError):
+        f(Color.RED, "1b0", "2b00")
+    with pytest.raises(TypeError):
+        f("3b001", "1b0", "3b000")
+    with pytest.raises(ValueError):
+        Color.transitions(_next_color, Array[8], Array[9])
+
+
 def test_slicing():
     assert Color.GREEN[0] == "1b1"
     assert Color.GREEN[1] == "1b0"
@@ -0,0 +1,71 @@
+"""Test bvwx incremental evaluator."""
+
+import random
+
+import pytest
+
+from bvwx import Array, Evaluator, add, bits, eq, ite, lazy, var
+from bvwx._expr import trace
+
+from .util import rand4
+
+
+def test_basic():
+    a = var("a", Array[4])
+    b = var("b", Array[4])
+    c = var("c", Array[4])
+    ab = a & b
+    ev = Evaluator([ab | c, ab ^ c, "4b0000"])
+
+    # Initialized to X
+    assert ev["a"] == "4bXXXX"
+    assert ev.eval() == [bits("4bXXXX"), bits("4bXXXX"), bits("4b0000")]
+    assert ev.evaluations == 3
+
+    assert ev.update(a="4b1100", b="4b1010", c="4b0001") == [
+        bits("4b1001"),
+        bits("4b1001"),
+        bits("4b0000"),
+    ]
+    assert ev.evaluations == 6
+
+    # Only the fan-out cone of c
+    ev["c"] = "4b0010"
+    assert ev[ab | c] == "4b1010"
+    assert ev.evaluations == 8
+
+    # No change, no evaluation
+    ev["c"] = "4b0010"
+    ev.eval()
+    assert ev.evaluations == 8
+
+    # Changed input, unchanged intermediate value stops propagation
+    ev["b"] = "4b1011"
+    ev.eval()
+    assert ev.evaluations == 9
+    assert ev[ab] == "4b1000"
+
+    with pytest.raises(KeyError):
+        ev["d"] = "4b0000"
+    with pytest.raises(TypeError):
+        ev["a"] = "3b000"
+    with pytest.raises(ValueError):
+        Evaluator(a & var("a", Array[5]).__getitem__(slice(0, 4)))
+
+
+def f(op: Array[2], a: Array[8], b: Array[8]):
+    s = add(a, b)
+    return ite(eq(op, "2b00"), s, a ^ b), eq(s, "8h00")
+
+
+def test_random():
+    g = lazy(f)
+    xs, y = trace(f)
+    ev = Evaluator(y)
+    args = [rand4(2), rand4(8), rand4(8)]
+    ev.update(op=args[0], a=args[1], b=args[2])
+    for _ in range(200):
+        i = random.randrange(3)
+        args[i] = rand4(args[i].size)
+        ev[("op", "a", "b")[i]] = args[i]
+        assert ev.eval() == g(*args) == f(*args)
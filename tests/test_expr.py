@@ -0,0 +1,204 @@
+"""Test bvwx lazy expressions."""
+
+import pytest
+
+from bvwx import (
+    Array,
+    Expr,
+    adc,
+    add,
+    bits,
+    cat,
+    clz,
+    div,
+    eq,
+    ite,
+    lazy,
+    lrot,
+    lt,
+    match,
+    matmul,
+    mod,
+    mul,
+    mux,
+    ne,
+    neg,
+    or_,
+    pack,
+    rrot,
+    sbc,
+    srsh,
+    sub,
+    sxt,
+    uand,
+    uor,
+    uxor,
+    var,
+    xt,
+)
+from bvwx._expr import topo
+
+from .util import rand4
+
+N = 200
+
+
+def test_hash_cons():
+    a = var("a", Array[4])
+    b = var("b", Array[4])
+    assert var("a", Array[4]) is a
+    assert var("a", Array[5]) is not a
+    assert (a & b) is (a & b)
+    assert (a & b) is not (b & a)
+    assert ~~a is a
+
+    # Shared subterms are one node
+    y = ((a & b) | (a & b)) ^ (a & b)
+    assert len(topo([y])) == 5
+
+    assert repr(a) == 'var("a", Vector[4])'
+    assert repr(a & b) == "Expr(and, Vector[4])"
+    assert y.type is Array[4].__origin__
+    assert y.shape == (4,)
+    assert y.size == 4
+
+
+def test_fold():
+    a = var("a", Array[4])
+
+    # Constants
+    y = (a & "4b0000") | ("4b0011" & bits("4b0101"))
+    assert len(topo([y])) == 5
+
+    # X short-circuits
+    assert repr(a & "4bXXXX") == 'Expr(bits("4bXXXX"))'
+    assert repr(a + "4b00X0") == 'Expr(bits("5bX_XXXX"))'
+    assert repr(a << "2bX0") == 'Expr(bits("4bXXXX"))'
+    assert repr(a >> "2b-0") == 'Expr(bits("4b----"))'
+    assert a << 0 is a
+
+
+def test_eval():
+    a = var("a", Array[4])
+    b = var("b", Array[4])
+    y = (a ^ b)[1:3]
+    assert y.eval(a="4b1100", b="4b1010") == "2b11"
+    with pytest.raises(KeyError):
+        y.eval(a="4b1100")
+    with pytest.raises(TypeError):
+        y.eval(a="4b1100", b="3b000")
+
+
+@lazy
+def f(op: Array[3], a: Array[8], b: Array[8], ci: Array[1]):
+    is_add = eq(op, "3b000")
+    is_sub = eq(op, "3b001")
+    return (
+        ite(is_add, add(a, b, ci), sub(a, b)),
+        mux(op[:2], x0=a, x1=b, x2=~a),
+        or_(is_add, is_sub, eq(op, "3b010")),
+        cat(adc(a, b), sbc(a, b), neg(a)),
+        ne(a, b),
+        lt(a, b),
+        match(a, b),
+        uor(a),
+        uand(b),
+        uxor(a ^ b),
+        a + b - 1,
+        a[:4] << 2,
+        None,
+    )
+
+
+def test_lazy():
+    g = f.__wrapped__
+    for _ in range(N):
+        args = (rand4(3), rand4(8), rand4(8), rand4(1))
+        assert f(*args) == g(*args)
+
+
+@lazy
+def f2(a: Array[8], b: Array[4]):
+    return (
+        mul(a, b),
+        div(a, b),
+        mod(a, b),
+        a * b,
+        a // b,
+        a % b,
+        "8d200" // b,
+        matmul(a[:4], b),
+        srsh(a, 3),
+        xt(b, 2),
+        sxt(b, n=3),
+        lrot(a, 3),
+        rrot(a, "3b101"),
+        pack(a, 2),
+    )
+
+
+def test_lazy_call():
+    g = f2.__wrapped__
+    for _ in range(N):
+        # Known divisors must be nonzero
+        b = rand4(4)
+        if not b.has_unknown() and not b.to_uint():
+            b = ~b
+        args = (rand4(8), b)
+        assert f2(*args) == g(*args)
+
+
+def test_errors():
+    a = var("a", Array[4])
+    with pytest.raises(TypeError):
+        bool(a)
+    with pytest.raises(TypeError):
+        a.has_x()
+    with pytest.raises(TypeError):
+        eq(a, "4b0000")
+    with pytest.raises(TypeError):
+        _ = a == "4b0000"
+    with pytest.raises(TypeError):
+        _ = "4b0000" != a
+    assert a == a and a != ~a
+    with pytest.raises(TypeError):
+        _ = a | "3b000"
+    with pytest.raises(TypeError):
+        _ = a << a
+    with pytest.raises(TypeError):
+        _ = a[a]
+    with pytest.raises(ValueError):
+        _ = a << 5
+    with pytest.raises(ValueError):
+        _ = lrot(a, 4)
+    with pytest.raises(TypeError):
+        _ = xt(a, a)
+    assert not hasattr(a, "foo")
+
+    def g(a: Array[4]):
+        return a if a else ~a
+
+    with pytest.raises(TypeError):
+        lazy(g)
+
+    def h(a: Array[4], b):
+        return a
+
+    with pytest.raises(TypeError):
+        lazy(h)
+
+    def k(a: Array[4]):
+        return clz(a)
+
+    with pytest.raises(TypeError, match="unsupported operator 'clz'"):
+        lazy(k)
+
+    assert isinstance(a, Expr)
+
+
+def test_lazy_eq():
+    def f(op: Array[2], a: Array[4], b: Array[4]):
+        return ite(op == "2b01", a, b)
+
+    with pytest.raises(TypeError):
+        lazy(f)
@@ -2,7 +2,22 @@
 
 import pytest
 
-from bvwx import Array, bits, i2bv, stack, u2bv
+from bvwx import (
+    Array,
+    bits,
+    bytes2bv,
+    cpop,
+    i2bv,
+    intern_disable,
+    intern_enable,
+    intern_info,
+    lit2bv,
+    lit_cache_clear,
+    lit_cache_info,
+    lit_cache_resize,
+    stack,
+    u2bv,
+)
 from bvwx._bits import vec_obj
 
 E = bits()
@@ -194,6 +209,41 @@ def test_lit2bv_hex():
         bits("5h20")  # Only 0..1F is legal
 
 
+def test_lit2bv_hex_xw():
+    assert bits("8hX0") == "8bXXXX_0000"
+    assert bits("8h-f") == "8b----_1111"
+    assert bits("8hW5") == "8b----_0101"
+    assert bits("12hX_-a") == "12bXXXX_----_1010"
+    assert bits("6h0X") == "6b00_XXXX"
+    # Pad with known zeros
+    assert bits("8hX") == "8b0000_XXXX"
+    assert bits("9h-") == "9b0_0000_----"
+    # Most significant digit is all X/W
+    assert bits("7hX0") == "7bXXX_0000"
+    assert bits("5h-1") == "5b-_0001"
+    assert bits("3hX") == "3bXXX"
+    # Unknowns beyond size
+    with pytest.raises(ValueError):
+        bits("4hXX")
+    with pytest.raises(ValueError):
+        bits("4h1X")
+    assert bits("4h0X") == "4bXXXX"
+    # Invalid characters
+    with pytest.raises(ValueError):
+        bits("8hX?")
+    with pytest.raises(ValueError):
+        bits("8h_")
+
+
+def test_lit2bv_bin_wide():
+    x = bits("4096b" + "01X-" * 1024)
+    assert x.size == 4096
+    assert x[:4] == "4b01X-"
+    assert x[-4:] == "4b01X-"
+    with pytest.raises(ValueError):
+        bits("4b01x-")
+
+
 U2BV_VALS = {
     0: "[]",
     1: "1b1",
@@ -402,3 +452,117 @@ def test_stack():
         stack(42)
     with pytest.raises(TypeError):
         stack("2b00", "1b0")
+
+
+def test_lit_cache():
+    lit_cache_clear()
+    assert lit_cache_info().currsize == 0
+
+    x = lit2bv("8h42")
+    assert lit2bv("8h42") is x
+    assert bits("8h42") == "8h42"
+    info = lit_cache_info()
+    assert info.misses == 1
+    assert info.hits == 3
+    assert info.currsize == 1
+
+    # Errors are not cached
+    with pytest.raises(ValueError):
+        lit2bv("8hdead")
+    with pytest.raises(ValueError):
+        _ = bits("8h42") == "8hdead"
+    assert lit_cache_info().currsize == 1
+
+    try:
+        lit_cache_resize(2)
+        assert lit_cache_info().maxsize == 2
+        assert lit_cache_info().currsize == 0
+        for lit in ("4b0000", "4b0001", "4b0010"):
+            assert lit2bv(lit) == lit
+        assert lit_cache_info().currsize == 2
+
+        lit_cache_resize(0)
+        assert lit2bv("4b0000") is not lit2bv("4b0000")
+
+        with pytest.raises(ValueError):
+            lit_cache_resize(-1)
+    finally:
+        lit_cache_resize(1024)
+
+
+def test_intern():
+    assert intern_info() == (0, 0, 0)
+    assert u2bv(42, 8) is not u2bv(42, 8)
+
+    try:
+        intern_enable(maxsize=4, max_width=8)
+        assert intern_info() == (4, 8, 0)
+
+        x = u2bv(42, 8)
+        assert u2bv(42, 8) is x
+        assert i2bv(42, 8) is x
+        assert ~~x is x
+        assert cpop("8hff") is cpop("8hff")
+        assert intern_info() == (4, 8, 4)
+
+        # Too wide
+        assert u2bv(42, 9) is not u2bv(42, 9)
+        # Table full
+        assert u2bv(1, 8) is not u2bv(1, 8)
+        assert intern_info()[2] == 4
+
+        with pytest.raises(ValueError):
+            intern_enable(maxsize=0)
+        with pytest.raises(ValueError):
+            intern_enable(max_width=0)
+    finally:
+        intern_disable()
+
+    assert intern_info() == (0, 0, 0)
+
+
+def test_bytes2bv():
+    assert bytes2bv(b"") == E
+    assert bytes2bv(b"\x42") == "8h42"
+    assert bytes2bv(bytearray(b"\xef\xbe")) == "16hbeef"
+    assert bytes2bv(b"\xef\xbe", byteorder="big") == "16hefbe"
+    assert bytes2bv(memoryview(b"\xef\xbe"), 16) == "16hbeef"
+
+    # Multi-dimensional
+    buf = bytes(range(16))
+    x = bytes2bv(buf, (4, 32))
+    assert x.shape == (4, 32)
+    assert x[1] == "32h0706_0504"
+    assert x.to_bytes() == buf
+    y = bytes2bv(buf, (4, 32), "big")
+    assert y[1] == "32h0405_0607"
+    assert y.to_bytes("big") == buf
+    assert bytes2bv(buf, (2, 4, 16), "big")[1, 2] == "16h0c0d"
+
+    # Non-byte elements
+    z = bytes2bv(b"\xe4", (4, 2))
+    assert z == bits(["2b00", "2b01", "2b10", "2b11"])
+
+    with pytest.raises(ValueError):
+        bytes2bv(buf, (4, 16))
+    with pytest.raises(ValueError):
+        bytes2bv(buf, (1, 128))
+    with pytest.raises(ValueError):
+        bytes2bv(b"\xe4", (2, 4), "big")
+    with pytest.raises(ValueError):
+        bytes2bv(buf, byteorder="middle")  # ty: ignore[invalid-argument-type]
+
+
+def test_to_bytes():
+    assert E.to_bytes() == b""
+    assert bits("1b1").to_bytes() == b"\x01"
+    assert bits("12h123").to_bytes() == b"\x23\x01"
+    assert bits("16h1234").to_bytes("big") == b"\x12\x34"
+    with pytest.raises(ValueError):
+        bits("12h123").to_bytes("big")
+    with pytest.raises(ValueError):
+        bits("8hX0").to_bytes()
+
+    x = Array[64, 32].rand()
+    assert bytes2bv(x.to_bytes(), x.shape) == x
+    assert bytes2bv(x.to_bytes("big"), x.shape, "big") == x
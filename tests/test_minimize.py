@@ -0,0 +1,55 @@
+"""Test bvwx minimize."""
+
+import random
+
+import pytest
+
+from bvwx import Array, bits, match, minimize
+
+
+def _rand_pattern(n: int) -> str:
+    s = "".join(random.choices("01-", weights=(4, 4, 2), k=n))
+    return f"{n}b{s}"
+
+
+def _minterms(patterns: list, n: int) -> set[int]:
+    xs = [bits(f"{n}b{m:0{n}b}") for m in range(1 << n)]
+    return {m for m, x in enumerate(xs) if any(match(x, p) == "1b1" for p in patterns)}
+
+
+def test_random():
+    for _ in range(100):
+        n = random.randint(1, 6)
+        on = [_rand_pattern(n) for _ in range(random.randint(1, 20))]
+        dc = [_rand_pattern(n) for _ in range(random.randint(0, 4))]
+        ys = minimize(on, dc)
+        assert all(isinstance(y, Array) and y.size == n for y in ys)
+        f, d, g = _minterms(on, n), _minterms(dc, n), _minterms(ys, n)
+        assert f - d <= g <= f | d
+        assert len(ys) <= len(set(on))
+
+
+def test_decode():
+    # 76 opcodes => 2 patterns
+    on = [f"8b{m:08b}" for m in range(256) if m >> 6 == 0b01 or m & 0b1111 == 0b0101]
+    assert len(on) == 76
+    assert {str(y) for y in minimize(on)} == {"8b01--_----", "8b----_0101"}
+
+    # Don't cares merge patterns
+    assert minimize(["3b000", "3b001", "3b011", "3b111"]) == [bits("3b00-"), bits("3b-11")]
+    ys = minimize(["3b000", "3b001", "3b011", "3b111"], dc=["3b010"])
+    assert ys == [bits("3b0--"), bits("3b-11")]
+
+
+def test_basic():
+    assert not minimize([])
+    assert minimize(["2b00", "2b01", "2b10", "2b11"]) == [bits("2b--")]
+    assert minimize(["3b101"]) == [bits("3b101")]
+    assert minimize(["1b1"], dc=["1b0"]) == [bits("1b-")]
+
+    with pytest.raises(TypeError):
+        minimize(["2b00", "3b000"])
+    with pytest.raises(TypeError):
+        minimize(["2b00"], dc=["3b000"])
+    with pytest.raises(ValueError):
+        minimize(["2b0X"])
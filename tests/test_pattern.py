@@ -0,0 +1,104 @@
+"""Test bvwx pattern sets."""
+
+import random
+
+import pytest
+
+from bvwx import Array, Dispatch, PatternSet, bits, match, u2bv
+
+N = 300
+
+
+def _rand_lit(size: int, chars: str) -> str:
+    return f"{size}b" + "".join(random.choice(chars) for _ in range(size))
+
+
+def test_random():
+    for size, n in [(4, 3), (8, 20), (16, 300)]:
+        lits = [_rand_lit(size, "0011-") for _ in range(n)]
+        ps = PatternSet(lits)
+        assert len(ps) == n
+        assert ps.size == size
+        for _ in range(N):
+            x = bits(_rand_lit(size, "0000111111-X" if random.random() < 0.1 else "01"))
+            ys = [match(x, lit) for lit in lits]
+            expected = [i for i, y in enumerate(ys) if y == "1b1"]
+            assert ps.all(x) == expected
+            assert ps.first(x) == (expected[0] if expected else None)
+            assert ps.match(x) == bits(list(ys))
+
+
+def test_basic():
+    ps = PatternSet(["4b00--", "4b0-1-", bits("4b1111")])
+    assert ps[2] == "4b1111"
+    assert ps.first("4b0011") == 0
+    assert ps.all("4b0011") == [0, 1]
+    assert ps.all("4b-111") == [1, 2]
+    assert ps.first("4b1000") is None
+    assert ps.all("4bX000") == []
+    assert ps.match("4bX000") == "3bXXX"
+    assert repr(ps) == "PatternSet(<3 patterns>, size=4)"
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        PatternSet([])
+    with pytest.raises(ValueError):
+        PatternSet(["4b00X-"])
+    with pytest.raises(TypeError):
+        PatternSet(["4b00--", "3b000"])
+    ps = PatternSet(["4b00--"])
+    with pytest.raises(TypeError):
+        ps.first("3b000")
+
+
+def test_dispatch():
+    d = Dispatch(Array[2])
+    d.case("3b000")(lambda x: bits("2b00"))
+    d.case("3b001")(lambda x: bits("2b01"))
+    d.case("3b010")(lambda x: bits("2b01"))
+
+    @d.case("3b1--")
+    def _(x):
+        return bits("2b10")
+
+    # Unreachable
+    d.case("3b11-")(lambda x: bits("2b11"))
+
+    ys = ["2b00", "2b01", "2b01", "2b--", "2b10", "2b10", "2b10", "2b10"]
+    assert [d(u2bv(i, 3)) for i in range(8)] == ys
+    assert d("3b011") == "2b--"
+    assert d("3bX00") == "2bXX"
+    assert d("3b1-0") == "2b10"
+    assert d("3b-00") == "2b00"
+    assert repr(d) == "Dispatch(<5 cases>)"
+
+
+def test_dispatch_default():
+    d = Dispatch()
+
+    @d.case("4b0000")
+    def zero(x, y, z=0):
+        return y + z
+
+    assert d("4b0000", 1, z=2) == 3
+    assert d.handler("4b0000") is zero
+    with pytest.raises(ValueError):
+        d("4b0001", 1)
+
+    d.default(lambda x, y, z=0: -y)
+    assert d("4b0001", 1) == -1
+    assert d("4b000X", 1) == -1
+
+    # Cases are compiled again after a change
+    d.case("4b1---")(lambda x, y: y * 10)
+    assert d("4b1010", 2) == 20
+
+    with pytest.raises(TypeError):
+        d("3b000")
+    with pytest.raises(TypeError):
+        d.case("3b000")
+    with pytest.raises(ValueError):
+        d.case("4b000X")
+    with pytest.raises(ValueError):
+        Dispatch()("4b0000")
@@ -0,0 +1,219 @@
+"""Test bvwx PLA files."""
+
+import random
+
+import pytest
+
+from bvwx import Array, Cover, batch, bits, readpla, writepla
+from bvwx._lbool import from_char
+
+PLA = """\
+# 2-bit comparator
+.i 4
+.o 3
+.ilb a1 a0 b1 b0
+.ob lt eq gt
+.type fd
+.p 10
+0-1- 100
+00 01 100
+1011 100
+1-0- 001
+0100 001
+1110 001
+0000 010
+0101 010
+1010 010
+1111 010  # a == b
+.e
+"""
+
+
+def _rand_cube(n: int) -> str:
+    return "".join(random.choices("01-", k=n))
+
+
+def _rand_input(n: int) -> Array:
+    s = "".join(random.choices("01-X", weights=(8, 8, 2, 1), k=n))
+    ds = [from_char[c] for c in reversed(s)]
+    V = Array[n].__origin__
+    d0 = sum(d[0] << i for i, d in enumerate(ds))
+    d1 = sum(d[1] << i for i, d in enumerate(ds))
+    return V._cast_data(d0, d1)
+
+
+def _ref(cover: Cover, x: Array) -> str:
+    """Evaluate one cube and one bit at a time."""
+    s = str(x)[len(f"{x.size}b") :].replace("_", "")
+    m = cover.noutputs
+    if "X" in s:
+        return "X" * m
+    on1, onw, dc, off1 = [False] * m, [False] * m, [False] * m, [False] * m
+    for ins, outs in cover.cubes:
+        miss = any(c != "-" and b != "-" and c != b for c, b in zip(ins, s))
+        maybe = any(c != "-" and b == "-" for c, b in zip(ins, s))
+        if miss:
+            continue
+        for i, c in enumerate(outs):
+            if c == "1":
+                if maybe:
+                    onw[i] = True
+                else:
+                    on1[i] = True
+            elif c == "-" and "d" in cover.type:
+                dc[i] = True
+            elif c == "0" and "r" in cover.type and not maybe:
+                off1[i] = True
+    y = []
+    for i in range(m):
+        if on1[i]:
+            y.append("1")
+        elif onw[i] or dc[i] or ("r" in cover.type and not off1[i]):
+            y.append("-")
+        else:
+            y.append("0")
+    return "".join(y)
+
+
+def test_eval():
+    for t in ("f", "fd", "fr", "fdr"):
+        k, m = 6, 3
+        cubes = [(_rand_cube(k), "".join(random.choices("01-~", k=m))) for _ in range(20)]
+        cover = Cover(k, m, cubes, kind=t)
+        xs = [_rand_input(k) for _ in range(200)]
+        ys = [cover.eval(x) for x in xs]
+        for x, y in zip(xs, ys):
+            assert str(y) == f"{m}b{_ref(cover, x)}"
+        assert cover.eval_batch(batch(xs)).to_arrays() == ys
+
+
+def test_minimize():
+    for t in ("f", "fd", "fr", "fdr"):
+        k, m = 5, 3
+        cubes = [(_rand_cube(k), "".join(random.choices("01-~", k=m))) for _ in range(20)]
+        cover = Cover(k, m, cubes, kind=t)
+        cover.ilb = [f"x{i}" for i in range(k)]
+        small = cover.minimize()
+        assert small.type == "f"
+        assert small.ilb == cover.ilb
+        for x in range(1 << k):
+            y1 = str(cover.eval(bits(f"{k}b{x:0{k}b}")))[2:]
+            y2 = str(small.eval(bits(f"{k}b{x:0{k}b}")))[2:]
+            assert all(c1 in ("-", c2) for c1, c2 in zip(y1, y2))
+
+    # 2-bit comparator: 16 minterms => 10 cubes
+    cover = Cover(4, 3)
+    for a in range(4):
+        for b in range(4):
+            cover.add(f"{a:02b}{b:02b}", f"{a < b:d}{a == b:d}{a > b:d}")
+    small = cover.minimize()
+    assert len(cover) == 16
+    assert len(small) == 10
+    for a in range(4):
+        for b in range(4):
+            x = f"4b{a:02b}{b:02b}"
+            assert small.eval(x) == cover.eval(x)
+
+
+def test_types():
+    cubes = [("1-", "1-0~"), ("0-", "0-1~")]
+    assert Cover(2, 4, cubes, kind="f").eval("2b10") == "4b1000"
+    assert Cover(2, 4, cubes, kind="fd").eval("2b10") == "4b1-00"
+    assert Cover(2, 4, cubes, kind="fr").eval("2b10") == "4b1-0-"
+    assert Cover(2, 4, cubes, kind="fdr").eval("2b10") == "4b1-0-"
+    assert Cover(2, 4, cubes, kind="fdr").eval("2b01") == "4b0-1-"
+    assert Cover(2, 4, cubes, kind="fr").cubes == [("1-", "1-0-"), ("0-", "0-1-")]
+    assert Cover(2, 4, cubes, kind="fdr").cubes == cubes
+
+
+def test_empty():
+    cover = Cover(2, 2)
+    assert cover.eval("2b01") == "2b00"
+    assert cover.eval_batch(batch(["2b01", "2b1-"])).to_arrays() == [bits("2b00")] * 2
+    cover = Cover(2, 2, kind="fr")
+    assert cover.eval("2b01") == "2b--"
+
+
+def test_add():
+    cover = Cover(4, 2)
+    cover.add(bits("4b1-0-"), "1-")
+    cover.add("0000", "01")
+    assert len(cover) == 2
+    assert cover.cubes == [("1-0-", "1-"), ("0000", "01")]
+    assert cover.eval("4b1101") == "2b1-"
+    assert cover.eval("4b0000") == "2b01"
+
+    with pytest.raises(ValueError):
+        cover.add("000", "01")
+    with pytest.raises(ValueError):
+        cover.add("00X0", "01")
+    with pytest.raises(ValueError):
+        cover.add(bits("4b00X0"), "01")
+    with pytest.raises(TypeError):
+        cover.add(bits("3b000"), "01")
+    with pytest.raises(ValueError):
+        cover.add("0000", "0")
+    with pytest.raises(ValueError):
+        cover.add("0000", "0x")
+    with pytest.raises(ValueError):
+        Cover(0, 1)
+    with pytest.raises(ValueError):
+        Cover(1, 1, kind="fx")
+    with pytest.raises(ValueError):
+        cover.ilb = ["a"]
+    with pytest.raises(TypeError):
+        cover.eval("3b000")
+    with pytest.raises(TypeError):
+        cover.eval_batch(batch(["3b000"]))
+
+
+def test_read_write(tmp_path):
+    path = tmp_path / "cmp.pla"
+    path.write_text(PLA)
+    cover = readpla(path)
+    assert repr(cover) == "Cover(4, 3, <10 cubes>)"
+    assert cover.type == "fd"
+    assert cover.ilb == ["a1", "a0", "b1", "b0"]
+    assert cover.ob == ["lt", "eq", "gt"]
+    assert cover.cubes[1] == ("0001", "100")
+
+    for a in range(4):
+        for b in range(4):
+            y = cover.eval(bits(f"4b{a:02b}{b:02b}"))
+            assert y == f"3b{a < b:d}{a == b:d}{a > b:d}"
+    assert cover.eval("4b0-11") == "3b100"
+    assert cover.eval("4b-011") == "3b-00"
+    assert cover.eval("4b-0X1") == "3bXXX"
+
+    out = tmp_path / "out.pla"
+    writepla(out, cover)
+    text = out.read_text()
+    assert text.startswith(".i 4\n.o 3\n.ilb a1 a0 b1 b0\n.ob lt eq gt\n.type fd\n.p 10\n")
+    assert text.endswith("1111 010\n.e\n")
+    cover2 = readpla(out)
+    assert cover2.cubes == cover.cubes
+    assert cover2.ilb == cover.ilb
+
+
+def test_read_errors(tmp_path):
+    path = tmp_path / "bad.pla"
+    for text in (
+        ".i 2\n.o 1\n.phase 1\n",
+        ".i 2\n.o 1\n0X 1\n",
+        ".i 2\n.o 1\n01 2\n",
+        ".i 2\n.o 1\n.p 2\n01 1\n",
+        ".i 2\n01 1\n",
+        ".i 2\n.o 1\n.type fx\n01 1\n",
+        ".i\n",
+        ".i 2\n.o 1\n01 1\n.i 3\n",
+        ".i 2\n.o 1\n01 1\n.o 2\n",
+        ".i 2\n.o 1\n01 1\n.ilb a b\n",
+        ".i 2\n.o 1\n01 1\n.ob y\n",
+        ".i 2\n.o 1\n01 1\n.type fr\n",
+    ):
+        path.write_text(text)
+        with pytest.raises(ValueError):
+            readpla(path)
+
+    path.write_text(".i 2\n.o 1\n")
+    assert len(readpla(path)) == 0
@@ -0,0 +1,106 @@
+"""Test bvwx memory files."""
+
+import pytest
+
+from bvwx import Array, bits, readmemb, readmemh, writememb, writememh
+
+MEMH = """\
+// Header comment
+@0 dead beef /* block
+comment */ 12_34
+@5 x0 zz ?1 7
+@A 1
+"""
+
+
+def test_readmemh(tmp_path):
+    p = tmp_path / "mem.hex"
+    p.write_text(MEMH)
+    x = readmemh(p, 12, 16)
+    assert x.shape == (12, 16)
+    assert x[0] == "16hdead"
+    assert x[1] == "16hbeef"
+    assert x[2] == "16h1234"
+    assert x[3] == "16hXXXX"
+    # Zero extend, or X extend
+    assert x[5] == "16bXXXX_XXXX_XXXX_0000"
+    assert x[6] == "16hXXXX"
+    assert x[7] == "16hXXX1"
+    assert x[8] == "16h0007"
+    assert x[9] == "16hXXXX"
+    assert x[10] == "16h0001"
+
+    # Equal size words
+    p.write_text("01 02\n03 04\n")
+    assert readmemh(p, 4, 8) == bits(["8h01", "8h02", "8h03", "8h04"])
+    assert readmemh(p, 4, 6) == bits(["6h01", "6h02", "6h03", "6h04"])
+
+    # Overlapping words: last one wins
+    p.write_text("@1 11 22 @0 33 44")
+    assert readmemh(p, 3, 8) == bits(["8h33", "8h44", "8h22"])
+
+    # Empty file
+    p.write_text("")
+    assert readmemh(p, 2, 4) == Array[2, 4].xs()
+
+
+def test_readmemb(tmp_path):
+    p = tmp_path / "mem.bin"
+    p.write_text("@1 0101_1010 // comment\nxxxx_0000\n1\n")
+    x = readmemb(p, 4, 8)
+    assert x == bits(["8bXXXX_XXXX", "8b0101_1010", "8bXXXX_0000", "8b0000_0001"])
+
+
+def test_errors(tmp_path):
+    p = tmp_path / "mem.hex"
+    for text in ["0g", "@4 00", "00 00 00 00 00", "100", "/ 00", "/* 00", "@x"]:
+        p.write_text(text)
+        with pytest.raises(ValueError):
+            readmemh(p, 4, 8)
+    for text in ["40", "x00", "0x0"]:
+        p.write_text(text)
+        with pytest.raises(ValueError):
+            readmemh(p, 1, 6)
+    p.write_text("2")
+    with pytest.raises(ValueError):
+        readmemb(p, 4, 8)
+    with pytest.raises(ValueError):
+        readmemh(p, -1, 8)
+
+
+def test_roundtrip(tmp_path):
+    p = tmp_path / "mem.txt"
+    for depth, width in [(64, 32), (16, 10), (8, 1), (1, 8)]:
+        shape = tuple(n for n in (depth, width) if n > 1)
+        x = Array[depth * width].rand().reshape(shape)
+        writememh(p, x, width)
+        assert readmemh(p, depth, width) == x
+        writememb(p, x, width)
+        assert readmemb(p, depth, width) == x
+
+    # Unknown digits
+    x = bits(["8hX5", "8b01X0_----"])
+    writememh(p, x)
+    assert p.read_text() == "x5\nxx\n"
+    writememb(p, x)
+    assert p.read_text() == "xxxx0101\n01x0xxxx\n"
+    assert readmemb(p, 2, 8) == bits(["8hX5", "8b01X0_XXXX"])
+
+    with pytest.raises(ValueError):
+        writememh(p, x, 3)
+
+    # Unknown partial top digit
+    x = bits(["6bXX_XXXX", "6b01_0110", "6bX0_1010", "6b10_1X01"])
+    writememh(p, x)
+    assert p.read_text() == "xx\n16\nxa\n2x\n"
+    assert readmemh(p, 4, 6) == bits(["6bXX_XXXX", "6b01_0110", "6bXX_1010", "6b10_XXXX"])
+    x = bits(["3bX01", "3b101"])
+    writememh(p, x)
+    assert readmemh(p, 2, 3) == bits(["3bXXX", "3b101"])
+    p.write_text("z5 Z\n")
+    assert readmemh(p, 2, 6) == bits(["6bXX_0101", "6bXX_XXXX"])
+
+    # Wide memory spans multiple runs
+    x = Array[70000, 8].rand()
+    writememh(p, x)
+    assert readmemh(p, 70000, 8) == x
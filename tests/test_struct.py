@@ -2,7 +2,7 @@
 
 import pytest
 
-from bvwx import Array, Struct
+from bvwx import Array, Enum, Struct, bits
 
 
 def test_empty():
@@ -111,6 +111,93 @@ def test_init():
     assert str(Simple.xs()) == "Simple(\n    a=2bXX,\n    b=3bXXX,\n    c=4bXXXX,\n)"
     assert str(Simple.ws()) == "Simple(\n    a=2b--,\n    b=3b---,\n    c=4b----,\n)"
 
+    # Exact types, ints, and literals
+    a, b = bits("2b01"), bits("3b1-X")
+    s = Simple(a=a, b=b, c=9)
+    assert s.unpack() == (a, b, bits("4b1001"))
+    assert Simple(a=3, b=-1, c=0) == Simple(a="2b11", b="3b111", c="4b0000")
+    assert Simple(a=True).a == "2b01"
+    c = Compound(p=s, q=Simple(a=0))
+    assert c.p == s and c.q.a == "2b00"
+    assert Mixed(x=bits("6b00_1010")).x == bits(["3b010", "3b001"])
+
+    with pytest.raises(TypeError):
+        Simple(a="3b000")
+    with pytest.raises(TypeError):
+        Simple(a=bits("3b000"))
+    with pytest.raises(ValueError):
+        Simple(a=4)
+    with pytest.raises(ValueError):
+        Simple(a=-3)
+
+
+class Color(Enum):
+    RED = "2b00"
+    GREEN = "2b01"
+
+
+class Mixed(Struct):
+    color: Color
+    s: Simple
+    x: Array[2, 3]
+
+
+def test_unpack():
+    s = Simple(a="2b10", b="3b011", c="4b0100")
+    assert s.unpack() == (s.a, s.b, s.c)
+    a, b, c = s.unpack()
+    assert type(b) is Array[3].__origin__
+
+    m = Mixed(color=Color.GREEN, s=s, x=bits(["3b001", "3b1X0"]))
+    color, s2, x = m.unpack()
+    assert color is Color.GREEN and m.color is Color.GREEN
+    assert type(s2) is Simple and s2 == s and m.s == s
+    assert x.shape == (2, 3) and x == m.x
+    assert x[1] == "3b1X0"
+
+    with pytest.raises(ValueError):
+
+        class BadName(Struct):
+            unpack: Array[4]
+
+
+def test_replace():
+    s = Simple(a="2b10", b="3b011", c="4b0100")
+    t = s.replace(b="3b111")
+    assert type(t) is Simple
+    assert t.unpack() == (s.a, bits("3b111"), s.c)
+    assert s.b == "3b011"
+    assert s.replace() == s
+    assert s.replace(a=None, c=bits("4b1-1X")).unpack() == (bits("2bXX"), s.b, bits("4b1-1X"))
+
+    m = Mixed(color=Color.RED, s=s, x=bits(["3b001", "3b010"]))
+    m2 = m.replace(color="2b01", s=t)
+    assert m2.color is Color.GREEN
+    assert m2.s == t
+    assert m2.x == m.x
+
+    with pytest.raises(TypeError):
+        s.replace(d="2b00")
+    with pytest.raises(TypeError):
+        s.replace(a="3b000")
+
+
+def test_builder():
+    s = Simple.xs()
+    b = s.builder()
+    for i in range(4):
+        b.set(a=i).set(c=i + 8)
+    b.set(b="3b101")
+    t = b.build()
+    assert type(t) is Simple
+    assert t == Simple(a="2b11", b="3b101", c="4b1011")
+    # Original value is unchanged
+    assert s == Simple.xs()
+    assert repr(b) == "StructBuilder(Simple)"
+
+    with pytest.raises(TypeError):
+        b.set(d=0)
+
 
 def test_bad_type():
     with pytest.raises(TypeError):
@@ -128,3 +215,22 @@ def test_bad_name():
             a: Array[4]
             b: Simple
             onehot: Array[4]  # Error!
+
+    # Names used by the generated constructor
+    with pytest.raises(ValueError):
+
+        class BadLocal(Struct):
+            a: Array[4]
+            _d0: Array[4]  # Error!
+
+    with pytest.raises(ValueError):
+
+        class BadGlobal(Struct):
+            a: Array[4]
+            _t0: Array[4]  # Error!
+
+    # Names of Struct methods
+    for fn in ("unpack", "replace", "builder", "self", "_arg", "_x1", "_t12"):
+        with pytest.raises(ValueError, match=f"reserved field name: {fn}"):
+            attrs = {"__annotations__": {"a": Array[4], fn: Array[4]}}
+            type(Struct)("BadMethod", (Struct,), attrs)
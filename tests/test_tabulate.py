@@ -0,0 +1,89 @@
+"""Test bvwx tabulate."""
+
+import pytest
+
+from bvwx import Array, Enum, add, decode, encode_priority, ite, tabulate, u2bv
+
+from .util import rand4
+
+
+class Color(Enum):
+    RED = "2b00"
+    GREEN = "2b01"
+    BLUE = "2b10"
+
+
+def test_known():
+    f = tabulate(decode, Array[3])
+    assert f.__name__ == "decode"
+    for i in range(8):
+        x = u2bv(i, 3)
+        assert f(x) == decode(x)
+    assert f(5) == decode("3b101")
+
+    # Wide output
+    f = tabulate(decode, Array[7])
+    for i in range(128):
+        assert f(u2bv(i, 7)) == decode(u2bv(i, 7))
+
+    g = tabulate(add, Array[4], Array[4])
+    for i in range(16):
+        for j in range(16):
+            assert g(u2bv(i, 4), u2bv(j, 4)) == add(u2bv(i, 4), u2bv(j, 4))
+
+
+def test_unknown():
+    f = tabulate(encode_priority, Array[6])
+    g = tabulate(lambda s, a, b: ite(s, a, b), Array[1], Array[3], Array[3])
+    for _ in range(500):
+        x = rand4(6)
+        assert f(x) == encode_priority(x)
+        s, a, b = rand4(1), rand4(3), rand4(3)
+        assert g(s, a, b) == ite(s, a, b)
+
+
+def test_enum():
+    def f(x: Array) -> Color:
+        return Color.BLUE if x[0] else Color("2b11")
+
+    g = tabulate(f, Array[2])
+    assert g("2b01") is Color.BLUE
+    assert g("2b10") == "2b11"
+    assert g(Color.GREEN) is Color.BLUE
+
+
+def test_fallback():
+    # Unknown inputs cast inputs and outputs like known inputs
+    f = tabulate(lambda x: "2b01" if x.has_unknown() else "2b10", Array[2])
+    assert f("2b00") == "2b10"
+    assert f("2bX0") == "2b01" and isinstance(f("2bX0"), Array)
+
+    g = tabulate(lambda c: u2bv(isinstance(c, Color), 1), Color)
+    assert g("2b01") == "1b1"
+    assert g("2bX1") == "1b1"
+
+    h = tabulate(lambda x: (), Array[2])
+    assert h("2b01") == ()
+    assert h("2bX1") == ()
+
+    k = tabulate(lambda x: (x, x) if x.has_unknown() else (x,), Array[2])
+    assert k("2b01") == ("2b01",)
+    with pytest.raises(TypeError):
+        k("2b0X")
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        tabulate(add, Array[8], Array[9])
+    with pytest.raises(TypeError):
+        tabulate(lambda x: x if x[0] else Color.RED, Array[2])
+    with pytest.raises(TypeError):
+        tabulate(lambda x: 1.0, Array[2])
+    with pytest.raises(TypeError):
+        tabulate(lambda x: (x,) if x[0] else x, Array[2])
+
+    f = tabulate(decode, Array[3])
+    with pytest.raises(TypeError):
+        f("4b0000")
+    with pytest.raises(TypeError):
+        f()
@@ -0,0 +1,135 @@
+"""Test bvwx VCD writer."""
+
+import io
+
+import pytest
+
+from bvwx import Enum, VCDWriter, bits
+from bvwx._vcd import _id_code
+
+
+class Color(Enum):
+    RED = "2b00"
+    GREEN = "2b01"
+    BLUE = "2b10"
+
+
+def test_vcd_val():
+    assert bits([]).vcd_val() == ""
+    assert bits("1b1").vcd_val() == "1"
+    assert bits("8b1101_0010").vcd_val() == "11010010"
+    assert bits("8b10X-_01-X").vcd_val() == "10xx01xx"
+    assert bits(["4b01X1", "4b-001"]).vcd_val() == "x00101x1"
+    assert Color.GREEN.vcd_val() == "GREEN"
+    assert Color.X.vcd_val() == "X"
+
+
+def test_id_code():
+    codes = {_id_code(i) for i in range(100_000)}
+    assert len(codes) == 100_000
+    assert _id_code(0) == "!"
+    assert _id_code(93) == "~"
+    assert _id_code(94) == "!!"
+    assert all(" " not in c for c in codes)
+
+
+def test_writer():
+    f = io.StringIO()
+    with VCDWriter(f, timescale="10ps", date="today", version=None) as vcd:
+        clk = vcd.register("top", "clk", bits("1b0"))
+        a = vcd.register("top.cpu", "a", bits("4b0000"))
+        c = vcd.register("top.cpu", "c", Color.RED)
+        b = vcd.register("top.mem", "b", bits(["2b00", "2b11"]))
+        d = vcd.register("", "d", bits("1bX"))
+
+        vcd.change(clk, 0, "1b0")
+        vcd.change(clk, 5, "1b1")
+        vcd.change(a, 5, "4b1X-0")
+        vcd.change(a, 5, 0)
+        vcd.change(c, 7, Color.RED)
+        vcd.change(c, 10, "2b10")
+        vcd.change(b, 10, bits("4b1001"))
+        vcd.change(d, 15, "1b1")
+        vcd.change(clk, 20, "1b0")
+
+        assert vcd.time == 20
+        assert c.value is Color.BLUE
+        assert c.name == "c"
+
+    assert f.getvalue() == "\n".join(
+        [
+            "$date today $end",
+            "$timescale 10ps $end",
+            "$var logic 1 % d $end",
+            "$scope module top $end",
+            "$var logic 1 ! clk $end",
+            "$scope module cpu $end",
+            '$var logic 4 " a $end',
+            "$var string 1 # c $end",
+            "$upscope $end",
+            "$scope module mem $end",
+            "$var logic 4 $ b $end",
+            "$upscope $end",
+            "$upscope $end",
+            "$enddefinitions $end",
+            "#0",
+            "$dumpvars",
+            "0!",
+            'b0000 "',
+            "sRED #",
+            "b1100 $",
+            "x%",
+            "$end",
+            "#5",
+            "1!",
+            'b1xx0 "',
+            'b0000 "',
+            "#10",
+            "sBLUE #",
+            "b1001 $",
+            "#15",
+            "1%",
+            "#20",
+            "0!",
+            "",
+        ]
+    )
+
+
+def test_flush(tmp_path):
+    path = tmp_path / "test.vcd"
+    vcd = VCDWriter(path, flush_size=1000, date=None)
+    a = vcd.register("top", "a", bits("8h00"))
+    for t in range(100):
+        vcd.change(a, t, t)
+    # Some output is still buffered
+    n = path.stat().st_size
+    assert n >= 1000
+    vcd.close()
+    vcd.close()
+    text = path.read_text()
+    assert n < len(text)
+    assert text.startswith("$version bvwx $end\n")
+    assert text.endswith("#99\nb01100011 !\n")
+
+    with pytest.raises(ValueError):
+        vcd.change(a, 100, 0)
+
+
+def test_errors():
+    vcd = VCDWriter(io.StringIO())
+    a = vcd.register("top", "a", bits("4b0000"))
+
+    with pytest.raises(TypeError):
+        vcd.register("top", "b", "4b0000")  # pyright: ignore[reportArgumentType]
+    with pytest.raises(TypeError):
+        vcd.change(a, 0, "3b000")
+
+    vcd.change(a, 10, "4b0001")
+    with pytest.raises(ValueError):
+        vcd.change(a, 5, "4b0010")
+    with pytest.raises(ValueError):
+        vcd.register("top", "b", bits("4b0000"))
+
+    with pytest.raises(ValueError):
+        VCDWriter(io.StringIO(), flush_size=-1)
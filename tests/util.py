@@ -0,0 +1,22 @@
+"""Random values for fuzz tests."""
+
+import random
+
+from bvwx import Array
+from bvwx._bits import vec_obj
+
+
+def rand4(size: int) -> Array:
+    """Return a random value, mostly known, with an occasional X/W bit."""
+    d1 = random.getrandbits(size)
+    d0 = d1 ^ ((1 << size) - 1)
+    if size and random.random() < 0.25:
+        i = random.randrange(size)
+        d0 ^= random.randint(0, 1) << i
+        d1 ^= random.randint(0, 1) << i
+    return vec_obj(size, d0, d1)
+
+
+def rand4s(size: int, n: int) -> list[Array]:
+    """Return a list of n random values."""
+    return [rand4(size) for _ in range(n)]